@@ -6,6 +6,7 @@ Provides endpoints for data analysis and risk prediction
 from flask import Flask, jsonify, request, send_from_directory
 from flask_cors import CORS
 import json
+import math
 import pandas as pd
 import numpy as np
 from pathlib import Path
@@ -13,6 +14,17 @@ from sklearn.preprocessing import StandardScaler
 import pickle
 import os
 
+from numpy_inference import rule_based_risk_score, load_risk_model, top_contributions
+from feature_transform import FeatureTransform
+from query_engine import QueryEngine, QueryError
+from olap_cube import AggregateCube
+from bitmap_index import BitmapIndex, score_bands
+from sorted_index import SortedColumnIndex
+from similarity_index import SimilarPatientIndex
+from name_index import NameSearchIndex
+from config import (QUERY_CONFIG, OLAP_CONFIG, BITMAP_INDEX_CONFIG, SORTED_INDEX_CONFIG, SIMILARITY_CONFIG,
+                    NAME_SEARCH_CONFIG, RISK_SCORE_THRESHOLDS, HEALTH_SCORE_THRESHOLDS)
+
 app = Flask(__name__)
 CORS(app)
 
@@ -21,30 +33,98 @@ BASE_DIR = Path(__file__).parent
 DATA_DIR = BASE_DIR / "data"
 MODELS_DIR = BASE_DIR / "models"
 
+# Columns of patient lists (high-risk patients, cohorts)
+PATIENT_SUMMARY_COLUMNS = [
+    'Patient_ID', 'Name', 'Age', 'BMI', 'Blood_Pressure',
+    'Glucose', 'Disease_Risk', 'Health_Score', 'Risk_Score'
+]
+
+
+def patient_records(rows):
+    """PATIENT_SUMMARY_COLUMNS of a patient frame as JSON-safe dicts (missing values -> None)"""
+    summary = rows[PATIENT_SUMMARY_COLUMNS]
+    return summary.astype(object).where(summary.notna(), None).to_dict('records')
+
+
+def unknown_parameters_error(filter_columns, options):
+    """
+    400 response if the request has query parameters other than the filter
+    columns and options, else None (a misspelt filter would select everyone)
+    """
+    unknown = sorted(set(request.args) - set(filter_columns) - set(options))
+    if not unknown:
+        return None
+    return jsonify({"error": f"Unknown query parameters: {unknown}",
+                    "filter_columns": list(filter_columns), "options": list(options)}), 400
+
+
+def load_report(filename):
+    """JSON report written by the pipeline, or {} if it is missing"""
+    try:
+        with open(DATA_DIR / filename, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def load_ml_report():
+    """
+    ML preparation report with summary metrics only
+    Reports written before the ml_predictions.npy sidecar carry per-sample
+    predictions / probabilities lists per model; those are dropped here
+    """
+    report = load_report("ml_preparation_report.json")
+    for results in report.get('model_results', {}).values():
+        results.pop('predictions', None)
+        results.pop('probabilities', None)
+    return report
+
+
+def load_engineered_data():
+    """Engineered dataset, or None if the pipeline has not produced it"""
+    try:
+        return pd.read_csv(DATA_DIR / "healthcare_data_engineered.csv")
+    except (OSError, ValueError):
+        return None
+
+
 # Load reports
-try:
-    with open(DATA_DIR / "eda_report.json", 'r') as f:
-        eda_report = json.load(f)
-except:
-    eda_report = {}
-
-try:
-    with open(DATA_DIR / "kpi_report.json", 'r') as f:
-        kpi_report = json.load(f)
-except:
-    kpi_report = {}
-
-try:
-    with open(DATA_DIR / "ml_preparation_report.json", 'r') as f:
-        ml_report = json.load(f)
-except:
-    ml_report = {}
+eda_report = load_report("eda_report.json")
+kpi_report = load_report("kpi_report.json")
+ml_report = load_ml_report()
+
+# Per-sample test predictions (binary sidecar of the ML report), memory-mapped on first use
+ml_predictions = None
+
+# Exported NumPy risk models (models/<name>.npz) by name, all loaded on first use
+risk_models = None
+
+# Persisted cleaning + feature computation of the pipeline, loaded on first use
+feature_transform = None
 
 # Load engineered data
-try:
-    engineered_data = pd.read_csv(DATA_DIR / "healthcare_data_engineered.csv")
-except:
-    engineered_data = None
+engineered_data = load_engineered_data()
+
+# Query engine over engineered_data (DuckDB table or indexed frame), built on first use
+query_engine = None
+
+# Aggregate cube of engineered_data, built on first use and updated on reload
+olap_cube = None
+
+# Packed bitmap indexes of engineered_data's categorical columns, built on first use
+bitmap_index = None
+
+# Presorted numeric columns of engineered_data (overall and per cohort), built on first use
+sorted_index = None
+
+# Row position of each Patient_ID in engineered_data (first occurrence), built on first use
+patient_positions = None
+
+# KD-tree over engineered_data's standardized features, built on first use
+similarity_index = None
+
+# Prefix and trigram index of engineered_data's patient names, built on first use
+name_index = None
 
 
 @app.route('/')
@@ -83,6 +163,668 @@ def get_ml_report():
     return jsonify(ml_report if ml_report else {"error": "ML report not found"})
 
 
+def get_ml_predictions():
+    """Structured array of per-sample test predictions, or None if not generated"""
+    global ml_predictions
+    predictions_path = DATA_DIR / ml_report.get('predictions_file', 'ml_predictions.npy')
+    if ml_predictions is None and predictions_path.exists():
+        ml_predictions = np.load(predictions_path, mmap_mode='r')
+    return ml_predictions
+
+
+@app.route('/api/ml-predictions')
+def get_ml_predictions_page():
+    """
+    Get per-sample test predictions, paginated
+    Query parameters: page (default 1), page_size (default 100, max 1000),
+    model (optional, only that model's prediction and probability)
+    """
+    predictions = get_ml_predictions()
+    if predictions is None:
+        return jsonify({"error": "ML predictions not found"}), 404
+
+    try:
+        page = int(request.args.get('page', 1))
+        page_size = int(request.args.get('page_size', 100))
+    except ValueError:
+        return jsonify({"error": "page and page_size must be integers"}), 400
+    if page < 1 or not 1 <= page_size <= 1000:
+        return jsonify({"error": "page must be >= 1 and page_size between 1 and 1000"}), 400
+
+    columns = list(predictions.dtype.names)
+    model = request.args.get('model')
+    if model:
+        model_columns = [f'{model}_prediction', f'{model}_probability']
+        if model_columns[0] not in columns:
+            return jsonify({"error": f"Predictions for model {model} not found"}), 404
+        columns = ['row', 'patient_id', 'actual'] + model_columns
+
+    # Only the requested slice is read from the memory map
+    start = (page - 1) * page_size
+    rows = predictions[start:start + page_size][columns].tolist()
+
+    return jsonify({
+        "total": len(predictions),
+        "page": page,
+        "page_size": page_size,
+        "total_pages": -(-len(predictions) // page_size),
+        "columns": columns,
+        "predictions": [dict(zip(columns, row)) for row in rows]
+    })
+
+
+def get_risk_models():
+    """
+    Exported risk models by name, in name order; the models directory is
+    scanned once (again after /api/reload), not per request
+    """
+    global risk_models
+    if risk_models is None:
+        risk_models = {path.stem: load_risk_model(path) for path in sorted(MODELS_DIR.glob('*.npz'))}
+    return risk_models
+
+
+def get_risk_model(name):
+    """Exported risk model by name, or None if it has not been exported"""
+    return get_risk_models().get(name)
+
+
+def get_feature_transform():
+    """Feature transform saved by the pipeline, or None if it has not been saved"""
+    global feature_transform
+    if feature_transform is None and (MODELS_DIR / "feature_transform.json").exists():
+        feature_transform = FeatureTransform.load(MODELS_DIR / "feature_transform.json")
+    return feature_transform
+
+
+def score_exported_models(row, top_k=5):
+    """
+    Risk probability and top feature contributions of every exported model
+    for one raw patient row, using the pipeline's own feature computation
+    Models with features the transform does not compute get an error entry;
+    top_k outside 1..number of model features raises a ValueError
+    """
+    transform = get_feature_transform()
+    if transform is None:
+        return {}
+    try:
+        values = dict(zip(transform.features, transform.transform([row])[0]))
+    except ValueError:
+        return {}  # rows the batch cleaning drops (age outside 0-100) are not scored
+    if any(np.isnan(v) for v in values.values()):
+        return {}  # e.g. unknown Disease_Risk: the pipeline leaves these features missing
+
+    predictions = {}
+    for name, model in get_risk_models().items():
+        missing = [feature for feature in model.feature_names if feature not in values]
+        if missing:
+            predictions[name] = {"error": f"Feature transform does not compute model features: {missing}"}
+            continue
+        if not 1 <= top_k <= len(model.feature_names):
+            raise ValueError(f"top_k must be between 1 and {len(model.feature_names)}")
+        X = np.array([[values[name] for name in model.feature_names]])
+        probability = float(model.predict_proba(X)[0, 1])
+        contributions, _ = model.explain(X)
+        predictions[name] = {
+            "risk_probability": round(probability, 4),
+            "is_high_risk": probability >= 0.5,
+            "top_contributions": top_contributions(contributions, model.feature_names, top_k)[0]
+        }
+    return predictions
+
+
+def model_feature_matrix(df, feature_names):
+    """
+    Model input matrix of engineered rows, as (X, missing feature names)
+    One-hot model features the dataset does not store (sparse categorical
+    encoding) are derived from their categorical column, with the
+    vocabulary of the feature transform
+    """
+    transform = get_feature_transform()
+    one_hot = transform.one_hot_columns if transform is not None else {}
+    missing = [name for name in feature_names if name not in df.columns and name not in one_hot]
+    if missing:
+        return None, missing
+    columns = [
+        df[name].to_numpy(dtype=float) if name in df.columns
+        else (df[one_hot[name][0]] == one_hot[name][1]).to_numpy(dtype=float)
+        for name in feature_names
+    ]
+    return np.column_stack(columns) if columns else np.zeros((len(df), 0)), []
+
+
+@app.route('/api/explain', methods=['POST'])
+def explain_predictions():
+    """
+    Model risk predictions with per-feature explanations for a batch of patients
+    
+    Expected JSON:
+    {
+        "patient_ids": [int, ...],
+        "model": "random_forest" | "logistic_regression" (default "random_forest"),
+        "top_k": int (default 5)
+    }
+    Logistic regression explains the log-odds (coef x scaled feature),
+    random forest the probability (tree-path contributions)
+    """
+    if engineered_data is None:
+        return jsonify({"error": "Dataset not found"}), 404
+
+    data = request.get_json() or {}
+    model_name = data.get('model', 'random_forest')
+    model = get_risk_model(model_name)
+    if model is None:
+        return jsonify({"error": f"Model {model_name} not found, run the pipeline to export it"}), 404
+
+    try:
+        patient_ids = [int(pid) for pid in data.get('patient_ids', [])]
+        top_k = int(data.get('top_k', 5))
+    except (TypeError, ValueError):
+        return jsonify({"error": "patient_ids must be a list of integers and top_k an integer"}), 400
+    if not patient_ids or len(patient_ids) > 10000:
+        return jsonify({"error": "patient_ids must contain 1 to 10000 ids"}), 400
+    if not 1 <= top_k <= len(model.feature_names):
+        return jsonify({"error": f"top_k must be between 1 and {len(model.feature_names)}"}), 400
+
+    patients = engineered_data[engineered_data['Patient_ID'].isin(patient_ids)].drop_duplicates('Patient_ID')
+    X, missing_columns = model_feature_matrix(patients, model.feature_names)
+    if missing_columns:
+        return jsonify({"error": f"Dataset lacks model features: {missing_columns}"}), 400
+
+    # Scores and explanations: one vectorized pass over the batch each
+    # (explain() alone would not reproduce predict_proba bit for bit at the 0.5 cut-off)
+    probabilities = model.predict_proba(X)[:, 1]
+    contributions, expected_value = model.explain(X)
+    top = top_contributions(contributions, model.feature_names, top_k)
+
+    found = set(patients['Patient_ID'].astype(int))
+    return jsonify({
+        "model": model_name,
+        "explains": "log_odds" if hasattr(model, 'weights') else "probability",
+        "expected_value": expected_value,
+        "predictions": [
+            {
+                "patient_id": int(pid),
+                "risk_probability": round(float(prob), 4),
+                "is_high_risk": bool(prob >= 0.5),
+                "top_contributions": contribs
+            }
+            for pid, prob, contribs in zip(patients['Patient_ID'], probabilities, top)
+        ],
+        "not_found": [pid for pid in patient_ids if pid not in found]
+    })
+
+
+def get_query_engine():
+    """Query engine over the engineered dataset, or None if it is not loaded"""
+    global query_engine
+    if query_engine is None and engineered_data is not None:
+        query_engine = QueryEngine(engineered_data, backend=QUERY_CONFIG['engine'],
+                                   threads=QUERY_CONFIG['threads'], max_rows=QUERY_CONFIG['max_rows'])
+    return query_engine
+
+
+@app.route('/api/query', methods=['POST'])
+def run_query():
+    """
+    Filter / group-by / aggregate query over the engineered dataset
+    
+    Expected JSON:
+    {
+        "filters": [{"column": "Age", "op": ">=", "value": 60}, ...],
+        "group_by": ["City"],
+        "aggregations": [{"func": "mean", "column": "BMI", "as": "avg_bmi"}, {"func": "count"}],
+        "columns": ["Patient_ID", "Name", ...]   (row queries, without aggregations),
+        "order_by": [{"column": "avg_bmi", "desc": true}],
+        "limit": int (default and max QUERY_CONFIG['max_rows'])
+    }
+    Operators: == != > >= < <= in not_in between is_null not_null
+    Aggregations: count count_distinct sum mean min max std median
+    """
+    engine = get_query_engine()
+    if engine is None:
+        return jsonify({"error": "Dataset not found"}), 404
+
+    try:
+        return jsonify(engine.execute(request.get_json(silent=True)))
+    except QueryError as e:
+        return jsonify({"error": str(e)}), 400
+
+
+def get_olap_cube():
+    """Aggregate cube of the engineered dataset, or None if it is not loaded"""
+    global olap_cube
+    if olap_cube is None and engineered_data is not None:
+        olap_cube = AggregateCube.from_frame(engineered_data, OLAP_CONFIG['dimensions'], OLAP_CONFIG['measures'])
+    return olap_cube
+
+
+@app.route('/api/cube')
+def get_cube_slice():
+    """
+    Patient counts and sum / mean / std of Risk_Score and Health_Score per slice
+    Query parameters: group_by (comma-separated dimensions, default none = grand
+    total), and per dimension a filter on its members, e.g.
+    /api/cube?group_by=City,Age_Group&Disease_Risk=Diabetes,Heart Risk
+    Answered from the precomputed cube, without scanning patient rows
+    """
+    cube = get_olap_cube()
+    if cube is None:
+        return jsonify({"error": "Dataset not found"}), 404
+
+    error = unknown_parameters_error(cube.dimensions, ['group_by'])
+    if error:
+        return error
+
+    group_by = [dim for dim in request.args.get('group_by', '').split(',') if dim]
+    filters = {
+        dim: [value for item in request.args.getlist(dim) for value in item.split(',')]
+        for dim in cube.dimensions if dim in request.args
+    }
+    try:
+        rows = cube.aggregate(group_by, filters)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({
+        "dimensions": cube.dimensions,
+        "group_by": group_by,
+        "filters": filters,
+        "rows": rows
+    })
+
+
+def reload_data():
+    """
+    Re-read the pipeline outputs (reports and engineered dataset) after a pipeline run
+    If the previous rows are unchanged and only new patients were appended, the
+    cube is updated with the new rows; otherwise it is rebuilt. The query engine,
+    predictions and exported models are reloaded on next use
+    """
+    global eda_report, kpi_report, ml_report, engineered_data
+    global ml_predictions, risk_models, feature_transform, query_engine, olap_cube, bitmap_index, sorted_index
+    global patient_positions, similarity_index, name_index
+    previous = engineered_data
+    eda_report = load_report("eda_report.json")
+    kpi_report = load_report("kpi_report.json")
+    ml_report = load_ml_report()
+    engineered_data = load_engineered_data()
+
+    ml_predictions = None
+    feature_transform = None
+    risk_models = None
+    query_engine = None
+    bitmap_index = None
+    sorted_index = None
+    patient_positions = None
+    similarity_index = None
+    name_index = None
+
+    cube_update = "none"
+    if olap_cube is not None:
+        columns = OLAP_CONFIG['dimensions'] + OLAP_CONFIG['measures']
+        if (engineered_data is not None and previous is not None and len(engineered_data) >= len(previous)
+                and engineered_data[columns].iloc[:len(previous)].equals(previous[columns])):
+            olap_cube.add(engineered_data.iloc[len(previous):])
+            cube_update = "incremental"
+        else:
+            olap_cube = None
+            cube_update = "rebuilt"
+
+    return {
+        "total_records": 0 if engineered_data is None else len(engineered_data),
+        "previous_records": 0 if previous is None else len(previous),
+        "cube_update": cube_update
+    }
+
+
+@app.route('/api/reload', methods=['POST'])
+def reload_endpoint():
+    """Reload reports and data written by a new pipeline run"""
+    return jsonify(reload_data())
+
+
+def get_bitmap_index():
+    """Bitmap indexes of the engineered dataset, or None if it is not loaded"""
+    global bitmap_index
+    if bitmap_index is None and engineered_data is not None:
+        bands = score_bands(engineered_data['Risk_Score'], RISK_SCORE_THRESHOLDS)
+        bitmap_index = BitmapIndex(engineered_data, BITMAP_INDEX_CONFIG['columns'],
+                                   bands={BITMAP_INDEX_CONFIG['risk_level_column']: bands})
+    return bitmap_index
+
+
+@app.route('/api/cohort')
+def get_cohort():
+    """
+    Patients matching categorical filters, answered from the bitmap indexes
+    Query parameters: per indexed column (Disease_Risk, City, BMI_Category,
+    Age_Group, Hypertension_Risk, Risk_Level) a comma-separated list of values,
+    e.g. /api/cohort?Disease_Risk=Diabetes,Heart Risk&City=Delhi&Risk_Level=high
+    match: 'all' (default, columns ANDed) or 'any' (columns ORed);
+    limit: patients listed (default 100, max 1000, 0 = count only)
+    """
+    index = get_bitmap_index()
+    if index is None:
+        return jsonify({"error": "Dataset not found"}), 404
+
+    error = unknown_parameters_error(index.bitmaps, ['limit', 'match'])
+    if error:
+        return error
+
+    try:
+        limit = int(request.args.get('limit', 100))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    if not 0 <= limit <= 1000:
+        return jsonify({"error": "limit must be between 0 and 1000"}), 400
+
+    filters = {
+        column: [value for item in request.args.getlist(column) for value in item.split(',')]
+        for column in index.bitmaps if column in request.args
+    }
+    try:
+        bits = index.cohort(filters, match=request.args.get('match', 'all'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    count = index.count(bits)
+    patients = []
+    if limit:
+        patients = patient_records(engineered_data.iloc[index.rows(bits)[:limit]])
+    return jsonify({
+        "filters": filters,
+        "count": count,
+        "percentage": round(count / index.n_rows * 100, 2) if index.n_rows else 0.0,
+        "patients": patients
+    })
+
+
+def get_sorted_index():
+    """Presorted columns of the engineered dataset, or None if it is not loaded"""
+    global sorted_index
+    if sorted_index is None and engineered_data is not None:
+        sorted_index = SortedColumnIndex(engineered_data, SORTED_INDEX_CONFIG['columns'],
+                                         SORTED_INDEX_CONFIG['group_columns'],
+                                         SORTED_INDEX_CONFIG['ranked_columns'])
+    return sorted_index
+
+
+@app.route('/api/threshold-sweep')
+def get_threshold_sweep():
+    """
+    Risk level and health level counts for arbitrary band thresholds
+    Query parameters: risk_<band> and health_<band> lower bounds overriding
+    RISK_SCORE_THRESHOLDS / HEALTH_SCORE_THRESHOLDS, e.g.
+    /api/threshold-sweep?risk_high=55&risk_medium=25&health_excellent=80
+    Counts overall, by City and by Disease_Risk, each from binary searches
+    into presorted Risk_Score / Health_Score values
+    """
+    index = get_sorted_index()
+    if index is None:
+        return jsonify({"error": "Dataset not found"}), 404
+
+    sweeps = {'risk_levels': ('Risk_Score', 'risk', RISK_SCORE_THRESHOLDS),
+              'health_levels': ('Health_Score', 'health', HEALTH_SCORE_THRESHOLDS)}
+    result = {"thresholds": {}}
+    for key, (column, prefix, defaults) in sweeps.items():
+        try:
+            thresholds = {band: float(request.args.get(f'{prefix}_{band}', bound)) for band, bound in defaults.items()}
+        except ValueError:
+            return jsonify({"error": f"{prefix}_<band> thresholds must be numbers"}), 400
+        if not all(math.isfinite(bound) for bound in thresholds.values()):
+            return jsonify({"error": f"{prefix}_<band> thresholds must be finite numbers"}), 400
+        # Bands keep their configured order (e.g. high above medium above low)
+        ordered = sorted(defaults, key=defaults.get, reverse=True)
+        if any(thresholds[upper] < thresholds[lower] for upper, lower in zip(ordered, ordered[1:])):
+            return jsonify({"error": f"{prefix} thresholds must keep the order {ordered}"}), 400
+
+        result["thresholds"][prefix] = thresholds
+        result[key] = {
+            "overall": index.band_counts(column, thresholds),
+            "by_city": {member: index.band_counts(column, thresholds, ('City', member))
+                        for member in index.members['City']},
+            "by_disease": {member: index.band_counts(column, thresholds, ('Disease_Risk', member))
+                           for member in index.members['Disease_Risk']}
+        }
+    return jsonify(result)
+
+
+@app.route('/api/top-risk-patients')
+def get_top_risk_patients():
+    """
+    Patients in descending Risk_Score order, paginated
+    Query parameters: page (default 1), page_size (default 100, max 1000),
+    and optionally one cohort filter on a group column, e.g. City=Delhi or
+    Disease_Risk=Diabetes
+    Pages are slices of a precomputed ordering (O(page_size) per request)
+    """
+    index = get_sorted_index()
+    if index is None:
+        return jsonify({"error": "Dataset not found"}), 404
+
+    try:
+        page = int(request.args.get('page', 1))
+        page_size = int(request.args.get('page_size', 100))
+    except ValueError:
+        return jsonify({"error": "page and page_size must be integers"}), 400
+    if page < 1 or not 1 <= page_size <= 1000:
+        return jsonify({"error": "page must be >= 1 and page_size between 1 and 1000"}), 400
+
+    cohort = [column for column in index.group_columns if column in request.args]
+    if len(cohort) > 1:
+        return jsonify({"error": f"Filter on at most one of {index.group_columns}"}), 400
+    group = (cohort[0], request.args[cohort[0]]) if cohort else None
+
+    ranked = index.ranked_positions('Risk_Score', group)
+    start = (page - 1) * page_size
+    patients = patient_records(engineered_data.iloc[ranked[start:start + page_size]])
+    for rank, patient in enumerate(patients, start=start + 1):
+        patient['rank'] = rank
+
+    return jsonify({
+        "cohort": dict([group]) if group else {},
+        "total": len(ranked),
+        "page": page,
+        "page_size": page_size,
+        "total_pages": -(-len(ranked) // page_size),
+        "patients": patients
+    })
+
+
+def get_patient_position(patient_id):
+    """Row position of a patient in engineered_data (hashed lookup), or None"""
+    global patient_positions
+    if patient_positions is None:
+        ids = engineered_data['Patient_ID']
+        first = ~ids.duplicated().to_numpy()
+        patient_positions = pd.Series(np.flatnonzero(first), index=ids[first].to_numpy())
+    position = patient_positions.get(patient_id)
+    return None if position is None else int(position)
+
+
+@app.route('/api/percentile-rank/<int:patient_id>')
+def get_percentile_rank(patient_id):
+    """
+    Percentile ranks of a patient's Risk_Score, Health_Score, BMI, Blood_Pressure
+    and Glucose in the whole population and in the patient's cohorts
+    Query parameters: cohorts (comma-separated, default City,Age_Group; any of
+    SORTED_INDEX_CONFIG['group_columns'])
+    Each rank is a binary search into presorted values (ties count half)
+    """
+    index = get_sorted_index()
+    if index is None:
+        return jsonify({"error": "Dataset not found"}), 404
+
+    cohorts = [col for col in request.args.get('cohorts', 'City,Age_Group').split(',') if col]
+    unknown = [col for col in cohorts if col not in index.group_columns]
+    if unknown:
+        return jsonify({"error": f"Unknown cohorts {unknown} (available: {index.group_columns})"}), 400
+
+    position = get_patient_position(patient_id)
+    if position is None:
+        return jsonify({"error": f"Patient {patient_id} not found"}), 404
+    patient = engineered_data.iloc[position]
+
+    metrics = {}
+    for column in index.columns:
+        value = patient[column]
+        if pd.isna(value):
+            metrics[column] = {"value": None}
+            continue
+        metrics[column] = {
+            "value": float(value),
+            "population": index.percentile_rank(column, value),
+            **{cohort: None if pd.isna(patient[cohort]) else
+               index.percentile_rank(column, value, (cohort, patient[cohort]))
+               for cohort in cohorts}
+        }
+
+    return jsonify({
+        "patient_id": patient_id,
+        "cohorts": {cohort: None if pd.isna(patient[cohort]) else patient[cohort] for cohort in cohorts},
+        "percentile_ranks": metrics
+    })
+
+
+def get_similarity_index():
+    """KD-tree of the engineered dataset's scaled features, or None if it is not loaded"""
+    global similarity_index
+    if similarity_index is None and engineered_data is not None:
+        similarity_index = SimilarPatientIndex(engineered_data, SIMILARITY_CONFIG['features'],
+                                               leafsize=SIMILARITY_CONFIG['leafsize'])
+    return similarity_index
+
+
+@app.route('/api/similar-patients', methods=['POST'])
+def find_similar_patients():
+    """
+    Patients most similar to a patient or to a raw profile
+    
+    Expected JSON:
+    {
+        "patient_id": int,
+        or a raw profile as for /api/predict-risk:
+        "age", "bmi", "blood_pressure", "glucose", "disease_risk", "city",
+        "k": int (default 10, max SIMILARITY_CONFIG['max_k'])
+    }
+    Raw profiles are cleaned and engineered with the pipeline's persisted
+    feature transform; neighbors come from a KD-tree over the standardized
+    SIMILARITY_CONFIG features (Euclidean distance)
+    """
+    index = get_similarity_index()
+    if index is None:
+        return jsonify({"error": "Dataset not found"}), 404
+
+    data = request.get_json(silent=True) or {}
+    try:
+        k = int(data.get('k', 10))
+    except (TypeError, ValueError):
+        return jsonify({"error": "k must be an integer"}), 400
+    if not 1 <= k <= SIMILARITY_CONFIG['max_k']:
+        return jsonify({"error": f"k must be between 1 and {SIMILARITY_CONFIG['max_k']}"}), 400
+
+    exclude = None
+    if 'patient_id' in data:
+        try:
+            exclude = get_patient_position(int(data['patient_id']))
+        except (TypeError, ValueError):
+            return jsonify({"error": "patient_id must be an integer"}), 400
+        if exclude is None:
+            return jsonify({"error": f"Patient {data['patient_id']} not found"}), 404
+        values = engineered_data.iloc[exclude][index.features].to_dict()
+    else:
+        transform = get_feature_transform()
+        if transform is None:
+            return jsonify({"error": "Feature transform not found, run the pipeline to export it"}), 404
+        if not set(index.features) <= set(transform.features):
+            return jsonify({"error": "Feature transform does not compute all similarity features"}), 400
+        try:
+            values = dict(zip(transform.features, transform.transform([data])[0]))
+        except (TypeError, ValueError) as e:
+            return jsonify({"error": f"Invalid profile: {e}"}), 400
+        values = {name: values[name] for name in index.features}
+
+    if any(pd.isna(value) for value in values.values()):
+        return jsonify({"error": "Profile has missing features (e.g. unknown disease_risk)"}), 400
+
+    positions, distances = index.query(values, k=k, exclude_position=exclude)
+    neighbors = patient_records(engineered_data.iloc[positions])
+    for neighbor, distance in zip(neighbors, distances):
+        neighbor['distance'] = round(float(distance), 4)
+
+    return jsonify({
+        "query": {name: float(value) for name, value in values.items()},
+        "k": k,
+        "neighbors": neighbors
+    })
+
+
+def get_name_index():
+    """Name search index of the engineered dataset, or None if it is not loaded"""
+    global name_index
+    if name_index is None and engineered_data is not None:
+        name_index = NameSearchIndex(engineered_data['Name'])
+    return name_index
+
+
+@app.route('/api/search-patients')
+def search_patients():
+    """
+    Find patients by name
+    Query parameters: q (search text), limit (default 20, max
+    NAME_SEARCH_CONFIG['max_results']), mode: 'prefix' (a word of the name
+    starts with q, case-insensitive), 'fuzzy' (trigram similarity, tolerates
+    typos) or 'auto' (default: prefix, fuzzy if nothing matches)
+    total_matches counts patients with a matching name (fuzzy: among the
+    limit most similar names)
+    """
+    index = get_name_index()
+    if index is None:
+        return jsonify({"error": "Dataset not found"}), 404
+
+    query = request.args.get('q', '').strip()
+    mode = request.args.get('mode', 'auto')
+    if not query:
+        return jsonify({"error": "q is required"}), 400
+    if mode not in ('auto', 'prefix', 'fuzzy'):
+        return jsonify({"error": "mode must be 'auto', 'prefix' or 'fuzzy'"}), 400
+    try:
+        limit = int(request.args.get('limit', 20))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    if not 1 <= limit <= NAME_SEARCH_CONFIG['max_results']:
+        return jsonify({"error": f"limit must be between 1 and {NAME_SEARCH_CONFIG['max_results']}"}), 400
+
+    # (name id, similarity) of the matching names, best first
+    matches = []
+    if mode in ('auto', 'prefix'):
+        matches = [(name_id, None) for name_id in index.prefix(query)]
+        mode = 'prefix' if matches or mode == 'prefix' else 'fuzzy'
+    if mode == 'fuzzy':
+        matches = index.fuzzy(query, NAME_SEARCH_CONFIG['fuzzy_min_similarity'], limit=limit)
+
+    positions, scores = [], []
+    for name_id, similarity in matches:
+        rows = index.rows(name_id)[:limit - len(positions)]
+        positions.extend(rows)
+        scores.extend([similarity] * len(rows))
+        if len(positions) >= limit:
+            break
+
+    patients = patient_records(engineered_data.iloc[positions])
+    if mode == 'fuzzy':
+        for patient, similarity in zip(patients, scores):
+            patient['match_score'] = round(similarity, 3)
+
+    return jsonify({
+        "query": query,
+        "mode": mode,
+        "total_matches": index.row_count([name_id for name_id, _ in matches]),
+        "patients": patients
+    })
+
+
 @app.route('/api/dataset-stats')
 def get_dataset_stats():
     """Get basic dataset statistics"""
@@ -105,16 +847,13 @@ def get_high_risk_patients():
     if engineered_data is None:
         return jsonify({"error": "Dataset not found"}), 404
 
-    # Filter high-risk patients
-    high_risk = engineered_data[
-        (engineered_data['Risk_Score'] >= 60) |
-        (engineered_data['Disease_Risk'] == 'Heart Risk')
-    ]
+    # Filter high-risk patients: high Risk_Score band (>= 60) OR Heart Risk, from the bitmaps
+    index = get_bitmap_index()
+    bits = index.cohort({BITMAP_INDEX_CONFIG['risk_level_column']: ['high'], 'Disease_Risk': ['Heart Risk']},
+                        match='any')
+    high_risk = engineered_data.iloc[index.rows(bits)]
 
-    high_risk_list = high_risk[[
-        'Patient_ID', 'Name', 'Age', 'BMI', 'Blood_Pressure',
-        'Glucose', 'Disease_Risk', 'Health_Score', 'Risk_Score'
-    ]].to_dict('records')
+    high_risk_list = patient_records(high_risk)
 
     return jsonify({
         "total_high_risk": len(high_risk_list),
@@ -162,6 +901,8 @@ def predict_risk():
         "disease_risk": string,
         "city": string
     }
+    model_predictions holds the exported models' scores and top feature
+    contributions, computed with the pipeline's persisted feature transform
     """
     try:
         data = request.get_json()
@@ -172,50 +913,21 @@ def predict_risk():
         bp = float(data.get('blood_pressure', 0))
         glucose = float(data.get('glucose', 0))
         disease = data.get('disease_risk', 'Normal')
+        top_k = int(data.get('top_k', 5))
+        if top_k < 1:
+            return jsonify({"error": "top_k must be at least 1"}), 400
 
         # Calculate risk score (simplified version of ML model)
-        risk_score = 0
-
-        # Age risk
-        risk_score += (age - 50) * 0.5 if age > 50 else 0
-
-        # BMI risk
-        if bmi < 18.5 or bmi >= 30:
-            risk_score += 20
-        elif bmi >= 25:
-            risk_score += 10
-
-        # BP risk
-        if bp >= 140:
-            risk_score += 20
-        elif bp >= 120:
-            risk_score += 10
-
-        # Glucose risk
-        if glucose >= 126:
-            risk_score += 25
-        elif glucose >= 100:
-            risk_score += 15
-
-        # Disease risk
-        disease_risk_map = {
-            'Normal': 0,
-            'Asthma': 15,
-            'Hypertension': 20,
-            'Diabetes': 25,
-            'Heart Risk': 30
-        }
-        risk_score += disease_risk_map.get(disease, 0)
+        risk_score = float(rule_based_risk_score(age, bmi, bp, glucose, disease))
 
-        # Normalize
-        risk_score = min(100, max(0, risk_score))
         risk_probability = risk_score / 100
 
         return jsonify({
             "risk_score": round(risk_score, 2),
             "risk_probability": round(risk_probability, 4),
             "is_high_risk": risk_probability >= 0.5,
-            "risk_level": "HIGH" if risk_probability >= 0.5 else "LOW"
+            "risk_level": "HIGH" if risk_probability >= 0.5 else "LOW",
+            "model_predictions": score_exported_models(data, top_k)
         })
 
     except Exception as e:
@@ -247,9 +959,10 @@ def get_summary():
     if engineered_data is None:
         return jsonify({"error": "Dataset not found"}), 404
 
+    index = get_bitmap_index()
     summary = {
         "total_patients": len(engineered_data),
-        "high_risk_patients": len(engineered_data[engineered_data['Risk_Score'] >= 60]),
+        "high_risk_patients": index.count(index.any_of(BITMAP_INDEX_CONFIG['risk_level_column'], ['high'])),
         "average_age": float(engineered_data['Age'].mean()),
         "average_bmi": float(engineered_data['BMI'].mean()),
         "average_bp": float(engineered_data['Blood_Pressure'].mean()),
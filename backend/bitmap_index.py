@@ -0,0 +1,110 @@
+"""
+Packed bitmap indexes over the engineered dataset
+One bit per patient row for every member of the indexed columns; cohort
+filters combine bitmaps with bitwise AND / OR and count with popcount
+"""
+
+import numpy as np
+import pandas as pd
+
+if hasattr(np, 'bitwise_count'):
+    def popcount(words):
+        """Number of set bits in a packed bitmap"""
+        return int(np.bitwise_count(words).sum())
+else:
+    # NumPy < 2.0: per-byte lookup table
+    _BYTE_BITS = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+    def popcount(words):
+        """Number of set bits in a packed bitmap"""
+        return int(_BYTE_BITS[words.view(np.uint8)].sum(dtype=np.int64))
+
+
+def score_bands(scores, thresholds):
+    """
+    Band name per score from {band: lower bound} thresholds (e.g. RISK_SCORE_THRESHOLDS):
+    a score falls in the band with the highest bound it reaches; the lowest band
+    also takes scores below its bound. Missing scores get no band (None)
+    """
+    bands = sorted(thresholds.items(), key=lambda item: item[1], reverse=True)
+    scores = np.asarray(scores, dtype=float)
+    conditions = [scores >= bound for _, bound in bands[:-1]] + [~np.isnan(scores)]
+    return np.select(conditions, [name for name, _ in bands], default=None)
+
+
+class BitmapIndex:
+    """
+    Bitmap per (column, member): bit i is set if row i has that value
+    Bitmaps are packed little-endian into uint64 words (8 bytes per 64 rows),
+    so a cohort filter is a few AND / OR passes over n / 64 words instead of
+    full-column comparisons, and counting it is a popcount
+    Members are keyed by their string form (query parameters match directly);
+    missing values are in no bitmap
+    """
+
+    def __init__(self, df, columns, bands=None):
+        self.n_rows = len(df)
+        self.n_words = -(-self.n_rows // 64)
+        self.bitmaps = {}
+        for column in columns:
+            self.add_column(column, df[column])
+        for column, values in (bands or {}).items():
+            self.add_column(column, pd.Series(values))
+
+    def pack(self, mask):
+        """Packed bitmap of a boolean row mask"""
+        packed = np.packbits(np.asarray(mask, dtype=bool), bitorder='little')
+        words = np.zeros(self.n_words * 8, dtype=np.uint8)
+        words[:len(packed)] = packed
+        return words.view('<u8')
+
+    def add_column(self, column, values):
+        """Index every member of a column (Series of row values)"""
+        codes, uniques = pd.factorize(values)
+        self.bitmaps[column] = {str(member): self.pack(codes == code) for code, member in enumerate(uniques)}
+
+    def members(self, column):
+        return list(self.bitmaps[column])
+
+    def empty(self):
+        return np.zeros(self.n_words, dtype='<u8')
+
+    def any_of(self, column, values):
+        """Rows whose column equals any of values (OR of the member bitmaps)"""
+        if column not in self.bitmaps:
+            raise KeyError(f"Column {column!r} is not indexed (indexed: {list(self.bitmaps)})")
+        result = self.empty()
+        for value in values:
+            bitmap = self.bitmaps[column].get(str(value))
+            if bitmap is not None:
+                np.bitwise_or(result, bitmap, out=result)
+        return result
+
+    def cohort(self, filters, match='all'):
+        """
+        Rows matching {column: [values, ...]} filters: values of one column are
+        ORed; columns are ANDed (match='all') or ORed (match='any')
+        """
+        if match not in ('all', 'any'):
+            raise ValueError("match must be 'all' or 'any'")
+        result = None
+        for column, values in filters.items():
+            bits = self.any_of(column, values)
+            if result is None:
+                result = bits
+            elif match == 'all':
+                np.bitwise_and(result, bits, out=result)
+            else:
+                np.bitwise_or(result, bits, out=result)
+        if result is None:
+            # No filters: every row
+            result = self.pack(np.ones(self.n_rows, dtype=bool))
+        return result
+
+    def count(self, bits):
+        return popcount(bits)
+
+    def rows(self, bits):
+        """Row positions of the set bits, in row order"""
+        flags = np.unpackbits(bits.view(np.uint8), count=self.n_rows, bitorder='little')
+        return np.flatnonzero(flags)
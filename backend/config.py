@@ -33,12 +33,47 @@ DATA_QUALITY = {
     }
 }
 
+# Synthetic Raw Data Generator (scripts/generate_synthetic_data.py)
+SYNTHETIC_DATA_CONFIG = {
+    'chunk_size': 1_000_000,
+    'random_state': 42,
+    'start_id': 1,
+    # Clean value distributions: 'normal' (mean, std) or 'uniform' (low, high),
+    # clipped to [min, max] and rounded to decimals
+    'distributions': {
+        'Age': {'dist': 'normal', 'mean': 50, 'std': 18, 'min': 18, 'max': 95, 'decimals': 0},
+        'BMI': {'dist': 'normal', 'mean': 26, 'std': 5, 'min': 14, 'max': 50, 'decimals': 1},
+        'Blood_Pressure': {'dist': 'normal', 'mean': 135, 'std': 22, 'min': 80, 'max': 250, 'decimals': 0},
+        'Glucose': {'dist': 'normal', 'mean': 110, 'std': 35, 'min': 50, 'max': 300, 'decimals': 0}
+    },
+    # Category probabilities
+    'disease_risk': {'Normal': 0.3, 'Asthma': 0.15, 'Hypertension': 0.2, 'Diabetes': 0.2, 'Heart Risk': 0.15},
+    'city': {'Delhi': 0.2, 'Mumbai': 0.2, 'Bangalore': 0.15, 'Chennai': 0.15, 'Pune': 0.15, 'Jaipur': 0.15},
+    # Fraction of rows with each kind of dirty value (what data cleaning repairs)
+    'dirty_rates': {
+        'missing': 0.05,            # per numeric column
+        'age_over_100': 0.01,
+        'negative_bmi': 0.01,
+        'negative_glucose': 0.01,
+        'extreme_blood_pressure': 0.01
+    }
+}
+
 # Feature Engineering Configuration
 FEATURE_CONFIG = {
     'scale_features': True,
     'scaler_type': 'StandardScaler',
     'drop_original_categorical': False,
-    'create_interaction_features': True
+    'create_interaction_features': True,
+    # 'dense': boolean one-hot columns, 'sparse': integer codes + scipy CSR one-hot
+    'categorical_encoding': 'dense',
+    # Train models on sparse one-hot City/Disease_Risk/BMI_Category/Age_Group as well
+    'one_hot_model_features': False,
+    # Persisted category vocabularies: new batches are encoded against it, never refit
+    # (relative to the parent of run_pipeline's data directory; absolute paths as given)
+    'vocabulary_path': 'data/category_vocabulary.json',
+    # Unknown categories: 'ignore' -> code -1 / all-zero one-hot, 'error' -> raise
+    'unknown_category_policy': 'ignore'
 }
 
 # ML Model Configuration
@@ -47,15 +82,59 @@ ML_CONFIG = {
     'logistic_regression': {
         'max_iter': 1000,
         'solver': 'lbfgs',
-        'class_weight': 'balanced'
+        'class_weight': 'balanced',
+        'random_state': 42
     },
     'random_forest': {
         'n_estimators': 100,
         'max_depth': 10,
         'class_weight': 'balanced',
+        'random_state': 42,
+        'n_jobs': -1
+    },
+    'target_variable': 'risk_binary',  # Binary: High Risk (1) vs Low Risk (0)
+    # Saved train/test matrices (ml_training_data/): .npy arrays + metadata.json, memory-mappable
+    'training_data': {
+        'dtype': 'float64',       # 'float32' halves the size at ~1e-7 relative precision
+        'write_csv': False        # also write the legacy train_scaled.csv / test_scaled.csv
+    },
+    # Stratified k-fold cross-validation, folds trained in a process pool
+    # Off by default: on small datasets the pool startup costs far more than the fits
+    'cross_validation': {
+        'enabled': False,
+        'n_splits': 5,
+        'n_jobs': -1
+    },
+    # Online training: SGD logistic regression updated with partial_fit per batch of patients
+    'online_training': {
+        'enabled': False,
+        'batch_size': 1000,
+        'alpha': 0.0001,
+        'refit_every_batches': 50,   # full refit on the retained history to guard against drift
+        'refit_epochs': 5,
+        'history_rows': 1000000,     # most recent rows kept for refits
         'random_state': 42
     },
-    'target_variable': 'risk_binary'  # Binary: High Risk (1) vs Low Risk (0)
+    # Hyperparameter search (successive halving), on top of the settings above
+    'tuning': {
+        'enabled': False,
+        'scoring': 'roc_auc',
+        'halving_factor': 3,      # keep the best 1/3 of candidates per rung, 3x more samples
+        'min_samples': 50,        # training samples in the first rung
+        'cv_folds': 3,
+        'n_jobs': -1,             # parallel candidate fits (-1 = all cores)
+        'time_budget_seconds': 300,
+        'search_space': {
+            'logistic_regression': {
+                'C': [0.01, 0.1, 1.0, 10.0, 100.0]
+            },
+            'random_forest': {
+                'n_estimators': [50, 100, 200],
+                'max_depth': [5, 10, 20, None],
+                'min_samples_leaf': [1, 2, 5]
+            }
+        }
+    }
 }
 
 # Risk Classification Rules
@@ -79,6 +158,48 @@ API_CONFIG = {
     'json_sort_keys': False
 }
 
+# Generic query endpoint (/api/query, backend/query_engine.py)
+QUERY_CONFIG = {
+    'engine': 'auto',             # 'duckdb' (if installed), 'pandas', or 'auto'
+    'threads': None,              # DuckDB worker threads (None = all cores)
+    'max_rows': 10000             # largest result a query may return
+}
+
+# Aggregate cube for analytics slices (/api/cube, backend/olap_cube.py)
+OLAP_CONFIG = {
+    'dimensions': ['City', 'Disease_Risk', 'Age_Group', 'BMI_Category'],
+    'measures': ['Risk_Score', 'Health_Score']
+}
+
+# Bitmap indexes for cohort filters (/api/cohort, backend/bitmap_index.py)
+BITMAP_INDEX_CONFIG = {
+    'columns': ['Disease_Risk', 'City', 'BMI_Category', 'Age_Group', 'Hypertension_Risk'],
+    'risk_level_column': 'Risk_Level'   # Risk_Score bands of RISK_SCORE_THRESHOLDS (high/medium/low)
+}
+
+# Presorted numeric columns for threshold sweeps and percentile ranks (backend/sorted_index.py)
+SORTED_INDEX_CONFIG = {
+    'columns': ['Risk_Score', 'Health_Score', 'BMI', 'Blood_Pressure', 'Glucose'],
+    'group_columns': ['City', 'Disease_Risk', 'Age_Group'],  # cohorts with their own sorted values
+    'ranked_columns': ['Risk_Score']    # descending row orderings for top-K lists (/api/top-risk-patients)
+}
+
+# Similar-patient search (/api/similar-patients, backend/similarity_index.py)
+SIMILARITY_CONFIG = {
+    # Standardized model features spanning the KD-tree (computable from a raw profile)
+    'features': ['Age', 'BMI', 'Blood_Pressure', 'Glucose', 'Health_Score', 'Risk_Score',
+                 'BMI_Deviation', 'Glucose_BMI_Ratio', 'Metabolic_Health', 'Cardiovascular_Risk',
+                 'Disease_Risk_Priority'],
+    'leafsize': 32,
+    'max_k': 100
+}
+
+# Patient name search (/api/search-patients, backend/name_index.py)
+NAME_SEARCH_CONFIG = {
+    'fuzzy_min_similarity': 0.3,  # Dice similarity of name trigrams
+    'max_results': 100
+}
+
 # Dashboard Configuration
 DASHBOARD_CONFIG = {
     'charts': ['age_distribution', 'bmi_distribution', 'disease_risk', 'bp_glucose', 'city_distribution'],
@@ -97,7 +218,11 @@ REPORT_CONFIG = {
 LOGGING_CONFIG = {
     'level': 'INFO',
     'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    'file': 'logs/healthcare_ml.log'
+    'file': 'logs/healthcare_ml.log',
+    'structured': True,           # log file as JSON lines (event name + fields)
+    'quiet': False,               # warnings only: no per-row or summary-table formatting
+    'row_dump_limit': 20,         # rows of invalid-record dumps shown in the log
+    'row_dump_file': None         # e.g. 'logs/invalid_records.csv' for all dumped rows
 }
 
 # City Options
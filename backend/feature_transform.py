@@ -0,0 +1,191 @@
+"""
+Serialized feature transform for online scoring
+Computes the model feature columns of the batch pipeline (data_cleaning.py +
+feature_engineering.py) for single rows or small batches with plain Python
+float math: no pandas, same operations in the same order, so every value
+matches the batch pipeline bit for bit
+"""
+
+import json
+import logging
+import math
+from pathlib import Path
+
+# Child of the pipeline's healthcare logger (scripts/pipeline_logging.py), which
+# run_pipeline configures; the API leaves it unconfigured
+logger = logging.getLogger('healthcare.feature_transform')
+
+# Disease_Risk points of the Risk_Score and priority codes (feature_engineering.py)
+DISEASE_RISK_POINTS = {'Normal': 0, 'Asthma': 15, 'Hypertension': 20, 'Diabetes': 25, 'Heart Risk': 30}
+DISEASE_RISK_PRIORITY = {'Normal': 1, 'Asthma': 2, 'Hypertension': 3, 'Diabetes': 4, 'Heart Risk': 5}
+
+# Code of cities that are not in the vocabulary (category_vocabulary.UNKNOWN_CODE)
+UNKNOWN_CODE = -1
+
+
+def _clip(x, low, high):
+    # np.clip: NaN stays NaN
+    return min(max(x, low), high)
+
+
+def _round2(x):
+    # Series.round(2) is numpy's rint(x * 100) / 100; round() is also half-to-even
+    y = x * 100
+    return round(y) / 100 if math.isfinite(y) else y
+
+
+def age_group(age):
+    """Age_Group of feature_engineering.py: pd.cut over (0, 18], (18, 30], ... (60, 100]"""
+    for upper, label in ((18, 'Child_Teen'), (30, 'Young_Adult'), (45, 'Middle_Age'), (60, 'Senior'), (100, 'Elderly')):
+        if 0 < age <= upper:
+            return label
+    return None
+
+
+def bmi_category(bmi):
+    """BMI_Category of feature_engineering.py"""
+    if bmi < 18.5:
+        return 'Underweight'
+    elif bmi < 25:
+        return 'Normal'
+    elif bmi < 30:
+        return 'Overweight'
+    return 'Obese'
+
+
+class FeatureTransform:
+    """
+    Raw patient fields -> model feature vector
+    - features: model feature columns, in model input order
+    - city_categories: City vocabulary (code = position), as used for City_Encoded
+    - fill_values: cleaning medians (HealthcareDataCleaner.fill_values) that
+      replace missing and invalid measurements like the batch cleaning does
+    - one_hot: {column: {'prefix', 'categories'}} of the one-hot model features
+      (FEATURE_CONFIG['one_hot_model_features']), e.g. City -> City_Delhi, ...;
+      categories outside the vocabulary give all-zero columns
+    """
+
+    def __init__(self, features, city_categories, fill_values=None, one_hot=None):
+        self.features = list(features)
+        self.city_categories = list(city_categories)
+        self.city_codes = {city: code for code, city in enumerate(self.city_categories)}
+        self.one_hot = {
+            column: {'prefix': spec['prefix'], 'categories': list(spec['categories'])}
+            for column, spec in (one_hot or {}).items()
+        }
+        # One-hot column name -> (categorical column, category)
+        self.one_hot_columns = {
+            f"{spec['prefix']}_{category}": (column, category)
+            for column, spec in self.one_hot.items() for category in spec['categories']
+        }
+        # Plain floats (the cleaner's medians are NumPy scalars), JSON-serializable
+        fill_values = fill_values or {}
+        self.fill_values = {
+            key: ({col: float(v) for col, v in value.items()} if isinstance(value, dict) else float(value))
+            for key, value in fill_values.items()
+        }
+
+    @classmethod
+    def load(cls, path):
+        """Load a transform saved with save()"""
+        with open(path, 'r') as f:
+            data = json.load(f)
+        return cls(data['features'], data['city_categories'], data.get('fill_values'), data.get('one_hot'))
+
+    def save(self, path):
+        """Save the transform as JSON"""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({
+                'features': self.features,
+                'city_categories': self.city_categories,
+                'fill_values': self.fill_values,
+                'one_hot': self.one_hot
+            }, f, indent=2)
+        logger.info("Feature transform saved to: %s", path)
+        return path
+
+    def clean(self, age, bmi, blood_pressure, glucose):
+        """
+        Cleaning steps of HealthcareDataCleaner for one row
+        Missing values get the medians, invalid values the valid-value medians;
+        ages outside 0-100 (rows the batch cleaning drops) raise a ValueError
+        """
+        values = {'Age': age, 'BMI': bmi, 'Blood_Pressure': blood_pressure, 'Glucose': glucose}
+        missing = self.fill_values.get('missing', {})
+        for col, val in values.items():
+            val = float('nan') if val is None else float(val)
+            if math.isnan(val) and col in missing:
+                val = float(missing[col])
+            values[col] = val
+
+        if not 0 <= values['Age'] <= 100:
+            raise ValueError(f"Age must be between 0 and 100, got {values['Age']}")
+        if values['BMI'] < 0 and 'bmi' in self.fill_values:
+            values['BMI'] = float(self.fill_values['bmi'])
+        if values['Glucose'] < 0 and 'glucose' in self.fill_values:
+            values['Glucose'] = float(self.fill_values['glucose'])
+        if not 60 <= values['Blood_Pressure'] <= 300 and 'blood_pressure' in self.fill_values:
+            values['Blood_Pressure'] = float(self.fill_values['blood_pressure'])
+        return values['Age'], values['BMI'], values['Blood_Pressure'], values['Glucose']
+
+    def compute_features(self, age, bmi, blood_pressure, glucose, disease_risk, city):
+        """All engineered model columns of one cleaned row, as a dict"""
+        nan = float('nan')
+        bp = blood_pressure
+
+        # Health_Score
+        age_score = 100 - (age / 100) * 100
+        bmi_score = _clip(100 if (18.5 <= bmi <= 24.9) else 100 - (abs(bmi - 21.5) / 21.5) * 100, 0, 100)
+        bp_score = _clip(100 - (bp / 300) * 100, 0, 100)
+        glucose_score = _clip(100 - (glucose / 300) * 100, 0, 100)
+        health_score = age_score * 0.2 + bmi_score * 0.3 + bp_score * 0.25 + glucose_score * 0.25
+
+        # Risk_Score
+        risk_score = 0 + ((age - 50) / 50 if age > 50 else 0) * 15
+        risk_score += 0 if (18.5 <= bmi <= 24.9) else 10 if (25 <= bmi < 30) else 20
+        risk_score += 0 if bp < 120 else 10 if bp < 140 else 20
+        risk_score += 0 if glucose < 100 else 15 if glucose < 126 else 25
+        risk_score += DISEASE_RISK_POINTS.get(disease_risk, nan)
+
+        features = {
+            'Age': age,
+            'BMI': bmi,
+            'Blood_Pressure': bp,
+            'Glucose': glucose,
+            'Health_Score': health_score,
+            'Risk_Score': float(risk_score),
+            'BMI_Deviation': 0.0 if (18.5 <= bmi <= 24.9) else abs(bmi - 21.5),
+            'Glucose_BMI_Ratio': _round2(glucose / (bmi + 1)),
+            'Metabolic_Health': _clip((125 - glucose) / 125 * 50 + (100 - abs(bmi - 22)) / 100 * 50, 0, 100),
+            'Cardiovascular_Risk': _clip((bp / 300) * 50 + (age / 100) * 30 + abs(bmi - 22) / 22 * 20, 0, 100),
+            'Disease_Risk_Priority': float(DISEASE_RISK_PRIORITY.get(disease_risk, nan)),
+            'Age_BMI_Interaction': (age * bmi) / 1000,
+            'BP_Glucose_Interaction': (bp * glucose) / 10000,
+            # x ** 2 on a Series is numpy's square, i.e. x * x
+            'Metabolic_Stress': (bmi - 22) * (bmi - 22) + (glucose - 100) * (glucose - 100) / 100,
+            'City_Encoded': float(self.city_codes.get(city, UNKNOWN_CODE))
+        }
+        if self.one_hot_columns:
+            categories = {'Age_Group': age_group(age), 'BMI_Category': bmi_category(bmi),
+                          'Disease_Risk': disease_risk, 'City': city}
+            for name, (column, category) in self.one_hot_columns.items():
+                features[name] = 1.0 if categories.get(column) == category else 0.0
+        return features
+
+    def transform_one(self, age, bmi, blood_pressure, glucose, disease_risk, city):
+        """Model feature vector (list of floats) of one raw row"""
+        age, bmi, blood_pressure, glucose = self.clean(age, bmi, blood_pressure, glucose)
+        features = self.compute_features(age, bmi, blood_pressure, glucose, disease_risk, city)
+        return [features[name] for name in self.features]
+
+    def transform(self, rows):
+        """
+        Feature vectors of a small batch of raw rows: dicts with keys age, bmi,
+        blood_pressure, glucose, disease_risk and city (the predict-risk payload)
+        """
+        return [
+            self.transform_one(row.get('age'), row.get('bmi'), row.get('blood_pressure'),
+                               row.get('glucose'), row.get('disease_risk'), row.get('city'))
+            for row in rows
+        ]
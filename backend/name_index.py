@@ -0,0 +1,156 @@
+"""
+Patient name search: prefix lookups and fuzzy (trigram) matching
+Built once over the distinct names; a query touches only the matching
+names and their rows, never the whole Name column
+"""
+
+import numpy as np
+import pandas as pd
+
+# Code points are < 0x110000, so three of them pack into one int64 trigram key
+_BASE = 0x110000
+_SPACE = ord(' ')
+
+
+def normalize_name(name):
+    """Case-folded name with single spaces"""
+    return ' '.join(str(name).casefold().split())
+
+
+def _char_matrix(names):
+    """Code points of names (one row per name, NUL-filled) and name lengths"""
+    names = np.asarray(names, dtype=str)
+    width = max(names.dtype.itemsize // 4, 1)
+    return names.view(np.uint32).reshape(len(names), width), np.char.str_len(names)
+
+
+def trigram_keys(names):
+    """
+    Distinct trigram keys of each normalized name, padded like pg_trgm (two
+    spaces before, one after); returns (name index, key) pairs
+    """
+    chars, lengths = _char_matrix(names)
+    n, width = chars.shape
+    padded = np.zeros((n, width + 3), dtype=np.int64)
+    padded[:, :2] = _SPACE
+    padded[:, 2:width + 2] = chars
+    padded[np.arange(n), lengths + 2] = _SPACE
+    keys = (padded[:, :-2] * _BASE + padded[:, 1:-1]) * _BASE + padded[:, 2:]
+
+    # A name of length L has L + 1 trigrams; drop the rest, then repeats within a name
+    keys[np.arange(width + 1) > lengths[:, None]] = -1
+    keys.sort(axis=1)
+    distinct = (keys >= 0) & (keys != np.pad(keys[:, :-1], ((0, 0), (1, 0)), constant_values=-1))
+    return np.nonzero(distinct)[0], keys[distinct]
+
+
+def word_suffixes(names):
+    """
+    Every suffix of each normalized name that starts at a word, e.g.
+    'rahul kumar sharma' -> itself, 'kumar sharma', 'sharma'
+    Returns (name index, suffix) pairs
+    """
+    chars, lengths = _char_matrix(names)
+    width = chars.shape[1]
+    columns = np.arange(width)
+    previous = np.pad(chars[:, :-1], ((0, 0), (1, 0)), constant_values=_SPACE)
+    starts = (chars != _SPACE) & (previous == _SPACE) & (columns < lengths[:, None])
+    name_index, start = np.nonzero(starts)
+    source = start[:, None] + columns
+    suffixes = np.where(source < width, chars[name_index[:, None], np.minimum(source, width - 1)], 0)
+    return name_index, suffixes.astype(np.uint32).view(f'<U{width}').ravel()
+
+
+class NameSearchIndex:
+    """
+    Search structures over the distinct normalized names of a Name column
+    - rows per name: row positions grouped by name (offsets into one array)
+    - prefix: sorted word-start suffixes of all names; the names with a word
+      (or run of words) starting with the query are a binary-searched range
+    - fuzzy: trigram -> names inverted index (sorted keys with posting
+      offsets); names are ranked by Dice similarity of trigram sets
+    Suffixes and trigrams are generated with array operations, in chunks of
+    names; missing names are not indexed
+    """
+
+    def __init__(self, names, chunk_size=200_000):
+        raw_codes, raw_names = pd.factorize(pd.Series(names))
+        codes, uniques = pd.factorize(pd.Series(raw_names, dtype=object).map(normalize_name))
+        codes = np.where(raw_codes >= 0, codes[raw_codes], -1) if len(codes) else raw_codes
+        self.names = np.asarray(uniques, dtype=str)
+
+        # Row positions grouped by name code
+        indexed = np.flatnonzero(codes >= 0)
+        order = np.argsort(codes[indexed], kind='stable')
+        self.name_rows = indexed[order]
+        self.row_offsets = np.searchsorted(codes[indexed][order], np.arange(len(self.names) + 1))
+
+        suffix_ids, suffixes, trigram_ids, keys = [], [], [], []
+        for start in range(0, len(self.names), chunk_size):
+            chunk = self.names[start:start + chunk_size]
+            ids, values = word_suffixes(chunk)
+            suffix_ids.append(ids + start)
+            suffixes.append(values)
+            ids, values = trigram_keys(chunk)
+            trigram_ids.append(ids + start)
+            keys.append(values)
+
+        # Sorted word-start suffixes for prefix ranges
+        suffix_ids = np.concatenate(suffix_ids) if suffix_ids else np.zeros(0, dtype=np.int64)
+        suffixes = np.concatenate(suffixes) if suffixes else np.zeros(0, dtype=str)
+        suffix_order = np.argsort(suffixes)
+        self.sorted_suffixes = suffixes[suffix_order]
+        self.suffix_name_ids = suffix_ids[suffix_order]
+
+        # Trigram inverted index
+        trigram_ids = np.concatenate(trigram_ids) if trigram_ids else np.zeros(0, dtype=np.int64)
+        keys = np.concatenate(keys) if keys else np.zeros(0, dtype=np.int64)
+        self.trigram_counts = np.bincount(trigram_ids, minlength=len(self.names))
+        key_order = np.argsort(keys)
+        sorted_keys = keys[key_order]
+        key_starts = np.flatnonzero(np.diff(sorted_keys, prepend=-1))
+        self.trigram_keys = sorted_keys[key_starts]
+        self.posting_offsets = np.append(key_starts, len(keys))
+        self.posting_ids = trigram_ids[key_order]
+
+    def rows(self, name_id):
+        """Row positions of one name"""
+        return self.name_rows[self.row_offsets[name_id]:self.row_offsets[name_id + 1]]
+
+    def row_count(self, name_ids):
+        """Total rows of a set of names"""
+        name_ids = np.asarray(name_ids, dtype=np.int64)
+        return int((self.row_offsets[name_ids + 1] - self.row_offsets[name_ids]).sum())
+
+    def prefix(self, query):
+        """
+        Ids of the names with a word starting with the query (case-insensitive),
+        in order of the matching words
+        """
+        query = normalize_name(query)
+        if not query:
+            return np.zeros(0, dtype=np.int64)
+        # U+10FFFF sorts after every character: the end of the prefix range
+        start, end = np.searchsorted(self.sorted_suffixes, [query, query + '\U0010ffff'])
+        return pd.unique(self.suffix_name_ids[start:end])
+
+    def fuzzy(self, query, min_similarity=0.3, limit=50):
+        """
+        Up to limit (name id, similarity) pairs with Dice similarity >= min_similarity,
+        most similar first; tolerates typos and transposed letters
+        """
+        query = normalize_name(query)
+        if not query or len(self.trigram_keys) == 0:
+            return []
+        _, query_keys = trigram_keys([query])
+        found = np.searchsorted(self.trigram_keys, query_keys)
+        found = found[self.trigram_keys[np.minimum(found, len(self.trigram_keys) - 1)] == query_keys]
+        if len(found) == 0:
+            return []
+        hits = np.concatenate([self.posting_ids[self.posting_offsets[i]:self.posting_offsets[i + 1]] for i in found])
+        candidates, shared = np.unique(hits, return_counts=True)
+        similarity = 2 * shared / (len(query_keys) + self.trigram_counts[candidates])
+        keep = similarity >= min_similarity
+        candidates, similarity = candidates[keep], similarity[keep]
+        best = np.lexsort((self.names[candidates], -similarity))[:limit]
+        return [(int(candidates[i]), float(similarity[i])) for i in best]
@@ -0,0 +1,199 @@
+"""
+NumPy-only inference for exported risk models
+Evaluates models exported by HealthcareMLPreparation.export_inference_models()
+without importing scikit-learn
+"""
+
+import numpy as np
+
+
+class LinearRiskModel:
+    """
+    Logistic regression with the StandardScaler folded into the weights:
+    weights = coef / scale, bias = intercept - weights . mean
+    Raw (unscaled) features go through a single dot product
+    """
+
+    def __init__(self, arrays):
+        self.feature_names = [str(name) for name in arrays['feature_names']]
+        self.weights = arrays['weights']
+        self.bias = float(arrays['bias'])
+        self.coef = arrays['coef']
+        self.intercept = float(arrays['intercept'])
+        self.mean = arrays['mean']
+        self.scale = arrays['scale']
+
+    def decision_function(self, X):
+        return np.asarray(X, dtype=float) @ self.weights + self.bias
+
+    def predict_proba(self, X):
+        """Class probabilities [P(low risk), P(high risk)] for raw feature rows"""
+        p = 1.0 / (1.0 + np.exp(-self.decision_function(X)))
+        return np.column_stack([1.0 - p, p])
+
+    def predict(self, X):
+        return (self.decision_function(X) > 0).astype(int)
+
+    def explain(self, X):
+        """
+        Linear contributions to the log-odds of high risk: coef x scaled feature
+        Returns (contributions of shape (n_rows, n_features), expected_value);
+        expected_value + contributions.sum(axis=1) is the decision function
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        return self.coef * ((X - self.mean) / self.scale), self.intercept
+
+
+class ForestRiskModel:
+    """
+    Random forest as flat node arrays of all trees:
+    feature / threshold / left / right per node, class probabilities per node,
+    and the root node of each tree. Rows of a batch walk all trees at once,
+    one tree level per step
+    Split thresholds are in raw feature space (the scaler is folded in at
+    export), so raw features are compared directly without a scaling pass
+    """
+
+    def __init__(self, arrays, chunk_size=1024):
+        self.feature_names = [str(name) for name in arrays['feature_names']]
+        self.feature = arrays['feature']
+        self.threshold = arrays['raw_threshold']
+        self.left = arrays['left']
+        self.right = arrays['right']
+        self.value = arrays['value']
+        self.roots = arrays['roots']
+        self.max_depth = int(arrays['max_depth'])
+        self.mean = arrays['mean']
+        self.scale = arrays['scale']
+        self.chunk_size = chunk_size
+        # Traversal arrays: leaves point to themselves, so rows that reach a
+        # leaf early stay there without a per-step leaf check
+        nodes = np.arange(len(self.feature), dtype=np.int32)
+        is_leaf = self.left < 0
+        # Children interleaved: node n goes to _children[2n] (left) or _children[2n + 1] (right)
+        self._children = np.column_stack([
+            np.where(is_leaf, nodes, self.left), np.where(is_leaf, nodes, self.right)
+        ]).astype(np.int32).ravel()
+        self._feature = np.where(is_leaf, 0, self.feature).astype(np.int32)
+        self._positive = np.ascontiguousarray(self.value[:, 1])
+
+    def _descend(self, X, contributions=None):
+        """
+        Walk all rows down all trees; returns the leaf of every (row, tree)
+        If given, contributions (n_rows, n_features) accumulates the change in
+        P(high risk) at every split, credited to the split feature
+        """
+        X = np.ascontiguousarray(np.atleast_2d(X), dtype=float)
+        n_rows, n_features = X.shape
+        flat = X.ravel()
+        offsets = (np.arange(n_rows, dtype=np.int32) * n_features)[:, None]
+        node = np.broadcast_to(self.roots.astype(np.int32), (n_rows, len(self.roots))).copy()
+        for _ in range(self.max_depth):
+            feature = self._feature.take(node)
+            go_right = ~(flat.take(offsets + feature) <= self.threshold.take(node))
+            child = self._children.take(2 * node + go_right)
+            if contributions is not None:
+                # Leaves point to themselves, so finished paths add zero
+                delta = self._positive.take(child) - self._positive.take(node)
+                contributions += np.bincount(
+                    (offsets + feature).ravel(), weights=delta.ravel(), minlength=n_rows * n_features
+                ).reshape(n_rows, n_features)
+            node = child
+        return node
+
+    def apply(self, X):
+        """Leaf node index of every row in every tree, shape (n_rows, n_trees)"""
+        return self._descend(X)
+
+    def predict_proba(self, X):
+        """Class probabilities [P(low risk), P(high risk)] for raw feature rows"""
+        X = np.atleast_2d(X)
+        proba = np.zeros((len(X), self.value.shape[1]))
+        for start in range(0, len(X), self.chunk_size):
+            leaves = self.apply(X[start:start + self.chunk_size])
+            # (n_trees, n_rows, n_classes) summed over axis 0 accumulates tree
+            # by tree, in the same order as scikit-learn
+            proba[start:start + self.chunk_size] = self.value.take(leaves.T, axis=0).sum(axis=0)
+        proba /= len(self.roots)
+        return proba
+
+    def predict(self, X):
+        return self.predict_proba(X).argmax(axis=1)
+
+    def explain(self, X):
+        """
+        Tree-path (Saabas) contributions to P(high risk), averaged over trees
+        Returns (contributions of shape (n_rows, n_features), expected_value);
+        expected_value + contributions.sum(axis=1) is predict_proba(X)[:, 1]
+        """
+        X = np.atleast_2d(X)
+        contributions = np.zeros((len(X), len(self.feature_names)))
+        for start in range(0, len(X), self.chunk_size):
+            self._descend(X[start:start + self.chunk_size], contributions[start:start + self.chunk_size])
+        expected_value = float(self._positive.take(self.roots).mean())
+        return contributions / len(self.roots), expected_value
+
+
+# Rule-based risk points per Disease_Risk category (unknown categories score 0)
+DISEASE_RISK_POINTS = {
+    'Normal': 0,
+    'Asthma': 15,
+    'Hypertension': 20,
+    'Diabetes': 25,
+    'Heart Risk': 30
+}
+
+
+def rule_based_risk_score(age, bmi, blood_pressure, glucose, disease_risk):
+    """
+    Rule-based risk score (0-100) of the /api/predict-risk endpoint
+    Vectorized: takes scalars or equal-length arrays, returns a float array
+    """
+    age = np.asarray(age, dtype=float)
+    bmi = np.asarray(bmi, dtype=float)
+    blood_pressure = np.asarray(blood_pressure, dtype=float)
+    glucose = np.asarray(glucose, dtype=float)
+
+    # Disease points via the distinct categories, not a per-row dict lookup
+    categories, inverse = np.unique(np.asarray(disease_risk, dtype=str), return_inverse=True)
+    disease_points = np.array([DISEASE_RISK_POINTS.get(c, 0) for c in categories], dtype=float)[inverse]
+
+    risk_score = (
+        np.where(age > 50, (age - 50) * 0.5, 0.0)
+        + np.where((bmi < 18.5) | (bmi >= 30), 20.0, np.where(bmi >= 25, 10.0, 0.0))
+        + np.where(blood_pressure >= 140, 20.0, np.where(blood_pressure >= 120, 10.0, 0.0))
+        + np.where(glucose >= 126, 25.0, np.where(glucose >= 100, 15.0, 0.0))
+        + disease_points.reshape(np.shape(disease_risk))
+    )
+    return np.clip(risk_score, 0, 100)
+
+
+MODEL_TYPES = {
+    'linear': LinearRiskModel,
+    'forest': ForestRiskModel
+}
+
+
+def top_contributions(contributions, feature_names, k=5):
+    """
+    The k features with the largest absolute contribution of every row, as
+    [{'feature', 'contribution'}, ...] lists (selection is vectorized)
+    """
+    contributions = np.atleast_2d(contributions)
+    k = min(k, contributions.shape[1])
+    top = np.argpartition(-np.abs(contributions), k - 1, axis=1)[:, :k]
+    top_values = np.take_along_axis(contributions, top, axis=1)
+    order = np.argsort(-np.abs(top_values), axis=1)
+    top = np.take_along_axis(top, order, axis=1)
+    top_values = np.take_along_axis(top_values, order, axis=1)
+    return [
+        [{'feature': feature_names[j], 'contribution': float(v)} for j, v in zip(row, values)]
+        for row, values in zip(top, top_values)
+    ]
+
+
+def load_risk_model(path):
+    """Load an exported model (.npz) as a LinearRiskModel or ForestRiskModel"""
+    with np.load(path, allow_pickle=False) as arrays:
+        arrays = {key: arrays[key] for key in arrays.files}
+    return MODEL_TYPES[str(arrays['model_type'])](arrays)
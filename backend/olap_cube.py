@@ -0,0 +1,145 @@
+"""
+Materialized aggregate cube over the engineered dataset
+Counts, sums and sums of squares per combination of the categorical
+dimensions, so slices and roll-ups never touch the patient rows
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class AggregateCube:
+    """
+    Dense cube with one cell per combination of dimension members
+    (e.g. City x Disease_Risk x Age_Group x BMI_Category)
+    - count: patients per cell
+    - per measure (e.g. Risk_Score, Health_Score): non-missing values,
+      sum and sum of squares per cell, giving mean and standard deviation
+      of any slice or roll-up
+    add() / remove() apply row changes incrementally (one bincount per
+    array); unseen members grow the cube. Missing dimension values are
+    kept as their own member, None
+    """
+
+    def __init__(self, dimensions, measures):
+        self.dimensions = list(dimensions)
+        self.measures = list(measures)
+        self.members = {dim: [] for dim in self.dimensions}
+        self._positions = {dim: {} for dim in self.dimensions}
+        shape = (0,) * len(self.dimensions)
+        self.count = np.zeros(shape, dtype=np.int64)
+        self.value_counts = np.zeros((len(self.measures),) + shape, dtype=np.int64)
+        self.sums = np.zeros((len(self.measures),) + shape)
+        self.sumsqs = np.zeros((len(self.measures),) + shape)
+
+    @classmethod
+    def from_frame(cls, df, dimensions, measures):
+        """Cube of all rows of df"""
+        cube = cls(dimensions, measures)
+        cube.add(df)
+        return cube
+
+    @property
+    def shape(self):
+        return self.count.shape
+
+    def _cell_index(self, df, grow):
+        """Flat cell index of every row; registers new members (growing the arrays) if grow"""
+        codes = []
+        for dim in self.dimensions:
+            row_codes, uniques = pd.factorize(df[dim], use_na_sentinel=False)
+            positions = self._positions[dim]
+            mapping = np.empty(len(uniques), dtype=np.int64)
+            for i, value in enumerate(uniques):
+                value = None if pd.isna(value) else value
+                if value not in positions:
+                    if not grow:
+                        raise ValueError(f"{dim} value {value!r} is not in the cube")
+                    positions[value] = len(self.members[dim])
+                    self.members[dim].append(value)
+                mapping[i] = positions[value]
+            codes.append(mapping[row_codes])
+
+        new_shape = tuple(len(self.members[dim]) for dim in self.dimensions)
+        if new_shape != self.shape:
+            pad = [(0, new - old) for new, old in zip(new_shape, self.shape)]
+            self.count = np.pad(self.count, pad)
+            self.value_counts = np.pad(self.value_counts, [(0, 0)] + pad)
+            self.sums = np.pad(self.sums, [(0, 0)] + pad)
+            self.sumsqs = np.pad(self.sumsqs, [(0, 0)] + pad)
+        return np.ravel_multi_index(codes, self.shape) if len(df) else np.zeros(0, dtype=np.int64)
+
+    def _apply(self, df, sign):
+        cells = self._cell_index(df, grow=sign > 0)
+        size = self.count.size
+        self.count += sign * np.bincount(cells, minlength=size).reshape(self.shape)
+        for i, measure in enumerate(self.measures):
+            values = df[measure].to_numpy(dtype=float)
+            present = ~np.isnan(values)
+            values = np.where(present, values, 0.0)
+            present_counts = np.bincount(cells, weights=present, minlength=size).astype(np.int64)
+            self.value_counts[i] += sign * present_counts.reshape(self.shape)
+            self.sums[i] += sign * np.bincount(cells, weights=values, minlength=size).reshape(self.shape)
+            self.sumsqs[i] += sign * np.bincount(cells, weights=values * values, minlength=size).reshape(self.shape)
+
+    def add(self, df):
+        """Add the rows of df (new or changed patients)"""
+        self._apply(df, 1)
+        return self
+
+    def remove(self, df):
+        """Remove rows previously added (deleted patients, old values of changed ones)"""
+        self._apply(df, -1)
+        if (self.count < 0).any():
+            raise ValueError("Removed rows that were not in the cube")
+        return self
+
+    def aggregate(self, group_by=(), filters=None):
+        """
+        Roll-up of the cube: one row per combination of the group_by members
+        (non-empty cells only), restricted to the filters' members
+        filters: {dimension: [member, ...]}; unknown members match nothing
+        Returns records with count and sum / mean / std of every measure
+        """
+        filters = filters or {}
+        if len(set(group_by)) != len(group_by):
+            raise ValueError("group_by dimensions must be unique")
+        for dim in list(group_by) + list(filters):
+            if dim not in self.dimensions:
+                raise ValueError(f"Unknown cube dimension: {dim!r} (expected one of {self.dimensions})")
+
+        index = []
+        for dim in self.dimensions:
+            if dim in filters:
+                positions = self._positions[dim]
+                index.append(np.array([positions[v] for v in filters[dim] if v in positions], dtype=np.int64))
+            else:
+                index.append(np.arange(len(self.members[dim])))
+        selection = np.ix_(*index)
+
+        # Sum out every dimension that is not grouped on
+        keep = [self.dimensions.index(dim) for dim in group_by]
+        drop = tuple(axis for axis in range(len(self.dimensions)) if axis not in keep)
+        # Reduced arrays keep the cube's axis order; transpose them to group_by order
+        order = np.argsort(np.argsort(keep)).astype(int)
+        count = np.asarray(self.count[selection].sum(axis=drop)).transpose(order)
+        value_counts, sums, sumsqs = (
+            np.asarray(array[(slice(None),) + selection].sum(axis=tuple(axis + 1 for axis in drop)))
+            .transpose([0] + list(order + 1))
+            for array in (self.value_counts, self.sums, self.sumsqs)
+        )
+
+        grouped_index = [index[axis] for axis in keep]
+        rows = []
+        for cell in zip(*np.nonzero(count)) if group_by else [()]:
+            row = {dim: self.members[dim][grouped_index[i][cell[i]]] for i, dim in enumerate(group_by)}
+            row['count'] = int(count[cell])
+            for i, measure in enumerate(self.measures):
+                n, total, total_sq = int(value_counts[i][cell]), float(sums[i][cell]), float(sumsqs[i][cell])
+                mean = total / n if n else None
+                variance = max(total_sq - total * total / n, 0.0) / (n - 1) if n > 1 else None
+                row[f'sum_{measure}'] = total
+                row[f'mean_{measure}'] = mean
+                row[f'std_{measure}'] = variance ** 0.5 if variance is not None else None
+            rows.append(row)
+        return rows
@@ -0,0 +1,351 @@
+"""
+Embedded analytical queries over the engineered dataset
+Executes one JSON query spec (filters, group-by, aggregations, ordering)
+with DuckDB when it is installed, otherwise with pandas/NumPy
+"""
+
+import numpy as np
+import pandas as pd
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+# Filter operators: spec name -> SQL operator
+FILTER_OPS = {
+    '==': '=', '!=': '<>', '>': '>', '>=': '>=', '<': '<', '<=': '<=',
+    'in': 'IN', 'not_in': 'NOT IN', 'between': 'BETWEEN',
+    'is_null': 'IS NULL', 'not_null': 'IS NOT NULL'
+}
+
+# Aggregations: spec name -> (SQL function, pandas aggregation)
+AGGREGATIONS = {
+    'count': ('COUNT', 'count'),
+    'count_distinct': ('COUNT(DISTINCT', 'nunique'),
+    'sum': ('SUM', 'sum'),
+    'mean': ('AVG', 'mean'),
+    'min': ('MIN', 'min'),
+    'max': ('MAX', 'max'),
+    'std': ('STDDEV_SAMP', 'std'),
+    'median': ('MEDIAN', 'median')
+}
+
+# Aggregations that only apply to numeric columns
+NUMERIC_AGGREGATIONS = ('sum', 'mean', 'std', 'median')
+
+# Filter values accepted per column kind (JSON scalars; true/false only for boolean columns)
+VALUE_TYPES = {'number': (int, float), 'string': (str,), 'boolean': (bool,)}
+
+TABLE_NAME = 'patients'
+
+
+class QueryError(ValueError):
+    """Invalid query spec (unknown column, operator or aggregation, or a value that does not fit its column)"""
+
+
+def column_kind(dtype):
+    """'boolean', 'number' or 'string' kind of a column dtype (None for other dtypes)"""
+    if pd.api.types.is_bool_dtype(dtype):
+        return 'boolean'
+    if pd.api.types.is_numeric_dtype(dtype):
+        return 'number'
+    if dtype == object or isinstance(dtype, pd.CategoricalDtype) or pd.api.types.is_string_dtype(dtype):
+        return 'string'
+    return None
+
+
+class QueryEngine:
+    """
+    Generic query layer behind /api/query
+    A query is a dict:
+    {
+        "filters": [{"column": "Age", "op": ">=", "value": 60}, ...],   (ANDed)
+        "group_by": ["City", ...],
+        "aggregations": [{"func": "mean", "column": "BMI", "as": "avg_bmi"}, ...],
+        "columns": [...],          (without aggregations: columns of the returned rows)
+        "order_by": [{"column": "avg_bmi", "desc": true}, ...],
+        "limit": int
+    }
+    - duckdb backend: the frame is loaded once into a DuckDB columnar table;
+      queries run multi-threaded, reading only the referenced columns, and
+      filters are pushed into the scan (row groups skipped by min/max)
+    - pandas backend: string columns are factorized once, so equality and
+      IN filters compare integer codes; only the referenced columns are sliced
+    Both backends return the same rows for the same spec
+    """
+
+    def __init__(self, df, backend='auto', threads=None, max_rows=10000):
+        if backend == 'auto':
+            backend = 'duckdb' if duckdb is not None else 'pandas'
+        if backend == 'duckdb' and duckdb is None:
+            raise ImportError("duckdb is not installed (pip install duckdb), use backend='pandas'")
+        if backend not in ('duckdb', 'pandas'):
+            raise ValueError(f"Unknown query backend: {backend!r}")
+        self.backend = backend
+        self.max_rows = max_rows
+        self.columns = [str(col) for col in df.columns]
+        # Filter values are checked against the column kinds, so both backends reject the same specs
+        self.column_kinds = {str(col): column_kind(df[col].dtype) for col in df.columns}
+
+        if backend == 'duckdb':
+            self.connection = duckdb.connect()
+            if threads:
+                self.connection.execute(f"SET threads = {int(threads)}")
+            self.connection.register('source_frame', df)
+            self.connection.execute(f'CREATE TABLE {TABLE_NAME} AS SELECT * FROM source_frame')
+            self.connection.unregister('source_frame')
+        else:
+            self.df = df
+            # Category code index of every string column: codes per row and the category values
+            self.category_index = {}
+            for col in df.columns:
+                if df[col].dtype == object or isinstance(df[col].dtype, pd.CategoricalDtype):
+                    codes, categories = pd.factorize(df[col])
+                    self.category_index[col] = (codes, pd.Index(categories))
+
+    # ---- spec validation ----
+
+    def _column(self, name):
+        if name not in self.columns:
+            raise QueryError(f"Unknown column: {name!r}")
+        return name
+
+    def _check_value(self, column, value):
+        """A filter value must be a JSON scalar of the column's kind"""
+        kind = self.column_kinds[column]
+        allowed = VALUE_TYPES.get(kind, (str, int, float, bool))
+        if not isinstance(value, allowed) or (kind == 'number' and isinstance(value, bool)):
+            expected = f"a {kind}" if kind else "a scalar"
+            raise QueryError(f"Value {value!r} does not fit column {column!r} (expected {expected})")
+
+    @staticmethod
+    def _list(spec, key, types, description, default=()):
+        """spec[key] as a list, checking that it is a list of the given item types"""
+        items = spec.get(key, list(default))
+        if not isinstance(items, list) or not all(isinstance(item, types) for item in items):
+            raise QueryError(f"{key} must be a list of {description}")
+        return items
+
+    def parse(self, spec):
+        """Validated, normalized copy of a query spec"""
+        if not isinstance(spec, dict):
+            raise QueryError("Query must be a JSON object")
+
+        filters = []
+        for item in self._list(spec, 'filters', dict, "filter objects"):
+            column = self._column(item.get('column'))
+            op = item.get('op', '==')
+            if op not in FILTER_OPS:
+                raise QueryError(f"Unknown filter operator: {op!r} (expected one of {list(FILTER_OPS)})")
+            value = item.get('value')
+            if op in ('in', 'not_in') and (not isinstance(value, list) or not value):
+                raise QueryError(f"Operator {op!r} needs a non-empty list value")
+            if op == 'between' and (not isinstance(value, list) or len(value) != 2):
+                raise QueryError("Operator 'between' needs a [low, high] value")
+            if op not in ('in', 'not_in', 'between', 'is_null', 'not_null') and value is None:
+                raise QueryError(f"Operator {op!r} needs a value")
+            # Nulls are matched with is_null / not_null, never by value
+            if op in ('in', 'not_in', 'between'):
+                for member in value:
+                    self._check_value(column, member)
+            elif op not in ('is_null', 'not_null'):
+                self._check_value(column, value)
+            filters.append({'column': column, 'op': op, 'value': value})
+
+        group_by = [self._column(col) for col in self._list(spec, 'group_by', str, "column names")]
+
+        aggregations = []
+        for item in self._list(spec, 'aggregations', dict, "aggregation objects"):
+            func = item.get('func')
+            if func not in AGGREGATIONS:
+                raise QueryError(f"Unknown aggregation: {func!r} (expected one of {list(AGGREGATIONS)})")
+            column = item.get('column')
+            if column is None and func != 'count':
+                raise QueryError(f"Aggregation {func!r} needs a column")
+            if column is not None:
+                self._column(column)
+                if func in NUMERIC_AGGREGATIONS and self.column_kinds[column] != 'number':
+                    raise QueryError(f"Aggregation {func!r} needs a numeric column, not {column!r}")
+            alias = item.get('as') or (f"{func}_{column}" if column else 'count')
+            aggregations.append({'func': func, 'column': column, 'as': str(alias)})
+        if group_by and not aggregations:
+            aggregations = [{'func': 'count', 'column': None, 'as': 'count'}]
+
+        if aggregations:
+            output_columns = group_by + [agg['as'] for agg in aggregations]
+            if len(set(output_columns)) != len(output_columns):
+                raise QueryError("Aggregation aliases must be unique and differ from group_by columns")
+        else:
+            columns = self._list(spec, 'columns', str, "column names", default=self.columns)
+            output_columns = [self._column(col) for col in columns]
+
+        order_by = []
+        for item in self._list(spec, 'order_by', (str, dict), "column names or order objects"):
+            item = {'column': item} if isinstance(item, str) else item
+            column = item.get('column')
+            if column not in output_columns:
+                raise QueryError(f"order_by column {column!r} is not in the result")
+            order_by.append({'column': column, 'desc': bool(item.get('desc', False))})
+        if not order_by:
+            # Groups come back in a stable order on both backends
+            order_by = [{'column': col, 'desc': False} for col in group_by]
+
+        try:
+            limit = int(spec.get('limit', self.max_rows))
+        except (TypeError, ValueError):
+            raise QueryError("limit must be an integer")
+        if not 1 <= limit <= self.max_rows:
+            raise QueryError(f"limit must be between 1 and {self.max_rows}")
+
+        return {
+            'filters': filters, 'group_by': group_by, 'aggregations': aggregations,
+            'columns': output_columns, 'order_by': order_by, 'limit': limit
+        }
+
+    # ---- execution ----
+
+    def execute(self, spec):
+        """
+        Run a query spec; returns {"engine", "columns", "rows", "row_count", "truncated"}
+        Raises QueryError for invalid specs
+        """
+        query = self.parse(spec)
+        if self.backend == 'duckdb':
+            result = self._execute_duckdb(query)
+        else:
+            result = self._execute_pandas(query)
+
+        # One row past the limit tells whether the result was cut off
+        truncated = len(result) > query['limit']
+        result = result.iloc[:query['limit']]
+        result = result.astype(object).where(result.notna(), None)
+        return {
+            "engine": self.backend,
+            "columns": query['columns'],
+            "rows": result.to_dict('records'),
+            "row_count": len(result),
+            "truncated": truncated
+        }
+
+    def _execute_duckdb(self, query):
+        def quote(name):
+            return '"' + str(name).replace('"', '""') + '"'
+
+        where, params = [], []
+        for item in query['filters']:
+            column, op, value = quote(item['column']), item['op'], item['value']
+            if op in ('is_null', 'not_null'):
+                where.append(f"{column} {FILTER_OPS[op]}")
+            elif op in ('in', 'not_in'):
+                where.append(f"{column} {FILTER_OPS[op]} ({', '.join('?' * len(value))})")
+                params.extend(value)
+            elif op == 'between':
+                where.append(f"{column} BETWEEN ? AND ?")
+                params.extend(value)
+            else:
+                where.append(f"{column} {FILTER_OPS[op]} ?")
+                params.append(value)
+
+        if query['aggregations']:
+            select = [quote(col) for col in query['group_by']]
+            for agg in query['aggregations']:
+                sql_func = AGGREGATIONS[agg['func']][0]
+                argument = quote(agg['column']) if agg['column'] else '*'
+                closing = '))' if agg['func'] == 'count_distinct' else ')'
+                select.append(f"{sql_func}({argument}{closing} AS {quote(agg['as'])}")
+        else:
+            select = [quote(col) for col in query['columns']]
+
+        sql = f"SELECT {', '.join(select)} FROM {TABLE_NAME}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        if query['group_by']:
+            sql += " GROUP BY " + ", ".join(quote(col) for col in query['group_by'])
+        if query['order_by']:
+            sql += " ORDER BY " + ", ".join(
+                f"{quote(item['column'])} {'DESC' if item['desc'] else 'ASC'} NULLS LAST"
+                for item in query['order_by']
+            )
+        sql += f" LIMIT {query['limit'] + 1}"
+
+        # A cursor per query: a separate connection to the same database, safe across request threads
+        cursor = self.connection.cursor()
+        try:
+            return cursor.execute(sql, params).df()
+        except duckdb.Error as e:
+            raise QueryError(str(e).splitlines()[0])
+        finally:
+            cursor.close()
+
+    def _filter_mask(self, item):
+        column, op, value = item['column'], item['op'], item['value']
+        if column in self.category_index and op in ('==', '!=', 'in', 'not_in'):
+            codes, categories = self.category_index[column]
+            values = value if op in ('in', 'not_in') else [value]
+            indexer = categories.get_indexer(values)
+            # -1 (value not among the categories) would match the null rows
+            mask = np.isin(codes, indexer[indexer != -1])
+            return ~mask & (codes != -1) if op in ('!=', 'not_in') else mask
+
+        series = self.df[column]
+        if op == 'is_null':
+            return series.isna().to_numpy()
+        if op == 'not_null':
+            return series.notna().to_numpy()
+        try:
+            if op == 'in':
+                return series.isin(value).to_numpy()
+            if op == 'not_in':
+                return (~series.isin(value) & series.notna()).to_numpy()
+            if op == 'between':
+                return series.between(value[0], value[1]).to_numpy()
+            return {
+                '==': series.__eq__, '!=': series.__ne__, '>': series.__gt__,
+                '>=': series.__ge__, '<': series.__lt__, '<=': series.__le__
+            }[op](value).to_numpy() & series.notna().to_numpy()
+        except TypeError:
+            raise QueryError(f"Value {value!r} cannot be compared with column {column!r}")
+
+    def _execute_pandas(self, query):
+        # Values or aggregations that do not fit the column type (e.g. mean of a string column)
+        try:
+            return self._run_pandas(query)
+        except (TypeError, ValueError) as e:
+            raise QueryError(f"Query does not fit the column types: {e}")
+
+    def _run_pandas(self, query):
+        mask = None
+        for item in query['filters']:
+            item_mask = self._filter_mask(item)
+            mask = item_mask if mask is None else mask & item_mask
+
+        # Only the referenced columns are sliced out of the frame
+        needed = list(dict.fromkeys(
+            query['group_by'] + [agg['column'] for agg in query['aggregations'] if agg['column']]
+            if query['aggregations'] else query['columns']
+        ))
+        frame = self.df[needed] if mask is None else self.df.loc[mask, needed]
+
+        if query['aggregations']:
+            grouped = frame.groupby(query['group_by'], dropna=False, sort=False) if query['group_by'] else None
+            parts = {}
+            for agg in query['aggregations']:
+                how = AGGREGATIONS[agg['func']][1]
+                if grouped is None:
+                    parts[agg['as']] = [len(frame) if agg['column'] is None else frame[agg['column']].agg(how)]
+                else:
+                    parts[agg['as']] = grouped.size() if agg['column'] is None else grouped[agg['column']].agg(how)
+            result = pd.DataFrame(parts)
+            if grouped is not None:
+                result = result.reset_index()
+        else:
+            result = frame
+
+        if query['order_by']:
+            result = result.sort_values(
+                [item['column'] for item in query['order_by']],
+                ascending=[not item['desc'] for item in query['order_by']],
+                na_position='last', kind='stable'
+            )
+        return result.head(query['limit'] + 1)
@@ -4,6 +4,7 @@ Executes the complete data engineering and ML pipeline
 """
 
 import sys
+import argparse
 from pathlib import Path
 
 # Add scripts directory to path
@@ -12,45 +13,118 @@ sys.path.insert(0, str(scripts_dir))
 
 from data_cleaning import HealthcareDataCleaner
 from eda_analysis import HealthcareEDA
-from feature_engineering import HealthcareFeatureEngineering
+from feature_engineering import HealthcareFeatureEngineering, ONE_HOT_COLUMNS
 from ml_preparation import HealthcareMLPreparation
+from parallel_pipeline import PartitionedHealthcarePipeline
+from category_vocabulary import CategoryVocabulary
+from config import FEATURE_CONFIG
+from feature_transform import FeatureTransform
+from pipeline_profiler import PipelineProfiler
+from pipeline_logging import configure_logging
 
-def main():
+def main(partitioned=False, n_workers=None, partition_by='City', data_dir=None, models_dir=None,
+         profile=False, profile_memory=True, quiet=None):
+    """
+    Run the complete pipeline
+    partitioned: run cleaning and feature engineering (Steps 1 and 3) as one
+    partition-parallel pass over shards of the dataset
+    data_dir / models_dir: input and output directories (default backend/data and
+    backend/models); data_dir must contain healthcare_data.csv. The category
+    vocabulary is FEATURE_CONFIG['vocabulary_path'], resolved against data_dir's parent
+    profile: record every stage method call (time, CPU, rows, allocations) and write
+    pipeline_trace.json (Chrome trace) plus a summary table; profile_memory=False
+    skips allocation tracing for more accurate timings
+    quiet: stages log warnings only (default LOGGING_CONFIG['quiet']); the step
+    banners and the final summary are still printed
+    """
+    configure_logging(quiet=quiet)
+    
     print("="*70)
     print("HEALTHCARE AI/ML PROJECT - COMPLETE PIPELINE")
     print("="*70)
     
-    data_dir = Path(__file__).parent / "data"
+    data_dir = Path(data_dir) if data_dir else Path(__file__).parent / "data"
+    models_dir = Path(models_dir) if models_dir else Path(__file__).parent / "models"
+    
+    # Categories are encoded against the persisted vocabulary (learned on first run)
+    # Like the other config paths, a relative vocabulary_path is relative to the
+    # backend directory, i.e. the parent of the (default) data directory
+    vocabulary_path = data_dir.parent / FEATURE_CONFIG['vocabulary_path']
+    vocabulary = CategoryVocabulary.load_or_create(
+        str(vocabulary_path), unknown_policy=FEATURE_CONFIG['unknown_category_policy']
+    )
+    
+    profiler = PipelineProfiler(trace_memory=profile_memory) if profile else None
+    track = profiler.instrument if profiler else (lambda stage: stage)
     
     # Step 1: Data Cleaning
     print("\n\n### STEP 1: DATA CLEANING ###\n")
     raw_data_path = data_dir / "healthcare_data.csv"
     cleaned_data_path = data_dir / "healthcare_data_cleaned.csv"
     
-    cleaner = HealthcareDataCleaner(str(raw_data_path))
-    cleaned_df = cleaner.clean_data()
-    cleaner.save_cleaned_data(str(cleaned_data_path))
+    if partitioned:
+        partitioned_pipeline = track(PartitionedHealthcarePipeline(
+            str(raw_data_path), n_workers=n_workers, partition_by=partition_by,
+            categorical_encoding=FEATURE_CONFIG['categorical_encoding'], vocabulary=vocabulary
+        ))
+        partitioned_pipeline.run()
+        partitioned_pipeline.save_cleaned_data(str(cleaned_data_path))
+        fill_values = partitioned_pipeline.fill_values
+    else:
+        cleaner = track(HealthcareDataCleaner(str(raw_data_path)))
+        cleaned_df = cleaner.clean_data()
+        cleaner.save_cleaned_data(str(cleaned_data_path))
+        fill_values = cleaner.fill_values
     
     # Step 2: EDA
     print("\n\n### STEP 2: EXPLORATORY DATA ANALYSIS ###\n")
-    eda = HealthcareEDA(str(cleaned_data_path))
+    eda = track(HealthcareEDA(str(cleaned_data_path)))
     eda_results = eda.perform_eda()
     eda.save_analysis_report(str(data_dir / "eda_report.json"))
     eda.save_high_risk_patients(str(data_dir / "high_risk_patients.csv"))
     
     # Step 3: Feature Engineering
     print("\n\n### STEP 3: FEATURE ENGINEERING & KPI CREATION ###\n")
-    fe = HealthcareFeatureEngineering(str(cleaned_data_path))
-    engineered_df = fe.engineer_features()
+    if partitioned:
+        # Features and KPIs were computed in the partitioned pass of Step 1
+        fe = partitioned_pipeline
+    else:
+        fe = track(HealthcareFeatureEngineering(
+            str(cleaned_data_path), categorical_encoding=FEATURE_CONFIG['categorical_encoding'],
+            vocabulary=vocabulary
+        ))
+        engineered_df = fe.engineer_features()
     fe.save_engineered_data(str(data_dir / "healthcare_data_engineered.csv"))
     fe.save_kpi_report(str(data_dir / "kpi_report.json"))
+    vocabulary.save(str(vocabulary_path))
     
     # Step 4: ML Preparation
     print("\n\n### STEP 4: ML MODEL PREPARATION ###\n")
-    ml_prep = HealthcareMLPreparation(str(data_dir / "healthcare_data_engineered.csv"))
+    ml_prep = track(HealthcareMLPreparation(
+        str(data_dir / "healthcare_data_engineered.csv"),
+        one_hot_features=FEATURE_CONFIG['one_hot_model_features'],
+        vocabulary=vocabulary
+    ))
+    if FEATURE_CONFIG['one_hot_model_features'] and FEATURE_CONFIG['categorical_encoding'] == 'sparse':
+        # Reuse the one-hot codes of Step 3 instead of re-encoding the saved CSV
+        ml_prep.set_sparse_one_hot(*fe.get_sparse_one_hot())
     ml_prep.prepare_ml_dataset()
-    ml_prep.save_preparation_report(str(data_dir / "ml_preparation_report.json"))
     ml_prep.save_training_data(str(data_dir / "ml_training_data"))
+    ml_prep.export_inference_models(str(models_dir))
+    # Cleaning and feature computation of single rows for the API (no pandas),
+    # including the one-hot columns if the models were trained on them
+    one_hot = {
+        column: {'prefix': prefix, 'categories': vocabulary.categories(column)}
+        for column, prefix in ONE_HOT_COLUMNS.items()
+    } if ml_prep.one_hot_names else None
+    feature_transform = FeatureTransform(ml_prep.feature_names, vocabulary.categories('City'), fill_values, one_hot)
+    feature_transform.save(str(models_dir / "feature_transform.json"))
+    ml_prep.save_preparation_report(str(data_dir / "ml_preparation_report.json"))
+    
+    if profiler:
+        profiler.stop()
+        profiler.print_summary()
+        profiler.save_trace(str(data_dir / "pipeline_trace.json"))
     
     print("\n" + "="*70)
     print("PIPELINE EXECUTION COMPLETE!")
@@ -63,10 +137,33 @@ def main():
     print(f"  5. {(data_dir / 'kpi_report.json').name} - KPI metrics")
     print(f"  6. {(data_dir / 'ml_preparation_report.json').name} - ML preparation report")
     print(f"  7. {(data_dir / 'ml_training_data').name}/ - ML training/test data")
+    print(f"  8. {vocabulary_path.name} - Category vocabularies")
+    print(f"  9. {models_dir.name}/ - NumPy-only inference models and feature transform")
+    if profiler:
+        print(f" 10. pipeline_trace.json - Stage profile (open in chrome://tracing or ui.perfetto.dev)")
     print("\nNext Steps:")
     print("  - Review reports in /data directory")
     print("  - Start frontend application")
     print("  - Deploy ML models to production")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Run the healthcare data engineering and ML pipeline")
+    parser.add_argument('--partitioned', action='store_true',
+                        help="Run cleaning and feature engineering in a process pool over dataset shards")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Number of worker processes for --partitioned (default: CPU count)")
+    parser.add_argument('--partition-by', choices=['City', 'Patient_ID'], default='City',
+                        help="Shard by City or by hash of Patient_ID")
+    parser.add_argument('--data-dir', default=None,
+                        help="Directory with healthcare_data.csv, for all outputs (default: backend/data)")
+    parser.add_argument('--models-dir', default=None, help="Exported model directory (default: backend/models)")
+    parser.add_argument('--profile', action='store_true',
+                        help="Profile every stage method and write data/pipeline_trace.json")
+    parser.add_argument('--profile-no-memory', action='store_true',
+                        help="With --profile: skip allocation tracing (lower overhead)")
+    parser.add_argument('--quiet', action='store_true', default=None,
+                        help="Stage output limited to warnings (no row dumps or summary tables)")
+    args = parser.parse_args()
+    main(partitioned=args.partitioned, n_workers=args.workers, partition_by=args.partition_by,
+         data_dir=args.data_dir, models_dir=args.models_dir,
+         profile=args.profile, profile_memory=not args.profile_no_memory, quiet=args.quiet)
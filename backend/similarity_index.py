@@ -0,0 +1,54 @@
+"""
+Nearest-neighbor search over standardized patient features
+A KD-tree over the feature columns answers "most similar patients"
+queries without comparing against every row
+"""
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+
+class SimilarPatientIndex:
+    """
+    KD-tree over standardized feature columns (StandardScaler, as in
+    HealthcareMLPreparation: mean and population std of the indexed rows)
+    Euclidean distance in the scaled space; rows with a missing feature are
+    not indexed. positions maps tree points back to DataFrame rows
+    """
+
+    def __init__(self, df, features, leafsize=32):
+        self.features = list(features)
+        X = df[self.features].to_numpy(dtype=float)
+        complete = ~np.isnan(X).any(axis=1)
+        self.positions = np.flatnonzero(complete)
+        X = X[complete]
+        self.mean = X.mean(axis=0) if len(X) else np.zeros(len(self.features))
+        scale = X.std(axis=0) if len(X) else np.ones(len(self.features))
+        self.scale = np.where(scale > 0, scale, 1.0)
+        self.tree = cKDTree((X - self.mean) / self.scale, leafsize=leafsize)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def scale_features(self, values):
+        """Scaled vector of a {feature: value} dict or a feature-ordered sequence"""
+        if isinstance(values, dict):
+            values = [values[name] for name in self.features]
+        return (np.asarray(values, dtype=float) - self.mean) / self.scale
+
+    def query(self, values, k=10, exclude_position=None):
+        """
+        The k nearest indexed rows to a feature vector
+        Returns (row positions, distances), nearest first; exclude_position
+        drops that row (the query patient itself) from the result
+        """
+        k = min(k + (exclude_position is not None), len(self))
+        if k == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        distances, points = self.tree.query(self.scale_features(values), k=k)
+        distances, points = np.atleast_1d(distances), np.atleast_1d(points)
+        positions = self.positions[points]
+        if exclude_position is not None:
+            keep = positions != exclude_position
+            positions, distances = positions[keep][:k - 1], distances[keep][:k - 1]
+        return positions, distances
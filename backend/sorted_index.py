@@ -0,0 +1,125 @@
+"""
+Presorted numeric columns of the engineered dataset
+Threshold counts and percentile ranks of any value are binary searches
+into the sorted values, for the whole population or one cohort (e.g. a city);
+top-K lists are slices of precomputed descending row orderings
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class SortedColumnIndex:
+    """
+    Sorted non-missing values of each numeric column, overall and per
+    member of each group column (City, Disease_Risk, ...)
+    Per group column the values are sorted by (member, value) into one array
+    with member offsets, so a cohort is a contiguous slice
+    Members are keyed by their string form; rows with a missing group value
+    belong to no cohort
+    ranked_columns (a subset of columns) also keep their row positions in
+    descending value order (ties in row order), overall and per cohort
+    """
+
+    def __init__(self, df, columns, group_columns=(), ranked_columns=()):
+        self.columns = list(columns)
+        self.group_columns = list(group_columns)
+        self.ranked_columns = list(ranked_columns)
+        unknown = [column for column in self.ranked_columns if column not in self.columns]
+        if unknown:
+            raise ValueError(f"Ranked columns must be indexed columns: {unknown}")
+        self.sorted = {}
+        self.members = {}
+        self.grouped = {}
+        self.ranked = {}
+
+        for column in self.columns:
+            values = df[column].to_numpy(dtype=float)
+            self.sorted[column] = np.sort(values[~np.isnan(values)])
+            if column in self.ranked_columns:
+                positions = np.flatnonzero(~np.isnan(values))
+                self.ranked[column, None] = positions[np.argsort(-values[positions], kind='stable')]
+
+        for group_column in self.group_columns:
+            codes, uniques = pd.factorize(df[group_column])
+            self.members[group_column] = {str(member): code for code, member in enumerate(uniques)}
+            for column in self.columns:
+                values = df[column].to_numpy(dtype=float)
+                valid = ~np.isnan(values) & (codes >= 0)
+                group_codes, group_values = codes[valid], values[valid]
+                order = np.lexsort((group_values, group_codes))
+                offsets = np.searchsorted(group_codes[order], np.arange(len(uniques) + 1))
+                self.grouped[column, group_column] = (group_values[order], offsets)
+                if column in self.ranked_columns:
+                    # lexsort is stable: ties stay in row order
+                    descending = np.lexsort((-group_values, group_codes))
+                    self.ranked[column, group_column] = np.flatnonzero(valid)[descending]
+
+    def values(self, column, group=None):
+        """
+        Sorted values of a column, overall or for group = (group column, member)
+        Unknown members give an empty array
+        """
+        if column not in self.sorted:
+            raise KeyError(f"Column {column!r} is not indexed (indexed: {self.columns})")
+        if group is None:
+            return self.sorted[column]
+        group_column, member = group
+        if group_column not in self.members:
+            raise KeyError(f"Group column {group_column!r} is not indexed (indexed: {self.group_columns})")
+        code = self.members[group_column].get(str(member))
+        if code is None:
+            return self.sorted[column][:0]
+        values, offsets = self.grouped[column, group_column]
+        return values[offsets[code]:offsets[code + 1]]
+
+    def count_below(self, column, threshold, group=None):
+        """Number of values < threshold"""
+        return int(np.searchsorted(self.values(column, group), threshold, side='left'))
+
+    def band_counts(self, column, thresholds, group=None):
+        """
+        Count per band of {band: lower bound} thresholds (e.g. RISK_SCORE_THRESHOLDS),
+        with the same banding as bitmap_index.score_bands: a value falls in the band
+        with the highest bound it reaches, the lowest band takes everything below
+        """
+        values = self.values(column, group)
+        bands = sorted(thresholds.items(), key=lambda item: item[1], reverse=True)
+        counts, upper = {}, len(values)
+        for name, bound in bands[:-1]:
+            lower = int(np.searchsorted(values, bound, side='left'))
+            counts[name] = upper - lower
+            upper = lower
+        counts[bands[-1][0]] = upper
+        return counts
+
+    def percentile_rank(self, column, value, group=None):
+        """
+        Percentage of values below value, counting ties as half
+        (scipy.stats.percentileofscore kind='mean'); None for an empty cohort
+        """
+        values = self.values(column, group)
+        if len(values) == 0:
+            return None
+        below = np.searchsorted(values, value, side='left')
+        not_above = np.searchsorted(values, value, side='right')
+        return float((below + not_above) / 2 / len(values) * 100)
+
+    def ranked_positions(self, column, group=None):
+        """
+        Row positions in descending order of a ranked column, overall or for
+        group = (group column, member); slicing the result gives any top-K page
+        """
+        if column not in self.ranked_columns:
+            raise KeyError(f"Column {column!r} is not ranked (ranked: {self.ranked_columns})")
+        if group is None:
+            return self.ranked[column, None]
+        group_column, member = group
+        if group_column not in self.members:
+            raise KeyError(f"Group column {group_column!r} is not indexed (indexed: {self.group_columns})")
+        code = self.members[group_column].get(str(member))
+        positions = self.ranked[column, group_column]
+        if code is None:
+            return positions[:0]
+        offsets = self.grouped[column, group_column][1]
+        return positions[offsets[code]:offsets[code + 1]]
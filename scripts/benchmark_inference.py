@@ -0,0 +1,220 @@
+import pandas as pd
+import numpy as np
+import argparse
+import json
+import os
+import pickle
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import sklearn
+
+from ml_preparation import HealthcareMLPreparation, MODEL_FEATURES, export_model
+from numpy_inference import load_risk_model, rule_based_risk_score
+from pipeline_logging import quiet_logging
+
+BATCH_SIZES = (1, 32, 1000, 100000)
+
+# Timed calls per batch size (capped by the per-measurement time budget)
+DEFAULT_REPEATS = {1: 1000, 32: 500, 1000: 100, 100000: 10}
+
+# Columns the rule-based /api/predict-risk scoring uses
+RULE_COLUMNS = ['Age', 'BMI', 'Blood_Pressure', 'Glucose', 'Disease_Risk']
+
+
+def _percentile_ms(times, q):
+    return round(float(np.percentile(times, q)) * 1000, 4)
+
+
+class InferenceBenchmark:
+    """
+    Inference cost of the risk models
+    For every model of train_baseline_models (scikit-learn with its scaler,
+    its NumPy export, and the export scoring with explanations) and the
+    rule-based predict_risk scoring, measures p50/p99 latency per batch size,
+    peak memory of one call (tracemalloc) and model load time
+    """
+
+    def __init__(self, data_path, batch_sizes=BATCH_SIZES, repeats=None,
+                 time_budget_seconds=10, random_state=42):
+        self.data_path = data_path
+        self.batch_sizes = batch_sizes
+        self.repeats = {**DEFAULT_REPEATS, **(repeats or {})}
+        self.time_budget_seconds = time_budget_seconds
+        self.random_state = random_state
+        self.ml_prep = None
+        self.results = {}
+
+    def train_models(self):
+        """Train the baseline models exactly as the pipeline does"""
+        self.ml_prep = HealthcareMLPreparation(str(self.data_path))
+        with quiet_logging():
+            self.ml_prep.load_data()
+            self.ml_prep.prepare_features_and_target()
+            self.ml_prep.split_data()
+            self.ml_prep.scale_features()
+            self.ml_prep.train_baseline_models()
+        return self.ml_prep.models
+
+    def make_batch(self, batch_size):
+        """Rows resampled from the dataset: model features and rule inputs"""
+        rng = np.random.default_rng(self.random_state)
+        rows = self.ml_prep.df.iloc[rng.integers(0, len(self.ml_prep.df), batch_size)]
+        features = rows[MODEL_FEATURES].to_numpy(dtype=float)
+        rule_inputs = [rows[col].to_numpy() for col in RULE_COLUMNS]
+        return features, rule_inputs
+
+    def get_predictors(self, work_dir):
+        """
+        name -> (load function, predict function of a batch, serialized size)
+        The load function is timed as the model load time
+        """
+        predictors = {}
+        scaler = self.ml_prep.scaler
+        for name, model in self.ml_prep.models.items():
+            payload = pickle.dumps((scaler, model))
+
+            def predict_sklearn(batch, loaded):
+                scaler, model = loaded
+                return model.predict_proba(scaler.transform(pd.DataFrame(batch[0], columns=MODEL_FEATURES)))
+
+            predictors[f'sklearn_{name}'] = (lambda payload=payload: pickle.loads(payload),
+                                             predict_sklearn, len(payload))
+
+            model_path = Path(work_dir) / f"{name}.npz"
+            np.savez(model_path, **export_model(model, scaler, self.ml_prep.feature_names))
+            predictors[f'numpy_{name}'] = (lambda path=model_path: load_risk_model(path),
+                                           lambda batch, loaded: loaded.predict_proba(batch[0]),
+                                           model_path.stat().st_size)
+            # Explanations computed alongside every batch prediction
+            predictors[f'numpy_{name}_explained'] = (
+                lambda path=model_path: load_risk_model(path),
+                lambda batch, loaded: (loaded.predict_proba(batch[0]), loaded.explain(batch[0])),
+                model_path.stat().st_size
+            )
+
+        predictors['rule_based'] = (lambda: None,
+                                    lambda batch, loaded: rule_based_risk_score(*batch[1]),
+                                    0)
+        return predictors
+
+    def measure(self, predict, batch, batch_size):
+        """p50/p99 latency, throughput and peak memory of predict(batch)"""
+        predict(batch)  # warm-up
+
+        tracemalloc.start()
+        predict(batch)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        times = []
+        deadline = time.perf_counter() + self.time_budget_seconds
+        while len(times) < self.repeats[batch_size] and (len(times) < 3 or time.perf_counter() < deadline):
+            start = time.perf_counter()
+            predict(batch)
+            times.append(time.perf_counter() - start)
+
+        p50 = float(np.percentile(times, 50))
+        return {
+            'repeats': len(times),
+            'p50_ms': _percentile_ms(times, 50),
+            'p99_ms': _percentile_ms(times, 99),
+            'mean_ms': round(float(np.mean(times)) * 1000, 4),
+            'rows_per_second': round(batch_size / p50, 1),
+            'peak_memory_bytes': int(peak_memory)
+        }
+
+    def run(self):
+        """Benchmark every predictor at every batch size"""
+        print("="*60)
+        print("INFERENCE LATENCY BENCHMARK")
+        print("="*60)
+
+        self.train_models()
+        batches = {batch_size: self.make_batch(batch_size) for batch_size in self.batch_sizes}
+
+        with tempfile.TemporaryDirectory() as work_dir:
+            for name, (load, predict, size_bytes) in self.get_predictors(work_dir).items():
+                load_times = []
+                for _ in range(20):
+                    start = time.perf_counter()
+                    loaded = load()
+                    load_times.append(time.perf_counter() - start)
+
+                self.results[name] = {
+                    'load_ms': _percentile_ms(load_times, 50),
+                    'size_bytes': size_bytes,
+                    'batches': {
+                        str(batch_size): self.measure(lambda batch: predict(batch, loaded), batch, batch_size)
+                        for batch_size, batch in batches.items()
+                    }
+                }
+                print(f"\n--- {name} (load {self.results[name]['load_ms']:.3f} ms) ---")
+                for batch_size, stats in self.results[name]['batches'].items():
+                    print(f"batch {batch_size:>6}: p50 {stats['p50_ms']:>10.3f} ms, p99 {stats['p99_ms']:>10.3f} ms, "
+                          f"{stats['rows_per_second']:>12,.0f} rows/s, peak {stats['peak_memory_bytes'] / 1024:>9.1f} KB")
+
+        return self.get_report()
+
+    def get_report(self):
+        """Benchmark results with the environment they were measured in"""
+        return {
+            'environment': {
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'scikit_learn': sklearn.__version__,
+                'platform': platform.platform(),
+                'cpu_count': os.cpu_count()
+            },
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'dataset_rows': len(self.ml_prep.df),
+            'batch_sizes': list(self.batch_sizes),
+            'models': self.results
+        }
+
+
+def compare_reports(current, baseline, tolerance=0.2):
+    """
+    p50 latency of the current report relative to a previous one
+    Returns (model, batch size, ratio) for every entry slower by more than tolerance
+    """
+    regressions = []
+    print(f"\n=== P50 LATENCY VS BASELINE ({baseline.get('timestamp', 'unknown')}) ===")
+    for name, result in current['models'].items():
+        for batch_size, stats in result['batches'].items():
+            previous = baseline.get('models', {}).get(name, {}).get('batches', {}).get(batch_size)
+            if not previous:
+                continue
+            ratio = stats['p50_ms'] / previous['p50_ms']
+            flag = ' REGRESSION' if ratio > 1 + tolerance else ''
+            print(f"{name} batch {batch_size}: {ratio:.2f}x{flag}")
+            if flag:
+                regressions.append((name, int(batch_size), round(ratio, 3)))
+    return regressions
+
+
+if __name__ == "__main__":
+    data_dir = Path(__file__).parent.parent / "data"
+    parser = argparse.ArgumentParser(description="Benchmark risk model inference latency")
+    parser.add_argument('--data', default=str(data_dir / "healthcare_data_engineered.csv"))
+    parser.add_argument('--output', default=str(data_dir / "inference_benchmark.json"))
+    parser.add_argument('--baseline', default=None, help="Previous benchmark JSON to compare against")
+    args = parser.parse_args()
+
+    report = InferenceBenchmark(args.data).run()
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            regressions = compare_reports(report, json.load(f))
+        report['regressions'] = [{'model': m, 'batch_size': b, 'p50_ratio': r} for m, b, r in regressions]
+
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nInference benchmark saved to: {args.output}")
+    if args.baseline and report['regressions']:
+        sys.exit(1)
@@ -0,0 +1,257 @@
+import numpy as np
+import argparse
+import contextlib
+import importlib
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from generate_synthetic_data import SyntheticHealthcareDataGenerator
+from pipeline_logging import quiet_logging
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+# Stages in pipeline order; each reads the previous stage's output in the size directory
+STAGES = ['cleaning', 'eda', 'feature_engineering', 'ml_preparation', 'full_pipeline']
+
+# Modules each stage runs; imported before a stage is measured, so their import
+# time (pandas, scikit-learn, matplotlib, ...) is not counted as stage time
+STAGE_MODULES = {
+    'cleaning': ['data_cleaning'],
+    'eda': ['eda_analysis'],
+    'feature_engineering': ['feature_engineering', 'category_vocabulary'],
+    'ml_preparation': ['ml_preparation'],
+    'full_pipeline': ['run_pipeline']
+}
+
+
+def run_stage(stage, data_dir):
+    """
+    Run one pipeline stage on the files in data_dir (pipeline file names)
+    Returns (rows in, rows out)
+    """
+    data_dir = Path(data_dir)
+    if stage == 'cleaning':
+        from data_cleaning import HealthcareDataCleaner
+        cleaner = HealthcareDataCleaner(str(data_dir / "healthcare_data.csv"))
+        df = cleaner.clean_data()
+        cleaner.save_cleaned_data(str(data_dir / "healthcare_data_cleaned.csv"))
+        return cleaner.cleaning_report['initial_stats']['total_rows'], len(df)
+    if stage == 'eda':
+        from eda_analysis import HealthcareEDA
+        eda = HealthcareEDA(str(data_dir / "healthcare_data_cleaned.csv"))
+        eda.perform_eda()
+        eda.save_analysis_report(str(data_dir / "eda_report.json"))
+        return len(eda.df), len(eda.df)
+    if stage == 'feature_engineering':
+        from feature_engineering import HealthcareFeatureEngineering
+        from category_vocabulary import CategoryVocabulary
+        fe = HealthcareFeatureEngineering(str(data_dir / "healthcare_data_cleaned.csv"),
+                                          vocabulary=CategoryVocabulary())
+        df = fe.engineer_features()
+        fe.save_engineered_data(str(data_dir / "healthcare_data_engineered.csv"))
+        return len(df), len(df)
+    if stage == 'ml_preparation':
+        from ml_preparation import HealthcareMLPreparation
+        ml_prep = HealthcareMLPreparation(str(data_dir / "healthcare_data_engineered.csv"))
+        ml_prep.prepare_ml_dataset()
+        return len(ml_prep.df), len(ml_prep.X_train) + len(ml_prep.X_test)
+    if stage == 'full_pipeline':
+        from run_pipeline import main
+        # Own directory: the full run starts from the raw data, without earlier stage outputs
+        # (laid out like backend/: the configured vocabulary path lands in full_pipeline/data)
+        full_dir = data_dir / "full_pipeline"
+        (full_dir / "data").mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(data_dir / "healthcare_data.csv", full_dir / "data" / "healthcare_data.csv")
+        main(data_dir=full_dir / "data", models_dir=full_dir / "models", quiet=True)
+        with open(full_dir / "data" / "ml_preparation_report.json", 'r') as f:
+            rows_out = json.load(f)['dataset_info']['total_samples']
+        with open(full_dir / "data" / "healthcare_data.csv", 'r') as f:
+            rows_in = sum(1 for _ in f) - 1
+        return rows_in, rows_out
+    raise ValueError(f"Unknown stage: {stage!r}")
+
+
+def measure_stage(stage, data_dir):
+    """
+    Run a stage in this process and measure it (worker side of the benchmark)
+    Wall time, CPU time (including worker processes), and peak RSS of the process;
+    the stage's modules are imported first, outside the measurement
+    """
+    import_start = time.perf_counter()
+    for module in STAGE_MODULES[stage]:
+        importlib.import_module(module)
+    import_seconds = time.perf_counter() - import_start
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    times_before = os.times()
+    start = time.perf_counter()
+    with quiet_logging():
+        rows_in, rows_out = run_stage(stage, data_dir)
+    wall = time.perf_counter() - start
+    times_after = os.times()
+    cpu = sum(times_after[:4]) - sum(times_before[:4])
+    return {
+        'rows_in': int(rows_in),
+        'rows_out': int(rows_out),
+        'wall_seconds': round(wall, 4),
+        'cpu_seconds': round(cpu, 4),
+        'rows_per_second': round(rows_in / wall, 1) if wall else None,
+        # ru_maxrss is in KB on Linux (bytes on macOS)
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        'start_rss_mb': round(rss_before / 1024, 1),
+        'import_seconds': round(import_seconds, 4)
+    }
+
+
+class PipelineBenchmark:
+    """
+    End-to-end benchmark of the pipeline stages on synthetic data
+    For every input size, generates raw data (generate_synthetic_data), then
+    runs cleaning, EDA, feature engineering, ML preparation and the full
+    run_pipeline.main flow, each in a fresh subprocess so peak RSS is the
+    stage's own. Records wall time, CPU time, peak RSS and rows/sec, and the
+    scaling exponent of wall time over input size (1.0 = linear)
+    """
+
+    def __init__(self, sizes=DEFAULT_SIZES, stages=STAGES, work_dir=None, random_state=42):
+        self.sizes = [int(size) for size in sizes]
+        self.stages = list(stages)
+        self.work_dir = work_dir
+        self.random_state = random_state
+        self.results = {stage: {} for stage in self.stages}
+
+    def run_stage_subprocess(self, stage, data_dir):
+        """Run one stage in a worker process; returns its measurements"""
+        completed = subprocess.run(
+            [sys.executable, str(Path(__file__).resolve()), '--run-stage', stage, '--data-dir', str(data_dir)],
+            capture_output=True, text=True
+        )
+        if completed.returncode != 0:
+            raise RuntimeError(f"Stage {stage} failed:\n{completed.stderr[-2000:]}")
+        return json.loads(completed.stdout.strip().splitlines()[-1])
+
+    def run(self):
+        """Benchmark every stage at every size"""
+        print("="*60)
+        print("PIPELINE BENCHMARK")
+        print("="*60)
+
+        if self.work_dir:
+            Path(self.work_dir).mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory(dir=self.work_dir) as tmp:
+            for size in self.sizes:
+                data_dir = Path(tmp) / f"rows_{size}"
+                data_dir.mkdir()
+                generator = SyntheticHealthcareDataGenerator(size, random_state=self.random_state)
+                with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                    generator.generate(data_dir / "healthcare_data.csv")
+
+                print(f"\n--- {size:,} rows ---")
+                for stage in self.stages:
+                    stats = self.run_stage_subprocess(stage, data_dir)
+                    self.results[stage][str(size)] = stats
+                    print(f"{stage:<20} wall {stats['wall_seconds']:>9.3f}s  cpu {stats['cpu_seconds']:>9.3f}s  "
+                          f"{stats['rows_per_second']:>12,.0f} rows/s  peak RSS {stats['peak_rss_mb']:>8.1f} MB")
+
+        return self.get_report()
+
+    def scaling_exponents(self):
+        """Slope of log(wall time) over log(rows) per stage (needs 2+ sizes)"""
+        exponents = {}
+        for stage, by_size in self.results.items():
+            if len(by_size) < 2:
+                continue
+            rows = np.log([stats['rows_in'] for stats in by_size.values()])
+            wall = np.log([max(stats['wall_seconds'], 1e-6) for stats in by_size.values()])
+            exponents[stage] = round(float(np.polyfit(rows, wall, 1)[0]), 3)
+        return exponents
+
+    def get_report(self):
+        """Benchmark results with the environment they were measured in"""
+        exponents = self.scaling_exponents()
+        if exponents:
+            print("\n=== SCALING EXPONENT (wall time ~ rows^k) ===")
+            for stage, k in exponents.items():
+                print(f"{stage:<20} k = {k:.2f}")
+        return {
+            'environment': {
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'platform': platform.platform(),
+                'cpu_count': os.cpu_count()
+            },
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'sizes': self.sizes,
+            'stages': self.results,
+            'scaling_exponents': exponents
+        }
+
+
+def compare_reports(current, baseline, tolerance=0.2):
+    """
+    Wall time and peak RSS of the current report relative to a previous one
+    Returns (stage, size, metric, ratio) for every entry worse by more than tolerance
+    """
+    regressions = []
+    print(f"\n=== VS BASELINE ({baseline.get('timestamp', 'unknown')}) ===")
+    print(f"{'Stage':<20}{'Rows':>10}{'Wall':>10}{'Baseline':>10}{'Ratio':>8}{'RSS ratio':>11}")
+    for stage, by_size in current['stages'].items():
+        for size, stats in by_size.items():
+            previous = baseline.get('stages', {}).get(stage, {}).get(size)
+            if not previous:
+                continue
+            ratios = {
+                'wall_seconds': stats['wall_seconds'] / max(previous['wall_seconds'], 1e-6),
+                'peak_rss_mb': stats['peak_rss_mb'] / max(previous['peak_rss_mb'], 1e-6)
+            }
+            worse = [metric for metric, ratio in ratios.items() if ratio > 1 + tolerance]
+            print(f"{stage:<20}{int(size):>10,}{stats['wall_seconds']:>10.3f}{previous['wall_seconds']:>10.3f}"
+                  f"{ratios['wall_seconds']:>7.2f}x{ratios['peak_rss_mb']:>10.2f}x"
+                  f"{'  REGRESSION' if worse else ''}")
+            regressions.extend((stage, int(size), metric, round(ratios[metric], 3)) for metric in worse)
+    return regressions
+
+
+if __name__ == "__main__":
+    data_dir = Path(__file__).parent.parent / "data"
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline stages on synthetic data")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=STAGES)
+    parser.add_argument('--output', default=str(data_dir / "pipeline_benchmark.json"))
+    parser.add_argument('--baseline', default=None, help="Previous benchmark JSON to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="Allowed slowdown / memory growth vs the baseline (0.2 = 20%%)")
+    parser.add_argument('--work-dir', default=None, help="Directory for the generated datasets")
+    # Worker mode: run one stage in this process and print its measurements as JSON
+    parser.add_argument('--run-stage', choices=STAGES, help=argparse.SUPPRESS)
+    parser.add_argument('--data-dir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_stage:
+        print(json.dumps(measure_stage(args.run_stage, args.data_dir)))
+        sys.exit(0)
+
+    report = PipelineBenchmark(args.sizes, args.stages, work_dir=args.work_dir).run()
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            regressions = compare_reports(report, json.load(f), args.tolerance)
+        report['regressions'] = [
+            {'stage': stage, 'rows': size, 'metric': metric, 'ratio': ratio}
+            for stage, size, metric, ratio in regressions
+        ]
+
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nPipeline benchmark saved to: {args.output}")
+    if args.baseline and report['regressions']:
+        sys.exit(1)
@@ -0,0 +1,136 @@
+import numpy as np
+import pandas as pd
+import argparse
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from ml_preparation import save_training_arrays, load_training_data
+
+
+def _timed(func):
+    """Run func once, return (result, seconds)"""
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def _size_mb(*paths):
+    return round(sum(os.path.getsize(p) for p in paths) / 1024 ** 2, 2)
+
+
+class TrainingDataBenchmark:
+    """
+    Load-time benchmark of the training data formats
+    Writes the same scaled feature matrix as CSV (the previous format) and as
+    float64 / float32 .npy, then times full loads, memory-mapped opens and a
+    full pass over the memory map, and measures the round-trip error of each
+    """
+
+    def __init__(self, n_rows=10_000_000, n_features=15, work_dir=None, random_state=42):
+        self.n_rows = n_rows
+        self.n_features = n_features
+        self.work_dir = work_dir
+        self.random_state = random_state
+        self.columns = [f"feature_{i}" for i in range(n_features)]
+        self.results = {}
+
+    def generate_data(self):
+        """Standard-normal features (like scaled data) and a binary target"""
+        rng = np.random.default_rng(self.random_state)
+        X = rng.standard_normal((self.n_rows, self.n_features))
+        y = (X[:, 0] + rng.standard_normal(self.n_rows) > 0).astype(np.int8)
+        return X, y
+
+    def benchmark_csv(self, work_dir):
+        """Write and load the legacy train_scaled.csv format"""
+        path = work_dir / "train_scaled.csv"
+        X, y = self.generate_data()
+        df = pd.DataFrame(X, columns=self.columns)
+        df['target'] = y
+        _, write_seconds = _timed(lambda: df.to_csv(path, index=False, chunksize=1_000_000))
+        # Free the source matrix while loading; it is regenerated (seeded) for the error check
+        del X, y, df
+
+        loaded, load_seconds = _timed(lambda: pd.read_csv(path))
+        loaded = loaded[self.columns].to_numpy()
+        error = float(np.abs(loaded - self.generate_data()[0]).max())
+        return {
+            'size_mb': _size_mb(path),
+            'write_seconds': round(write_seconds, 4),
+            'load_seconds': round(load_seconds, 4),
+            'max_abs_round_trip_error': error
+        }
+
+    def benchmark_npy(self, work_dir, dtype):
+        """Write and load the .npy format at one dtype"""
+        out_dir = work_dir / f"npy_{dtype}"
+        X, y = self.generate_data()
+        # Test split left empty: only the training matrix is measured
+        _, write_seconds = _timed(lambda: save_training_arrays(
+            out_dir, X, X[:0], y, y[:0], self.columns, dtype=dtype
+        ))
+        files = [out_dir / name for name in ("X_train.npy", "y_train.npy", "metadata.json")]
+        del X, y
+
+        loaded, load_seconds = _timed(lambda: load_training_data(out_dir, mmap_mode=None))
+        error = float(np.abs(loaded['X_train'] - self.generate_data()[0]).max())
+        del loaded
+
+        mapped, mmap_seconds = _timed(lambda: load_training_data(out_dir))
+        _, scan_seconds = _timed(lambda: mapped['X_train'].sum(axis=0))
+        return {
+            'size_mb': _size_mb(*files),
+            'write_seconds': round(write_seconds, 4),
+            'load_seconds': round(load_seconds, 4),
+            'mmap_open_seconds': round(mmap_seconds, 6),
+            'mmap_full_pass_seconds': round(scan_seconds, 4),
+            'max_abs_round_trip_error': error
+        }
+
+    def run(self):
+        """Run all format benchmarks"""
+        print("="*60)
+        print(f"TRAINING DATA FORMAT BENCHMARK ({self.n_rows:,} rows x {self.n_features} features)")
+        print("="*60)
+
+        with tempfile.TemporaryDirectory(dir=self.work_dir) as tmp:
+            work_dir = Path(tmp)
+            print("Writing and loading CSV...")
+            self.results['csv'] = self.benchmark_csv(work_dir)
+            for dtype in ('float64', 'float32'):
+                print(f"Writing and loading .npy ({dtype})...")
+                self.results[f'npy_{dtype}'] = self.benchmark_npy(work_dir, dtype)
+
+        csv_seconds = self.results['csv']['load_seconds']
+        print(f"\n{'Format':<14}{'Size MB':>10}{'Load s':>10}{'Speedup':>10}{'mmap s':>10}{'Max error':>12}")
+        for name, result in self.results.items():
+            print(f"{name:<14}{result['size_mb']:>10.1f}{result['load_seconds']:>10.3f}"
+                  f"{csv_seconds / result['load_seconds']:>9.1f}x"
+                  f"{result.get('mmap_open_seconds', float('nan')):>10.4f}"
+                  f"{result['max_abs_round_trip_error']:>12.2e}")
+
+        return {
+            'rows': self.n_rows,
+            'features': self.n_features,
+            'page_cache': 'warm (files are read back right after writing)',
+            'formats': self.results
+        }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare CSV and .npy training data load times")
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--work-dir', default=None, help="Directory for the temporary benchmark files")
+    args = parser.parse_args()
+
+    benchmark = TrainingDataBenchmark(n_rows=args.rows, work_dir=args.work_dir)
+    report = benchmark.run()
+
+    report_path = Path(__file__).parent.parent / "data" / "training_data_benchmark.json"
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nBenchmark report saved to: {report_path}")
@@ -0,0 +1,103 @@
+import pandas as pd
+import numpy as np
+import json
+from pathlib import Path
+
+from pipeline_logging import get_logger
+
+logger = get_logger(__name__)
+
+# Code given to categories that are not in the vocabulary (and to missing values)
+UNKNOWN_CODE = -1
+
+# Fixed vocabularies for categories produced by the pipeline itself
+# Orders match pd.get_dummies / pd.cut so encodings stay compatible
+DEFAULT_VOCABULARIES = {
+    'Age_Group': ['Child_Teen', 'Young_Adult', 'Middle_Age', 'Senior', 'Elderly'],
+    'BMI_Category': ['Normal', 'Obese', 'Overweight', 'Underweight'],
+    'Disease_Risk': ['Asthma', 'Diabetes', 'Heart Risk', 'Hypertension', 'Normal'],
+}
+
+
+class CategoryVocabulary:
+    """
+    Persisted category -> integer code mappings for categorical columns
+    - Codes are assigned once and never refit, so encodings are stable across batches
+    - A column without a vocabulary (e.g. City) learns its sorted categories from the
+      first batch it encodes; later categories can only be appended with extend()
+    - Unknown categories get UNKNOWN_CODE, or raise a ValueError with unknown_policy='error'
+    """
+
+    def __init__(self, vocabularies=None, unknown_policy='ignore'):
+        if unknown_policy not in ('ignore', 'error'):
+            raise ValueError(f"unknown_policy must be 'ignore' or 'error', got {unknown_policy!r}")
+        self.unknown_policy = unknown_policy
+        self.vocabularies = {}
+        self.lookup = {}
+        for column, categories in (vocabularies if vocabularies is not None else DEFAULT_VOCABULARIES).items():
+            self._set(column, categories)
+
+    def _set(self, column, categories):
+        self.vocabularies[column] = list(categories)
+        self.lookup[column] = {category: code for code, category in enumerate(self.vocabularies[column])}
+
+    @classmethod
+    def load(cls, path, unknown_policy='ignore'):
+        """Load a vocabulary store from JSON"""
+        with open(path, 'r') as f:
+            data = json.load(f)
+        return cls(data['vocabularies'], unknown_policy=unknown_policy)
+
+    @classmethod
+    def load_or_create(cls, path, unknown_policy='ignore'):
+        """Load the vocabulary store at path, or start from the defaults if it does not exist yet"""
+        if Path(path).exists():
+            return cls.load(path, unknown_policy)
+        return cls(unknown_policy=unknown_policy)
+
+    def save(self, path):
+        """Save the vocabulary store as JSON"""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({'unknown_code': UNKNOWN_CODE, 'vocabularies': self.vocabularies}, f, indent=2)
+        logger.info("Category vocabulary saved to: %s", path)
+        return path
+
+    def learn(self, column, values):
+        """Create the vocabulary of a column from values; existing vocabularies are never refit"""
+        if column not in self.vocabularies:
+            self._set(column, sorted(pd.Series(values).dropna().unique()))
+        return self.vocabularies[column]
+
+    def extend(self, column, categories):
+        """Append new categories to a vocabulary; existing codes are unchanged"""
+        new = [c for c in pd.unique(pd.Series(categories).dropna()) if c not in self.lookup.get(column, {})]
+        self._set(column, self.vocabularies.get(column, []) + new)
+        return new
+
+    def categories(self, column):
+        """Categories of a column, in code order"""
+        return self.vocabularies[column]
+
+    def encode(self, column, values):
+        """
+        Integer codes of values (vectorized hash lookup, O(1) per value)
+        Missing values and unknown categories get UNKNOWN_CODE
+        """
+        if column not in self.vocabularies:
+            self.learn(column, values)
+
+        values = pd.Series(values)
+        codes = pd.Categorical(values, categories=self.vocabularies[column]).codes.astype(np.int32)
+
+        unknown = (codes == UNKNOWN_CODE) & values.notna().to_numpy()
+        if unknown.any() and self.unknown_policy == 'error':
+            raise ValueError(f"Unknown {column} categories: {sorted(values[unknown].unique())}")
+        return codes
+
+    def encode_one(self, column, value):
+        """Code of a single value (dict lookup)"""
+        code = self.lookup[column].get(value, UNKNOWN_CODE)
+        if code == UNKNOWN_CODE and self.unknown_policy == 'error' and not pd.isna(value):
+            raise ValueError(f"Unknown {column} category: {value!r}")
+        return code
@@ -1,8 +1,15 @@
 import pandas as pd
 import numpy as np
 import json
+import logging
 from pathlib import Path
 
+from pipeline_logging import configure_logging, get_logger, log_event, log_rows
+
+logger = get_logger(__name__)
+
+NUMERIC_COLUMNS = ['Age', 'BMI', 'Blood_Pressure', 'Glucose']
+
 class HealthcareDataCleaner:
     """
     Data cleaning and preprocessing for Healthcare dataset
@@ -18,11 +25,13 @@ class HealthcareDataCleaner:
         self.filepath = filepath
         self.df = None
         self.cleaning_report = {}
+        self.fill_values = None
         
     def load_data(self):
         """Load dataset from CSV"""
         self.df = pd.read_csv(self.filepath)
-        print(f"Dataset loaded: {self.df.shape[0]} rows, {self.df.shape[1]} columns")
+        log_event(logger, 'dataset_loaded', "Dataset loaded: %d rows, %d columns", *self.df.shape,
+                  rows=self.df.shape[0], columns=self.df.shape[1])
         return self.df
     
     def get_initial_statistics(self):
@@ -37,138 +46,176 @@ class HealthcareDataCleaner:
         self.cleaning_report['initial_stats'] = stats
         return stats
     
-    def handle_missing_values(self):
+    def compute_fill_values(self):
+        """
+        Compute the medians used by the cleaning steps, in pipeline order
+        Lets partitions of the dataset be cleaned independently with the
+        same global statistics as a single full-dataset run
+        """
+        missing = {col: self.df[col].median() for col in NUMERIC_COLUMNS if col in self.df.columns}
+        filled = self.df[list(missing)].fillna(missing)
+        filled = filled[(filled['Age'] <= 100) & (filled['Age'] >= 0)]
+        
+        return {
+            'missing': missing,
+            'bmi': filled.loc[filled['BMI'] > 0, 'BMI'].median(),
+            'glucose': filled.loc[filled['Glucose'] > 0, 'Glucose'].median(),
+            'blood_pressure': filled.loc[
+                (filled['Blood_Pressure'] >= 60) & (filled['Blood_Pressure'] <= 300), 'Blood_Pressure'
+            ].median()
+        }
+    
+    def handle_missing_values(self, fill_values=None):
         """
         Handle missing values strategy:
         - Age: Fill with median
         - BMI: Fill with median
         - Blood_Pressure: Fill with median
         - Glucose: Fill with median
+        fill_values overrides the medians (e.g. global medians for a partition)
         """
-        print("\n=== Handling Missing Values ===")
+        logger.info("\n=== Handling Missing Values ===")
         missing_before = self.df.isnull().sum().to_dict()
         
-        numeric_columns = ['Age', 'BMI', 'Blood_Pressure', 'Glucose']
-        for col in numeric_columns:
+        for col in NUMERIC_COLUMNS:
             if col in self.df.columns:
-                median_val = self.df[col].median()
+                median_val = fill_values[col] if fill_values else self.df[col].median()
                 missing_count = self.df[col].isnull().sum()
                 if missing_count > 0:
                     self.df[col].fillna(median_val, inplace=True)
-                    print(f"  {col}: Filled {missing_count} missing values with median ({median_val:.2f})")
+                    log_event(logger, 'missing_values_filled', "  %s: Filled %d missing values with median (%.2f)",
+                              col, missing_count, median_val, column=col, count=int(missing_count),
+                              fill_value=float(median_val))
         
         self.cleaning_report['missing_values_handled'] = missing_before
-        print(f"Missing values after handling:\n{self.df.isnull().sum()}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Missing values after handling:\n%s", self.df.isnull().sum())
         return self.df
     
     def handle_invalid_ages(self):
         """Remove or fix invalid age values (>100 or <0)"""
-        print("\n=== Handling Invalid Ages ===")
+        logger.info("\n=== Handling Invalid Ages ===")
         invalid_ages = self.df[(self.df['Age'] > 100) | (self.df['Age'] < 0)]
-        print(f"Invalid ages found: {len(invalid_ages)}")
-        if len(invalid_ages) > 0:
-            print(f"Invalid age records:\n{invalid_ages[['Patient_ID', 'Name', 'Age']]}")
+        logger.info("Invalid ages found: %d", len(invalid_ages))
+        log_rows(logger, 'invalid_ages', "Invalid age records", invalid_ages, ['Patient_ID', 'Name', 'Age'])
         
         # Remove rows with invalid ages
         before_count = len(self.df)
         self.df = self.df[(self.df['Age'] <= 100) & (self.df['Age'] >= 0)]
         after_count = len(self.df)
-        print(f"Removed {before_count - after_count} rows with invalid ages")
+        log_event(logger, 'invalid_ages_removed', "Removed %d rows with invalid ages",
+                  before_count - after_count, count=before_count - after_count)
         
         self.cleaning_report['invalid_ages_removed'] = before_count - after_count
         self.df.reset_index(drop=True, inplace=True)
         return self.df
     
-    def handle_invalid_bmi(self):
+    def handle_invalid_bmi(self, fill_value=None):
         """Remove or fix negative BMI values"""
-        print("\n=== Handling Invalid BMI ===")
+        logger.info("\n=== Handling Invalid BMI ===")
         invalid_bmi = self.df[self.df['BMI'] < 0]
-        print(f"Invalid BMI values found: {len(invalid_bmi)}")
-        if len(invalid_bmi) > 0:
-            print(f"Invalid BMI records:\n{invalid_bmi[['Patient_ID', 'Name', 'BMI']]}")
+        logger.info("Invalid BMI values found: %d", len(invalid_bmi))
+        log_rows(logger, 'invalid_bmi', "Invalid BMI records", invalid_bmi, ['Patient_ID', 'Name', 'BMI'])
         
         # Fill negative BMI with median of valid BMI
-        valid_bmi_median = self.df[self.df['BMI'] > 0]['BMI'].median()
+        valid_bmi_median = fill_value if fill_value is not None else self.df[self.df['BMI'] > 0]['BMI'].median()
         negative_count = len(self.df[self.df['BMI'] < 0])
         self.df.loc[self.df['BMI'] < 0, 'BMI'] = valid_bmi_median
-        print(f"Fixed {negative_count} negative BMI values with median ({valid_bmi_median:.2f})")
+        log_event(logger, 'invalid_bmi_fixed', "Fixed %d negative BMI values with median (%.2f)",
+                  negative_count, valid_bmi_median, count=negative_count, fill_value=float(valid_bmi_median))
         
         self.cleaning_report['invalid_bmi_fixed'] = negative_count
         return self.df
     
-    def handle_invalid_glucose(self):
+    def handle_invalid_glucose(self, fill_value=None):
         """Remove or fix negative Glucose values"""
-        print("\n=== Handling Invalid Glucose ===")
+        logger.info("\n=== Handling Invalid Glucose ===")
         invalid_glucose = self.df[self.df['Glucose'] < 0]
-        print(f"Invalid Glucose values found: {len(invalid_glucose)}")
-        if len(invalid_glucose) > 0:
-            print(f"Invalid Glucose records:\n{invalid_glucose[['Patient_ID', 'Name', 'Glucose']]}")
+        logger.info("Invalid Glucose values found: %d", len(invalid_glucose))
+        log_rows(logger, 'invalid_glucose', "Invalid Glucose records", invalid_glucose,
+                 ['Patient_ID', 'Name', 'Glucose'])
         
         # Fill negative glucose with median of valid glucose
-        valid_glucose_median = self.df[self.df['Glucose'] > 0]['Glucose'].median()
+        valid_glucose_median = fill_value if fill_value is not None else self.df[self.df['Glucose'] > 0]['Glucose'].median()
         negative_count = len(self.df[self.df['Glucose'] < 0])
         self.df.loc[self.df['Glucose'] < 0, 'Glucose'] = valid_glucose_median
-        print(f"Fixed {negative_count} negative Glucose values with median ({valid_glucose_median:.2f})")
+        log_event(logger, 'invalid_glucose_fixed', "Fixed %d negative Glucose values with median (%.2f)",
+                  negative_count, valid_glucose_median, count=negative_count,
+                  fill_value=float(valid_glucose_median))
         
         self.cleaning_report['invalid_glucose_fixed'] = negative_count
         return self.df
     
-    def handle_invalid_blood_pressure(self):
+    def handle_invalid_blood_pressure(self, fill_value=None):
         """Handle extreme BP values (BP > 300 or < 80)"""
-        print("\n=== Handling Invalid Blood Pressure ===")
+        logger.info("\n=== Handling Invalid Blood Pressure ===")
         # Normal BP should be around 90-130. Extreme values (>300) are data entry errors
         extreme_bp = self.df[(self.df['Blood_Pressure'] > 300) | (self.df['Blood_Pressure'] < 60)]
-        print(f"Extreme BP values found: {len(extreme_bp)}")
-        if len(extreme_bp) > 0:
-            print(f"Extreme BP records:\n{extreme_bp[['Patient_ID', 'Name', 'Blood_Pressure']]}")
+        logger.info("Extreme BP values found: %d", len(extreme_bp))
+        log_rows(logger, 'extreme_blood_pressure', "Extreme BP records", extreme_bp,
+                 ['Patient_ID', 'Name', 'Blood_Pressure'])
         
         # Fix extreme values with median
-        valid_bp_median = self.df[(self.df['Blood_Pressure'] >= 60) & (self.df['Blood_Pressure'] <= 300)]['Blood_Pressure'].median()
+        valid_bp_median = fill_value if fill_value is not None else \
+            self.df[(self.df['Blood_Pressure'] >= 60) & (self.df['Blood_Pressure'] <= 300)]['Blood_Pressure'].median()
         extreme_count = len(self.df[(self.df['Blood_Pressure'] > 300) | (self.df['Blood_Pressure'] < 60)])
         self.df.loc[(self.df['Blood_Pressure'] > 300) | (self.df['Blood_Pressure'] < 60), 'Blood_Pressure'] = valid_bp_median
-        print(f"Fixed {extreme_count} extreme BP values with median ({valid_bp_median:.2f})")
+        log_event(logger, 'invalid_bp_fixed', "Fixed %d extreme BP values with median (%.2f)",
+                  extreme_count, valid_bp_median, count=extreme_count, fill_value=float(valid_bp_median))
         
         self.cleaning_report['invalid_bp_fixed'] = extreme_count
         return self.df
     
     def validate_disease_risk(self):
         """Validate disease risk categories"""
-        print("\n=== Validating Disease Risk ===")
+        logger.info("\n=== Validating Disease Risk ===")
         valid_risks = ['Heart Risk', 'Hypertension', 'Diabetes', 'Asthma', 'Normal']
         invalid_risks = self.df[~self.df['Disease_Risk'].isin(valid_risks)]
-        print(f"Invalid disease risk values: {len(invalid_risks)}")
-        if len(invalid_risks) > 0:
-            print(f"Unique invalid values: {invalid_risks['Disease_Risk'].unique()}")
+        log_event(logger, 'invalid_disease_risk', "Invalid disease risk values: %d", len(invalid_risks),
+                  count=len(invalid_risks))
+        if len(invalid_risks) > 0 and logger.isEnabledFor(logging.INFO):
+            logger.info("Unique invalid values: %s", invalid_risks['Disease_Risk'].unique())
         
         self.cleaning_report['disease_risk_validation'] = len(invalid_risks)
         return self.df
     
     def clean_data(self):
         """Execute full cleaning pipeline"""
-        print("="*60)
-        print("HEALTHCARE DATA CLEANING PROCESS")
-        print("="*60)
+        logger.info("="*60)
+        logger.info("HEALTHCARE DATA CLEANING PROCESS")
+        logger.info("="*60)
         
         self.load_data()
         self.get_initial_statistics()
-        self.handle_missing_values()
-        self.handle_invalid_ages()
-        self.handle_invalid_bmi()
-        self.handle_invalid_glucose()
-        self.handle_invalid_blood_pressure()
-        self.validate_disease_risk()
+        # Same medians the steps would compute one by one; kept for online cleaning
+        self.fill_values = self.compute_fill_values()
+        self.apply_cleaning_steps(self.fill_values)
         
-        print("\n" + "="*60)
-        print("CLEANING COMPLETE")
-        print("="*60)
-        print(f"Final dataset: {self.df.shape[0]} rows, {self.df.shape[1]} columns")
+        logger.info("\n" + "="*60)
+        logger.info("CLEANING COMPLETE")
+        logger.info("="*60)
+        logger.info("Final dataset: %d rows, %d columns", *self.df.shape)
         
         return self.df
     
+    def apply_cleaning_steps(self, fill_values=None):
+        """
+        Run the row-level cleaning steps on the loaded data
+        fill_values: output of compute_fill_values() for partitioned runs
+        """
+        fill_values = fill_values or {}
+        self.handle_missing_values(fill_values.get('missing'))
+        self.handle_invalid_ages()
+        self.handle_invalid_bmi(fill_values.get('bmi'))
+        self.handle_invalid_glucose(fill_values.get('glucose'))
+        self.handle_invalid_blood_pressure(fill_values.get('blood_pressure'))
+        self.validate_disease_risk()
+        return self.df
+    
     def save_cleaned_data(self, output_path):
         """Save cleaned dataset"""
         self.df.to_csv(output_path, index=False)
-        print(f"\nCleaned data saved to: {output_path}")
+        logger.info("\nCleaned data saved to: %s", output_path)
         return output_path
     
     def get_cleaning_report(self):
@@ -177,6 +224,7 @@ class HealthcareDataCleaner:
 
 
 if __name__ == "__main__":
+    configure_logging()
     # Initialize cleaner
     data_path = Path(__file__).parent.parent / "data" / "healthcare_data.csv"
     cleaner = HealthcareDataCleaner(str(data_path))
@@ -1,10 +1,15 @@
 import pandas as pd
 import numpy as np
 import json
+import logging
 from pathlib import Path
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+from pipeline_logging import configure_logging, get_logger
+
+logger = get_logger(__name__)
+
 class HealthcareEDA:
     """
     Exploratory Data Analysis for Healthcare dataset
@@ -19,13 +24,14 @@ class HealthcareEDA:
     def load_data(self):
         """Load cleaned dataset"""
         self.df = pd.read_csv(self.filepath)
-        print(f"Dataset loaded: {self.df.shape[0]} rows, {self.df.shape[1]} columns")
+        logger.info("Dataset loaded: %d rows, %d columns", *self.df.shape)
         return self.df
     
     def get_basic_statistics(self):
         """Generate basic statistics"""
-        print("\n=== BASIC STATISTICS ===")
+        logger.info("\n=== BASIC STATISTICS ===")
         
+        describe = self.df.describe().round(2)
         stats = {
             'dataset_info': {
                 'total_records': len(self.df),
@@ -33,21 +39,21 @@ class HealthcareEDA:
                 'feature_names': list(self.df.columns)
             },
             'data_types': self.df.dtypes.astype(str).to_dict(),
-            'describe_stats': self.df.describe().round(2).to_dict()
+            'describe_stats': describe.to_dict()
         }
         
-        print("\nDataset Info:")
-        print(f"Total Records: {stats['dataset_info']['total_records']}")
-        print(f"Total Features: {stats['dataset_info']['total_features']}")
-        print("\nFeature Statistics:")
-        print(self.df.describe().round(2))
+        logger.info("\nDataset Info:")
+        logger.info("Total Records: %s", stats['dataset_info']['total_records'])
+        logger.info("Total Features: %s", stats['dataset_info']['total_features'])
+        logger.info("\nFeature Statistics:")
+        logger.info("%s", describe)
         
         self.analysis_results['basic_statistics'] = stats
         return stats
     
     def analyze_age_distribution(self):
         """Analyze age distribution"""
-        print("\n=== AGE DISTRIBUTION ANALYSIS ===")
+        logger.info("\n=== AGE DISTRIBUTION ANALYSIS ===")
         
         age_stats = {
             'mean_age': float(self.df['Age'].mean()),
@@ -66,18 +72,18 @@ class HealthcareEDA:
         age_group_counts = self.df['Age_Group'].value_counts().sort_index()
         age_stats['age_groups'] = age_group_counts.to_dict()
         
-        print(f"Mean Age: {age_stats['mean_age']:.2f}")
-        print(f"Median Age: {age_stats['median_age']:.2f}")
-        print(f"Age Range: {age_stats['min_age']:.0f} - {age_stats['max_age']:.0f}")
-        print("\nAge Group Distribution:")
-        print(age_group_counts)
+        logger.info("Mean Age: %.2f", age_stats['mean_age'])
+        logger.info("Median Age: %.2f", age_stats['median_age'])
+        logger.info("Age Range: %.0f - %.0f", age_stats['min_age'], age_stats['max_age'])
+        logger.info("\nAge Group Distribution:")
+        logger.info("%s", age_group_counts)
         
         self.analysis_results['age_analysis'] = age_stats
         return age_stats
     
     def analyze_bmi_distribution(self):
         """Analyze BMI distribution and categories"""
-        print("\n=== BMI DISTRIBUTION ANALYSIS ===")
+        logger.info("\n=== BMI DISTRIBUTION ANALYSIS ===")
         
         bmi_stats = {
             'mean_bmi': float(self.df['BMI'].mean()),
@@ -104,18 +110,18 @@ class HealthcareEDA:
         bmi_category_counts = self.df['BMI_Category'].value_counts()
         bmi_stats['bmi_categories'] = bmi_category_counts.to_dict()
         
-        print(f"Mean BMI: {bmi_stats['mean_bmi']:.2f}")
-        print(f"Median BMI: {bmi_stats['median_bmi']:.2f}")
-        print(f"BMI Range: {bmi_stats['min_bmi']:.2f} - {bmi_stats['max_bmi']:.2f}")
-        print("\nBMI Category Distribution:")
-        print(bmi_category_counts)
+        logger.info("Mean BMI: %.2f", bmi_stats['mean_bmi'])
+        logger.info("Median BMI: %.2f", bmi_stats['median_bmi'])
+        logger.info("BMI Range: %.2f - %.2f", bmi_stats['min_bmi'], bmi_stats['max_bmi'])
+        logger.info("\nBMI Category Distribution:")
+        logger.info("%s", bmi_category_counts)
         
         self.analysis_results['bmi_analysis'] = bmi_stats
         return bmi_stats
     
     def analyze_blood_pressure(self):
         """Analyze blood pressure distribution"""
-        print("\n=== BLOOD PRESSURE ANALYSIS ===")
+        logger.info("\n=== BLOOD PRESSURE ANALYSIS ===")
         
         bp_stats = {
             'mean_bp': float(self.df['Blood_Pressure'].mean()),
@@ -141,18 +147,18 @@ class HealthcareEDA:
         bp_category_counts = self.df['BP_Category'].value_counts()
         bp_stats['bp_categories'] = bp_category_counts.to_dict()
         
-        print(f"Mean BP: {bp_stats['mean_bp']:.2f}")
-        print(f"Median BP: {bp_stats['median_bp']:.2f}")
-        print(f"BP Range: {bp_stats['min_bp']:.0f} - {bp_stats['max_bp']:.0f}")
-        print("\nBP Category Distribution:")
-        print(bp_category_counts)
+        logger.info("Mean BP: %.2f", bp_stats['mean_bp'])
+        logger.info("Median BP: %.2f", bp_stats['median_bp'])
+        logger.info("BP Range: %.0f - %.0f", bp_stats['min_bp'], bp_stats['max_bp'])
+        logger.info("\nBP Category Distribution:")
+        logger.info("%s", bp_category_counts)
         
         self.analysis_results['bp_analysis'] = bp_stats
         return bp_stats
     
     def analyze_glucose(self):
         """Analyze glucose distribution"""
-        print("\n=== GLUCOSE DISTRIBUTION ANALYSIS ===")
+        logger.info("\n=== GLUCOSE DISTRIBUTION ANALYSIS ===")
         
         glucose_stats = {
             'mean_glucose': float(self.df['Glucose'].mean()),
@@ -176,18 +182,18 @@ class HealthcareEDA:
         glucose_category_counts = self.df['Glucose_Category'].value_counts()
         glucose_stats['glucose_categories'] = glucose_category_counts.to_dict()
         
-        print(f"Mean Glucose: {glucose_stats['mean_glucose']:.2f}")
-        print(f"Median Glucose: {glucose_stats['median_glucose']:.2f}")
-        print(f"Glucose Range: {glucose_stats['min_glucose']:.0f} - {glucose_stats['max_glucose']:.0f}")
-        print("\nGlucose Category Distribution:")
-        print(glucose_category_counts)
+        logger.info("Mean Glucose: %.2f", glucose_stats['mean_glucose'])
+        logger.info("Median Glucose: %.2f", glucose_stats['median_glucose'])
+        logger.info("Glucose Range: %.0f - %.0f", glucose_stats['min_glucose'], glucose_stats['max_glucose'])
+        logger.info("\nGlucose Category Distribution:")
+        logger.info("%s", glucose_category_counts)
         
         self.analysis_results['glucose_analysis'] = glucose_stats
         return glucose_stats
     
     def analyze_disease_risk(self):
         """Analyze disease risk distribution"""
-        print("\n=== DISEASE RISK ANALYSIS ===")
+        logger.info("\n=== DISEASE RISK ANALYSIS ===")
         
         risk_distribution = self.df['Disease_Risk'].value_counts()
         risk_percentage = (risk_distribution / len(self.df) * 100).round(2)
@@ -198,17 +204,17 @@ class HealthcareEDA:
             'high_risk_count': len(self.df[self.df['Disease_Risk'] == 'Heart Risk'])
         }
         
-        print("\nDisease Risk Distribution:")
+        logger.info("\nDisease Risk Distribution:")
         for disease, count in risk_distribution.items():
             percentage = (count / len(self.df)) * 100
-            print(f"{disease}: {count} ({percentage:.2f}%)")
+            logger.info("%s: %s (%.2f%%)", disease, count, percentage)
         
         self.analysis_results['disease_risk_analysis'] = risk_stats
         return risk_stats
     
     def analyze_geographical_distribution(self):
         """Analyze city-wise distribution"""
-        print("\n=== GEOGRAPHICAL DISTRIBUTION ===")
+        logger.info("\n=== GEOGRAPHICAL DISTRIBUTION ===")
         
         city_distribution = self.df['City'].value_counts()
         
@@ -217,16 +223,16 @@ class HealthcareEDA:
             'total_cities': len(city_distribution)
         }
         
-        print(f"\nTotal Cities: {city_stats['total_cities']}")
-        print("\nPatients by City:")
-        print(city_distribution)
+        logger.info("\nTotal Cities: %s", city_stats['total_cities'])
+        logger.info("\nPatients by City:")
+        logger.info("%s", city_distribution)
         
         self.analysis_results['geographical_analysis'] = city_stats
         return city_stats
     
     def analyze_correlations(self):
         """Analyze correlations between features"""
-        print("\n=== CORRELATION ANALYSIS ===")
+        logger.info("\n=== CORRELATION ANALYSIS ===")
         
         numeric_cols = ['Age', 'BMI', 'Blood_Pressure', 'Glucose']
         correlation_matrix = self.df[numeric_cols].corr()
@@ -236,15 +242,15 @@ class HealthcareEDA:
         for col in correlation_matrix.columns:
             correlation_dict[col] = correlation_matrix[col].round(3).to_dict()
         
-        print("\nCorrelation Matrix:")
-        print(correlation_matrix.round(3))
+        logger.info("\nCorrelation Matrix:")
+        logger.info("%s", correlation_matrix.round(3))
         
         self.analysis_results['correlation_analysis'] = correlation_dict
         return correlation_dict
     
     def identify_high_risk_patients(self):
         """Identify high-risk patients"""
-        print("\n=== HIGH-RISK PATIENT IDENTIFICATION ===")
+        logger.info("\n=== HIGH-RISK PATIENT IDENTIFICATION ===")
         
         # Criteria for high-risk:
         # 1. Disease Risk = 'Heart Risk' or 'Diabetes' or 'Hypertension'
@@ -270,14 +276,14 @@ class HealthcareEDA:
             'average_glucose': round(high_risk['Glucose'].mean(), 2)
         }
         
-        print(f"\nTotal High-Risk Patients: {high_risk_stats['total_high_risk_patients']}")
-        print(f"Percentage: {high_risk_stats['percentage_high_risk']}%")
-        print(f"\nAverage Metrics (High-Risk):")
-        print(f"  Age: {high_risk_stats['average_age']:.2f}")
-        print(f"  BMI: {high_risk_stats['average_bmi']:.2f}")
-        print(f"  Glucose: {high_risk_stats['average_glucose']:.2f}")
-        print("\nHigh-Risk by Disease:")
-        print(high_risk['Disease_Risk'].value_counts())
+        logger.info("\nTotal High-Risk Patients: %s", high_risk_stats['total_high_risk_patients'])
+        logger.info("Percentage: %s%%", high_risk_stats['percentage_high_risk'])
+        logger.info("\nAverage Metrics (High-Risk):")
+        logger.info("  Age: %.2f", high_risk_stats['average_age'])
+        logger.info("  BMI: %.2f", high_risk_stats['average_bmi'])
+        logger.info("  Glucose: %.2f", high_risk_stats['average_glucose'])
+        logger.info("\nHigh-Risk by Disease:")
+        logger.info("%s", pd.Series(high_risk_stats['high_risk_by_disease'], name='count'))
         
         self.analysis_results['high_risk_analysis'] = high_risk_stats
         self.high_risk_df = high_risk
@@ -285,9 +291,9 @@ class HealthcareEDA:
     
     def perform_eda(self):
         """Execute full EDA pipeline"""
-        print("="*60)
-        print("HEALTHCARE EXPLORATORY DATA ANALYSIS")
-        print("="*60)
+        logger.info("="*60)
+        logger.info("HEALTHCARE EXPLORATORY DATA ANALYSIS")
+        logger.info("="*60)
         
         self.load_data()
         self.get_basic_statistics()
@@ -300,9 +306,9 @@ class HealthcareEDA:
         self.analyze_correlations()
         self.identify_high_risk_patients()
         
-        print("\n" + "="*60)
-        print("EDA COMPLETE")
-        print("="*60)
+        logger.info("\n" + "="*60)
+        logger.info("EDA COMPLETE")
+        logger.info("="*60)
         
         return self.analysis_results
     
@@ -310,17 +316,18 @@ class HealthcareEDA:
         """Save analysis report as JSON"""
         with open(output_path, 'w') as f:
             json.dump(self.analysis_results, f, indent=2)
-        print(f"\nAnalysis report saved to: {output_path}")
+        logger.info("\nAnalysis report saved to: %s", output_path)
         return output_path
     
     def save_high_risk_patients(self, output_path):
         """Save high-risk patients to CSV"""
         self.high_risk_df.to_csv(output_path, index=False)
-        print(f"High-risk patients saved to: {output_path}")
+        logger.info("High-risk patients saved to: %s", output_path)
         return output_path
 
 
 if __name__ == "__main__":
+    configure_logging()
     # Initialize EDA
     data_path = Path(__file__).parent.parent / "data" / "healthcare_data_cleaned.csv"
     eda = HealthcareEDA(str(data_path))
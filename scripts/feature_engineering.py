@@ -1,25 +1,108 @@
 import pandas as pd
 import numpy as np
 import json
+import logging
 from pathlib import Path
+from scipy import sparse
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 
+from category_vocabulary import CategoryVocabulary
+from pipeline_logging import configure_logging, get_logger
+
+logger = get_logger(__name__)
+
+# Columns whose means are reported as KPIs
+KPI_MEAN_COLUMNS = [
+    'Age', 'BMI', 'Blood_Pressure', 'Glucose', 'Health_Score',
+    'Risk_Score', 'Cardiovascular_Risk', 'Metabolic_Health'
+]
+
+# Categorical columns that are one-hot encoded, with their column prefix
+ONE_HOT_COLUMNS = {
+    'Age_Group': 'AgeGroup',
+    'BMI_Category': 'BMI',
+    'Disease_Risk': 'Disease',
+    'City': 'City'
+}
+
+
+def sorted_counts(counts):
+    """
+    Category counts, most frequent first and ties by category, so the
+    distributions (and the top 5 cities) of a full-dataset run and of merged
+    partitions list categories in the same order
+    """
+    return dict(sorted(counts.items(), key=lambda x: (-x[1], str(x[0]))))
+
+
+def build_sparse_one_hot(codes, categories, prefix):
+    """
+    Build a CSR one-hot matrix from integer category codes
+    Code -1 (missing/unknown category) gives an all-zero row
+    Returns the matrix and its column names
+    """
+    codes = np.asarray(codes)
+    rows = np.flatnonzero(codes >= 0)
+    matrix = sparse.csr_matrix(
+        (np.ones(len(rows)), (rows, codes[rows])),
+        shape=(len(codes), len(categories))
+    )
+    return matrix, [f'{prefix}_{category}' for category in categories]
+
+
+def categorical_codes(values, column, vocabulary=None):
+    """
+    Categorical of values, encoded against the vocabulary store if given,
+    otherwise with the (sorted) categories present in values
+    """
+    if vocabulary is None:
+        return pd.Categorical(values)
+    codes = vocabulary.encode(column, values)
+    return pd.Categorical.from_codes(codes, vocabulary.categories(column))
+
+
+def sparse_one_hot_from_frame(df, vocabulary=None, columns=ONE_HOT_COLUMNS):
+    """
+    One-hot encode categorical columns of a DataFrame straight into one CSR matrix
+    Same columns (and order) as pd.get_dummies, without ever densifying
+    """
+    blocks, names = [], []
+    for column, prefix in columns.items():
+        categorical = categorical_codes(df[column], column, vocabulary)
+        block, block_names = build_sparse_one_hot(categorical.codes, categorical.categories, prefix)
+        blocks.append(block)
+        names.extend(block_names)
+    return sparse.hstack(blocks, format='csr'), names
+
+
 class HealthcareFeatureEngineering:
     """
     Feature Engineering and KPI Creation for Healthcare ML
     Creates derived features and key performance indicators
     """
     
-    def __init__(self, filepath):
+    def __init__(self, filepath, categorical_encoding='dense', vocabulary=None):
+        """
+        categorical_encoding:
+        - 'dense': append boolean one-hot columns (pd.get_dummies)
+        - 'sparse': keep only integer codes per category, see get_sparse_one_hot()
+        vocabulary: CategoryVocabulary to encode categories against; without it
+        the categories present in the loaded data are used
+        """
+        if categorical_encoding not in ('dense', 'sparse'):
+            raise ValueError(f"categorical_encoding must be 'dense' or 'sparse', got {categorical_encoding!r}")
         self.filepath = filepath
+        self.categorical_encoding = categorical_encoding
+        self.vocabulary = vocabulary
         self.df = None
         self.kpis = {}
         self.feature_info = {}
+        self.one_hot_codes = {}
         
     def load_data(self):
         """Load cleaned dataset"""
         self.df = pd.read_csv(self.filepath)
-        print(f"Dataset loaded: {self.df.shape}")
+        logger.info("Dataset loaded: %s", self.df.shape)
         return self.df
     
     def create_health_score(self):
@@ -27,7 +110,7 @@ class HealthcareFeatureEngineering:
         Create composite health score (0-100)
         Based on normalized health metrics
         """
-        print("\n=== Creating Health Score ===")
+        logger.info("\n=== Creating Health Score ===")
         
         # Normalize individual metrics
         # Age: younger is better (normalize 0-100 to 100-0)
@@ -56,8 +139,8 @@ class HealthcareFeatureEngineering:
             glucose_score * 0.25
         )
         
-        print(f"Health Score Range: {self.df['Health_Score'].min():.2f} - {self.df['Health_Score'].max():.2f}")
-        print(f"Average Health Score: {self.df['Health_Score'].mean():.2f}")
+        logger.info("Health Score Range: %.2f - %.2f", self.df['Health_Score'].min(), self.df['Health_Score'].max())
+        logger.info("Average Health Score: %.2f", self.df['Health_Score'].mean())
         
         self.feature_info['health_score'] = {
             'min': float(self.df['Health_Score'].min()),
@@ -73,7 +156,7 @@ class HealthcareFeatureEngineering:
         Create risk score based on multiple factors
         Higher score = higher risk
         """
-        print("\n=== Creating Risk Score ===")
+        logger.info("\n=== Creating Risk Score ===")
         
         risk_score = 0
         
@@ -118,8 +201,8 @@ class HealthcareFeatureEngineering:
         
         self.df['Risk_Score'] = risk_score
         
-        print(f"Risk Score Range: {self.df['Risk_Score'].min():.2f} - {self.df['Risk_Score'].max():.2f}")
-        print(f"Average Risk Score: {self.df['Risk_Score'].mean():.2f}")
+        logger.info("Risk Score Range: %.2f - %.2f", self.df['Risk_Score'].min(), self.df['Risk_Score'].max())
+        logger.info("Average Risk Score: %.2f", self.df['Risk_Score'].mean())
         
         self.feature_info['risk_score'] = {
             'min': float(self.df['Risk_Score'].min()),
@@ -132,23 +215,23 @@ class HealthcareFeatureEngineering:
     
     def create_age_group_features(self):
         """Create age group categorical features"""
-        print("\n=== Creating Age Group Features ===")
+        logger.info("\n=== Creating Age Group Features ===")
         
         age_bins = [0, 18, 30, 45, 60, 100]
         age_labels = ['Child_Teen', 'Young_Adult', 'Middle_Age', 'Senior', 'Elderly']
         self.df['Age_Group'] = pd.cut(self.df['Age'], bins=age_bins, labels=age_labels)
         
         # One-hot encoding for age groups
-        age_dummies = pd.get_dummies(self.df['Age_Group'], prefix='AgeGroup')
-        self.df = pd.concat([self.df, age_dummies], axis=1)
+        self._encode_one_hot('Age_Group')
         
-        print(f"Age Group distribution:\n{self.df['Age_Group'].value_counts()}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Age Group distribution:\n%s", self.df['Age_Group'].value_counts())
         
         return self.df
     
     def create_bmi_features(self):
         """Create BMI derived features"""
-        print("\n=== Creating BMI Features ===")
+        logger.info("\n=== Creating BMI Features ===")
         
         # BMI Category
         def categorize_bmi(bmi):
@@ -170,16 +253,43 @@ class HealthcareFeatureEngineering:
         )
         
         # One-hot encoding for BMI category
-        bmi_dummies = pd.get_dummies(self.df['BMI_Category'], prefix='BMI')
-        self.df = pd.concat([self.df, bmi_dummies], axis=1)
+        self._encode_one_hot('BMI_Category')
         
-        print(f"BMI Category distribution:\n{self.df['BMI_Category'].value_counts()}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("BMI Category distribution:\n%s", self.df['BMI_Category'].value_counts())
         
         return self.df
     
+    def _encode_one_hot(self, column):
+        """
+        One-hot encode a categorical column
+        Dense mode appends boolean dummy columns; sparse mode stores the
+        integer codes and categories only
+        """
+        prefix = ONE_HOT_COLUMNS[column]
+        categorical = categorical_codes(self.df[column], column, self.vocabulary)
+        if self.categorical_encoding == 'sparse':
+            self.one_hot_codes[column] = (categorical.codes, list(categorical.categories))
+        else:
+            dummies = pd.get_dummies(pd.Series(categorical, index=self.df.index), prefix=prefix)
+            self.df = pd.concat([self.df, dummies], axis=1)
+        return self.df
+    
+    def get_sparse_one_hot(self):
+        """
+        One-hot encodings collected in sparse mode as a single CSR matrix
+        Returns the matrix (rows aligned with self.df) and its column names
+        """
+        blocks, names = [], []
+        for column, (codes, categories) in self.one_hot_codes.items():
+            block, block_names = build_sparse_one_hot(codes, categories, ONE_HOT_COLUMNS[column])
+            blocks.append(block)
+            names.extend(block_names)
+        return sparse.hstack(blocks, format='csr'), names
+    
     def create_metabolic_features(self):
         """Create metabolic health indicators"""
-        print("\n=== Creating Metabolic Features ===")
+        logger.info("\n=== Creating Metabolic Features ===")
         
         # Glucose-to-BMI ratio (indicator of metabolic stress)
         self.df['Glucose_BMI_Ratio'] = (self.df['Glucose'] / (self.df['BMI'] + 1)).round(2)
@@ -191,13 +301,13 @@ class HealthcareFeatureEngineering:
         )
         self.df['Metabolic_Health'] = np.clip(self.df['Metabolic_Health'], 0, 100)
         
-        print(f"Metabolic Health Score - Mean: {self.df['Metabolic_Health'].mean():.2f}")
+        logger.info("Metabolic Health Score - Mean: %.2f", self.df['Metabolic_Health'].mean())
         
         return self.df
     
     def create_cardiovascular_features(self):
         """Create cardiovascular health indicators"""
-        print("\n=== Creating Cardiovascular Features ===")
+        logger.info("\n=== Creating Cardiovascular Features ===")
         
         # Cardiovascular risk score
         self.df['Cardiovascular_Risk'] = (
@@ -210,13 +320,13 @@ class HealthcareFeatureEngineering:
         # BP ratio indicator
         self.df['Hypertension_Risk'] = (self.df['Blood_Pressure'] > 140).astype(int)
         
-        print(f"Cardiovascular Risk - Mean: {self.df['Cardiovascular_Risk'].mean():.2f}")
+        logger.info("Cardiovascular Risk - Mean: %.2f", self.df['Cardiovascular_Risk'].mean())
         
         return self.df
     
     def create_disease_risk_encoding(self):
         """Encode disease risk categories"""
-        print("\n=== Encoding Disease Risk ===")
+        logger.info("\n=== Encoding Disease Risk ===")
         
         disease_risk_priority_map = {
             'Normal': 1,
@@ -229,32 +339,35 @@ class HealthcareFeatureEngineering:
         self.df['Disease_Risk_Priority'] = self.df['Disease_Risk'].map(disease_risk_priority_map)
         
         # One-hot encoding for disease risk
-        disease_dummies = pd.get_dummies(self.df['Disease_Risk'], prefix='Disease')
-        self.df = pd.concat([self.df, disease_dummies], axis=1)
+        self._encode_one_hot('Disease_Risk')
         
-        print(f"Disease Risk encoding complete")
+        logger.info("Disease Risk encoding complete")
         
         return self.df
     
     def encode_categorical_features(self):
         """Encode remaining categorical features"""
-        print("\n=== Encoding Categorical Features ===")
+        logger.info("\n=== Encoding Categorical Features ===")
         
-        # Encode City
-        le_city = LabelEncoder()
-        self.df['City_Encoded'] = le_city.fit_transform(self.df['City'])
+        # Encode City (stored vocabulary: stable codes, no refit per batch)
+        if self.vocabulary is not None:
+            self.df['City_Encoded'] = self.vocabulary.encode('City', self.df['City']).astype(np.int64)
+            city_count = len(self.vocabulary.categories('City'))
+        else:
+            le_city = LabelEncoder()
+            self.df['City_Encoded'] = le_city.fit_transform(self.df['City'])
+            city_count = len(le_city.classes_)
         
         # Create city distribution features
-        city_dummies = pd.get_dummies(self.df['City'], prefix='City')
-        self.df = pd.concat([self.df, city_dummies], axis=1)
+        self._encode_one_hot('City')
         
-        print(f"City encoding complete - {len(le_city.classes_)} unique cities")
+        logger.info("City encoding complete - %s unique cities", city_count)
         
         return self.df
     
     def create_interaction_features(self):
         """Create interaction features"""
-        print("\n=== Creating Interaction Features ===")
+        logger.info("\n=== Creating Interaction Features ===")
         
         # Age-BMI interaction (risk increases significantly when both high)
         self.df['Age_BMI_Interaction'] = (self.df['Age'] * self.df['BMI']) / 1000
@@ -268,95 +381,185 @@ class HealthcareFeatureEngineering:
             (self.df['Glucose'] - 100) ** 2 / 100
         )
         
-        print(f"Interaction features created")
+        logger.info("Interaction features created")
         
         return self.df
     
-    def calculate_kpis(self):
-        """Calculate Key Performance Indicators"""
-        print("\n=== CALCULATING KPIS ===")
-        
-        # Overall Health Metrics
-        self.kpis['overall_metrics'] = {
-            'total_patients': len(self.df),
-            'average_age': round(self.df['Age'].mean(), 2),
-            'average_bmi': round(self.df['BMI'].mean(), 2),
-            'average_blood_pressure': round(self.df['Blood_Pressure'].mean(), 2),
-            'average_glucose': round(self.df['Glucose'].mean(), 2),
-        }
-        
-        # Health Score KPIs
-        self.kpis['health_score_kpis'] = {
-            'average_health_score': round(self.df['Health_Score'].mean(), 2),
-            'patients_excellent_health': len(self.df[self.df['Health_Score'] >= 75]),
-            'patients_good_health': len(self.df[(self.df['Health_Score'] >= 50) & (self.df['Health_Score'] < 75)]),
-            'patients_poor_health': len(self.df[self.df['Health_Score'] < 50]),
-        }
-        
-        # Risk Score KPIs
-        self.kpis['risk_score_kpis'] = {
-            'average_risk_score': round(self.df['Risk_Score'].mean(), 2),
-            'high_risk_patients': len(self.df[self.df['Risk_Score'] >= 60]),
-            'medium_risk_patients': len(self.df[(self.df['Risk_Score'] >= 30) & (self.df['Risk_Score'] < 60)]),
-            'low_risk_patients': len(self.df[self.df['Risk_Score'] < 30]),
-        }
-        
-        # Disease-specific KPIs
-        self.kpis['disease_kpis'] = {
-            'heart_risk_patients': len(self.df[self.df['Disease_Risk'] == 'Heart Risk']),
-            'diabetes_patients': len(self.df[self.df['Disease_Risk'] == 'Diabetes']),
-            'hypertension_patients': len(self.df[self.df['Disease_Risk'] == 'Hypertension']),
-            'asthma_patients': len(self.df[self.df['Disease_Risk'] == 'Asthma']),
-            'normal_health_patients': len(self.df[self.df['Disease_Risk'] == 'Normal']),
+    @staticmethod
+    def aggregate_kpi_statistics(df):
+        """
+        Additive KPI statistics (sums and counts) for a dataset or a partition of it
+        Statistics of several partitions combine with merge_kpi_statistics()
+        """
+        return {
+            'total_patients': len(df),
+            'sums': {col: float(df[col].sum()) for col in KPI_MEAN_COLUMNS},
+            'non_null': {col: int(df[col].count()) for col in KPI_MEAN_COLUMNS},
+            'counts': {
+                'patients_excellent_health': int((df['Health_Score'] >= 75).sum()),
+                'patients_good_health': int(((df['Health_Score'] >= 50) & (df['Health_Score'] < 75)).sum()),
+                'patients_poor_health': int((df['Health_Score'] < 50).sum()),
+                'high_risk_patients': int((df['Risk_Score'] >= 60).sum()),
+                'medium_risk_patients': int(((df['Risk_Score'] >= 30) & (df['Risk_Score'] < 60)).sum()),
+                'low_risk_patients': int((df['Risk_Score'] < 30).sum()),
+                'heart_risk_patients': int((df['Disease_Risk'] == 'Heart Risk').sum()),
+                'diabetes_patients': int((df['Disease_Risk'] == 'Diabetes').sum()),
+                'hypertension_patients': int((df['Disease_Risk'] == 'Hypertension').sum()),
+                'asthma_patients': int((df['Disease_Risk'] == 'Asthma').sum()),
+                'normal_health_patients': int((df['Disease_Risk'] == 'Normal').sum()),
+                'hypertension_risk_patients': int((df['Hypertension_Risk'] == 1).sum()),
+                'patients_with_good_metabolism': int((df['Metabolic_Health'] >= 70).sum()),
+                'patients_with_poor_metabolism': int((df['Metabolic_Health'] < 50).sum()),
+            },
+            'distributions': {
+                'BMI_Category': sorted_counts(df['BMI_Category'].value_counts().to_dict()),
+                'Age_Group': sorted_counts(df['Age_Group'].value_counts().to_dict()),
+                'City': sorted_counts(df['City'].value_counts().to_dict()),
+            }
         }
-        
-        # Cardiovascular Health KPIs
-        self.kpis['cardiovascular_kpis'] = {
-            'average_cardiovascular_risk': round(self.df['Cardiovascular_Risk'].mean(), 2),
-            'hypertension_risk_patients': len(self.df[self.df['Hypertension_Risk'] == 1]),
+    
+    @staticmethod
+    def merge_kpi_statistics(statistics):
+        """Combine aggregate_kpi_statistics() results of several partitions"""
+        merged = {
+            'total_patients': 0,
+            'sums': dict.fromkeys(KPI_MEAN_COLUMNS, 0.0),
+            'non_null': dict.fromkeys(KPI_MEAN_COLUMNS, 0),
+            'counts': {},
+            'distributions': {}
         }
-        
-        # Metabolic Health KPIs
-        self.kpis['metabolic_kpis'] = {
-            'average_metabolic_health': round(self.df['Metabolic_Health'].mean(), 2),
-            'patients_with_good_metabolism': len(self.df[self.df['Metabolic_Health'] >= 70]),
-            'patients_with_poor_metabolism': len(self.df[self.df['Metabolic_Health'] < 50]),
+        for stats in statistics:
+            merged['total_patients'] += stats['total_patients']
+            for col in KPI_MEAN_COLUMNS:
+                merged['sums'][col] += stats['sums'][col]
+                merged['non_null'][col] += stats['non_null'][col]
+            for key, val in stats['counts'].items():
+                merged['counts'][key] = merged['counts'].get(key, 0) + val
+            for col, dist in stats['distributions'].items():
+                merged_dist = merged['distributions'].setdefault(col, {})
+                for category, count in dist.items():
+                    merged_dist[category] = merged_dist.get(category, 0) + count
+        
+        merged['distributions'] = {col: sorted_counts(dist) for col, dist in merged['distributions'].items()}
+        return merged
+    
+    @staticmethod
+    def kpis_from_statistics(stats):
+        """Build the KPI report from (merged) aggregate KPI statistics"""
+        def mean(col):
+            return round(stats['sums'][col] / stats['non_null'][col], 2) if stats['non_null'][col] else None
+        
+        counts = stats['counts']
+        return {
+            # Overall Health Metrics
+            'overall_metrics': {
+                'total_patients': stats['total_patients'],
+                'average_age': mean('Age'),
+                'average_bmi': mean('BMI'),
+                'average_blood_pressure': mean('Blood_Pressure'),
+                'average_glucose': mean('Glucose'),
+            },
+            # Health Score KPIs
+            'health_score_kpis': {
+                'average_health_score': mean('Health_Score'),
+                'patients_excellent_health': counts['patients_excellent_health'],
+                'patients_good_health': counts['patients_good_health'],
+                'patients_poor_health': counts['patients_poor_health'],
+            },
+            # Risk Score KPIs
+            'risk_score_kpis': {
+                'average_risk_score': mean('Risk_Score'),
+                'high_risk_patients': counts['high_risk_patients'],
+                'medium_risk_patients': counts['medium_risk_patients'],
+                'low_risk_patients': counts['low_risk_patients'],
+            },
+            # Disease-specific KPIs
+            'disease_kpis': {
+                'heart_risk_patients': counts['heart_risk_patients'],
+                'diabetes_patients': counts['diabetes_patients'],
+                'hypertension_patients': counts['hypertension_patients'],
+                'asthma_patients': counts['asthma_patients'],
+                'normal_health_patients': counts['normal_health_patients'],
+            },
+            # Cardiovascular Health KPIs
+            'cardiovascular_kpis': {
+                'average_cardiovascular_risk': mean('Cardiovascular_Risk'),
+                'hypertension_risk_patients': counts['hypertension_risk_patients'],
+            },
+            # Metabolic Health KPIs
+            'metabolic_kpis': {
+                'average_metabolic_health': mean('Metabolic_Health'),
+                'patients_with_good_metabolism': counts['patients_with_good_metabolism'],
+                'patients_with_poor_metabolism': counts['patients_with_poor_metabolism'],
+            },
+            # BMI / Age Group Distribution KPIs
+            'bmi_distribution': stats['distributions']['BMI_Category'],
+            'age_group_distribution': stats['distributions']['Age_Group'],
+            # City Distribution KPIs (top 5)
+            'city_distribution_top5': dict(list(stats['distributions']['City'].items())[:5]),
         }
-        
-        # BMI Distribution KPIs
-        bmi_dist = self.df['BMI_Category'].value_counts()
-        self.kpis['bmi_distribution'] = bmi_dist.to_dict()
-        
-        # Age Group Distribution KPIs
-        age_dist = self.df['Age_Group'].value_counts()
-        self.kpis['age_group_distribution'] = age_dist.to_dict()
-        
-        # City Distribution KPIs (top 5)
-        city_dist = self.df['City'].value_counts().head(5)
-        self.kpis['city_distribution_top5'] = city_dist.to_dict()
-        
-        # Print KPIs
-        print("\n--- Overall Metrics ---")
+    
+    @staticmethod
+    def city_kpis_from_statistics(city_statistics):
+        """Overall, health score and risk score KPIs per city, from {city: aggregate statistics}"""
+        city_kpis = {}
+        for city in sorted(city_statistics):
+            kpis = HealthcareFeatureEngineering.kpis_from_statistics(city_statistics[city])
+            city_kpis[city] = {key: kpis[key] for key in ('overall_metrics', 'health_score_kpis', 'risk_score_kpis')}
+        return city_kpis
+    
+    def calculate_kpis(self, statistics=None, city_statistics=None):
+        """
+        Calculate Key Performance Indicators
+        statistics / city_statistics: merged aggregate statistics of all
+        partitions, overall and per city; computed from the loaded dataset when omitted
+        """
+        logger.info("\n=== CALCULATING KPIS ===")
+        
+        if statistics is None:
+            statistics = self.aggregate_kpi_statistics(self.df)
+        if city_statistics is None:
+            city_statistics = {
+                city: self.aggregate_kpi_statistics(group) for city, group in self.df.groupby('City', sort=False)
+            }
+        self.kpis = self.kpis_from_statistics(statistics)
+        self.kpis['city_kpis'] = self.city_kpis_from_statistics(city_statistics)
+        
+        # Log KPIs
+        logger.info("\n--- Overall Metrics ---")
         for key, val in self.kpis['overall_metrics'].items():
-            print(f"{key}: {val}")
+            logger.info("%s: %s", key, val)
         
-        print("\n--- Health Score KPIs ---")
+        logger.info("\n--- Health Score KPIs ---")
         for key, val in self.kpis['health_score_kpis'].items():
-            print(f"{key}: {val}")
+            logger.info("%s: %s", key, val)
         
-        print("\n--- Risk Score KPIs ---")
+        logger.info("\n--- Risk Score KPIs ---")
         for key, val in self.kpis['risk_score_kpis'].items():
-            print(f"{key}: {val}")
+            logger.info("%s: %s", key, val)
         
         return self.kpis
     
     def engineer_features(self):
         """Execute full feature engineering pipeline"""
-        print("="*60)
-        print("HEALTHCARE FEATURE ENGINEERING & KPI CREATION")
-        print("="*60)
+        logger.info("="*60)
+        logger.info("HEALTHCARE FEATURE ENGINEERING & KPI CREATION")
+        logger.info("="*60)
         
         self.load_data()
+        self.create_row_features()
+        self.calculate_kpis()
+        
+        logger.info("\n" + "="*60)
+        logger.info("FEATURE ENGINEERING COMPLETE")
+        logger.info("="*60)
+        logger.info("Final dataset shape: %s", self.df.shape)
+        logger.info("New features created: %d", self.df.shape[1] - 8)  # 8 original columns
+        
+        return self.df
+    
+    def create_row_features(self):
+        """Run the row-level feature steps on the loaded data"""
         self.create_health_score()
         self.create_risk_score()
         self.create_age_group_features()
@@ -366,27 +569,19 @@ class HealthcareFeatureEngineering:
         self.create_disease_risk_encoding()
         self.encode_categorical_features()
         self.create_interaction_features()
-        self.calculate_kpis()
-        
-        print("\n" + "="*60)
-        print("FEATURE ENGINEERING COMPLETE")
-        print("="*60)
-        print(f"Final dataset shape: {self.df.shape}")
-        print(f"New features created: {self.df.shape[1] - 8}")  # 8 original columns
-        
         return self.df
     
     def save_engineered_data(self, output_path):
         """Save engineered dataset"""
         self.df.to_csv(output_path, index=False)
-        print(f"\nEngineered data saved to: {output_path}")
+        logger.info("\nEngineered data saved to: %s", output_path)
         return output_path
     
     def save_kpi_report(self, output_path):
         """Save KPI report as JSON"""
         with open(output_path, 'w') as f:
             json.dump(self.kpis, f, indent=2)
-        print(f"KPI report saved to: {output_path}")
+        logger.info("KPI report saved to: %s", output_path)
         return output_path
     
     def get_feature_summary(self):
@@ -401,6 +596,7 @@ class HealthcareFeatureEngineering:
 
 
 if __name__ == "__main__":
+    configure_logging()
     # Initialize feature engineering
     data_path = Path(__file__).parent.parent / "data" / "healthcare_data_cleaned.csv"
     fe = HealthcareFeatureEngineering(str(data_path))
@@ -0,0 +1,177 @@
+import pandas as pd
+import numpy as np
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+try:
+    from config import SYNTHETIC_DATA_CONFIG
+except ImportError:
+    # Script run directly: config.py lives in backend/
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+    from config import SYNTHETIC_DATA_CONFIG
+
+RAW_COLUMNS = ['Patient_ID', 'Name', 'Age', 'BMI', 'Blood_Pressure', 'Glucose', 'Disease_Risk', 'City']
+NUMERIC_COLUMNS = ['Age', 'BMI', 'Blood_Pressure', 'Glucose']
+
+# First names of the shipped dataset
+NAMES = [
+    'Divya', 'Suresh', 'Arjun', 'Ankit', 'Vikas', 'Pooja', 'Manish', 'Priya', 'Rahul', 'Rohit',
+    'Varun', 'Isha', 'Amit', 'Neha', 'Sneha', 'Riya', 'Meera', 'Komal', 'Karan', 'Anjali'
+]
+
+
+class SyntheticHealthcareDataGenerator:
+    """
+    Synthetic raw healthcare data in the healthcare_data.csv schema
+    - Rows are generated and written in chunks, so memory stays bounded at any
+      row count (1e3 to 1e8+)
+    - Clean values follow the configured distributions; dirty values (missing,
+      ages over 100, negative BMI/Glucose, extreme blood pressure) are injected
+      at the configured rates, for the data cleaning steps to repair
+    - Chunk i draws from its own generator seeded with (random_state, i): the
+      same seed and chunk size always produce the same file
+    """
+
+    def __init__(self, n_rows, chunk_size=None, distributions=None, disease_risk=None, city=None,
+                 dirty_rates=None, random_state=None, start_id=None):
+        config = SYNTHETIC_DATA_CONFIG
+        self.n_rows = int(n_rows)
+        self.chunk_size = int(chunk_size or config['chunk_size'])
+        self.distributions = {**config['distributions'], **(distributions or {})}
+        self.disease_risk = disease_risk or config['disease_risk']
+        self.city = city or config['city']
+        self.dirty_rates = {**config['dirty_rates'], **(dirty_rates or {})}
+        self.random_state = config['random_state'] if random_state is None else random_state
+        self.start_id = config['start_id'] if start_id is None else start_id
+        self.dirty_counts = {}
+
+    def sample_numeric(self, rng, column, size):
+        """Clean values of a numeric column from its configured distribution"""
+        spec = self.distributions[column]
+        if spec['dist'] == 'normal':
+            values = rng.normal(spec['mean'], spec['std'], size)
+        elif spec['dist'] == 'uniform':
+            values = rng.uniform(spec['low'], spec['high'], size)
+        else:
+            raise ValueError(f"Unknown distribution for {column}: {spec['dist']!r}")
+        values = np.clip(values, spec.get('min', -np.inf), spec.get('max', np.inf))
+        return np.round(values, spec.get('decimals', 1))
+
+    def sample_category(self, rng, probabilities, size):
+        """Categories drawn with the configured probabilities (normalized)"""
+        categories = np.array(list(probabilities), dtype=object)
+        p = np.array(list(probabilities.values()), dtype=float)
+        return categories[rng.choice(len(categories), size=size, p=p / p.sum())]
+
+    def inject_dirty_values(self, rng, columns, size):
+        """Overwrite random rows of the numeric columns (arrays) with dirty values; counts are accumulated"""
+        rates = self.dirty_rates
+
+        def pick(rate):
+            return np.flatnonzero(rng.random(size) < rate)
+
+        dirty = {
+            'age_over_100': ('Age', lambda n: np.round(rng.uniform(101, 150, n))),
+            'negative_bmi': ('BMI', lambda n: -np.round(rng.uniform(1, 10, n), 1)),
+            'negative_glucose': ('Glucose', lambda n: -np.round(rng.uniform(1, 50, n))),
+            # Half below the valid 60-300 range, half above it
+            'extreme_blood_pressure': ('Blood_Pressure', lambda n: np.where(
+                rng.random(n) < 0.5, np.round(rng.uniform(20, 59, n)), np.round(rng.uniform(301, 400, n))
+            ))
+        }
+        for kind, (column, values) in dirty.items():
+            rows = pick(rates.get(kind, 0))
+            columns[column][rows] = values(len(rows))
+            self.dirty_counts[kind] = self.dirty_counts.get(kind, 0) + len(rows)
+
+        # Missing values last, so they can also hide dirty values (as in the shipped data)
+        for column in NUMERIC_COLUMNS:
+            rows = pick(rates.get('missing', 0))
+            columns[column][rows] = np.nan
+            self.dirty_counts[f'missing_{column}'] = self.dirty_counts.get(f'missing_{column}', 0) + len(rows)
+        return columns
+
+    def generate_chunk(self, chunk_index):
+        """One chunk of raw rows as a DataFrame"""
+        start = chunk_index * self.chunk_size
+        size = min(self.chunk_size, self.n_rows - start)
+        rng = np.random.default_rng([self.random_state, chunk_index])
+
+        columns = {
+            'Patient_ID': np.arange(self.start_id + start, self.start_id + start + size, dtype=np.int64),
+            'Name': np.array(NAMES, dtype=object)[rng.integers(0, len(NAMES), size)],
+            **{column: self.sample_numeric(rng, column, size).astype(float) for column in NUMERIC_COLUMNS},
+            'Disease_Risk': self.sample_category(rng, self.disease_risk, size),
+            'City': self.sample_category(rng, self.city, size)
+        }
+        self.inject_dirty_values(rng, columns, size)
+        return pd.DataFrame(columns, columns=RAW_COLUMNS)
+
+    def iter_chunks(self):
+        """Yield the dataset chunk by chunk"""
+        n_chunks = -(-self.n_rows // self.chunk_size)
+        for chunk_index in range(n_chunks):
+            yield self.generate_chunk(chunk_index)
+
+    def generate(self, output_path):
+        """Stream the dataset to a CSV file; returns a generation summary"""
+        print("="*60)
+        print(f"SYNTHETIC DATA GENERATION ({self.n_rows:,} rows)")
+        print("="*60)
+
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        self.dirty_counts = {}
+        start = time.perf_counter()
+        rows_written = 0
+        for chunk_index, chunk in enumerate(self.iter_chunks()):
+            chunk.to_csv(output_path, mode='w' if chunk_index == 0 else 'a',
+                         header=chunk_index == 0, index=False)
+            rows_written += len(chunk)
+            print(f"  chunk {chunk_index + 1}: {rows_written:,} / {self.n_rows:,} rows")
+        seconds = time.perf_counter() - start
+
+        summary = {
+            'output_path': str(output_path),
+            'rows': rows_written,
+            'chunk_size': self.chunk_size,
+            'random_state': self.random_state,
+            'seconds': round(seconds, 3),
+            'rows_per_second': round(rows_written / seconds, 1) if seconds else None,
+            'size_mb': round(Path(output_path).stat().st_size / 1024 ** 2, 2),
+            'dirty_counts': self.dirty_counts
+        }
+        print(f"\nGenerated {rows_written:,} rows in {seconds:.2f}s ({summary['size_mb']} MB): {output_path}")
+        print(f"Dirty values: {self.dirty_counts}")
+        return summary
+
+
+if __name__ == "__main__":
+    data_dir = Path(__file__).parent.parent / "data"
+    parser = argparse.ArgumentParser(description="Generate synthetic raw healthcare data")
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--output', default=str(data_dir / "healthcare_data_synthetic.csv"))
+    parser.add_argument('--chunk-size', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--missing-rate', type=float, default=None,
+                        help="Fraction of missing values per numeric column")
+    parser.add_argument('--config', default=None,
+                        help="JSON file overriding distributions, disease_risk, city and dirty_rates")
+    args = parser.parse_args()
+
+    overrides = {}
+    if args.config:
+        with open(args.config, 'r') as f:
+            overrides = json.load(f)
+    dirty_rates = overrides.get('dirty_rates', {})
+    if args.missing_rate is not None:
+        dirty_rates = {**dirty_rates, 'missing': args.missing_rate}
+
+    generator = SyntheticHealthcareDataGenerator(
+        args.rows, chunk_size=args.chunk_size, distributions=overrides.get('distributions'),
+        disease_risk=overrides.get('disease_risk'), city=overrides.get('city'),
+        dirty_rates=dirty_rates, random_state=args.seed
+    )
+    generator.generate(args.output)
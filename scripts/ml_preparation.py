@@ -1,12 +1,289 @@
 import pandas as pd
 import numpy as np
 import json
+import logging
+import sys
+import time
 from pathlib import Path
+from joblib import Parallel, delayed, effective_n_jobs
+from scipy import sparse
 from sklearn.preprocessing import StandardScaler, MinMaxScaler
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import train_test_split, StratifiedKFold
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.linear_model import LogisticRegression
-from sklearn.metrics import classification_report, confusion_matrix, accuracy_score
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.metrics import (
+    classification_report, confusion_matrix, accuracy_score,
+    precision_score, recall_score, f1_score, roc_auc_score
+)
+
+from feature_engineering import sparse_one_hot_from_frame
+from model_tuning import SuccessiveHalvingTuner, MODEL_CLASSES
+
+try:
+    from config import ML_CONFIG
+except ImportError:
+    # Script run directly: config.py lives in backend/
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+    from config import ML_CONFIG
+
+from numpy_inference import load_risk_model
+from online_training import OnlineRiskModel, ONLINE_MODEL_NAME, online_state_path
+from pipeline_logging import configure_logging, get_logger, log_event
+
+logger = get_logger(__name__)
+
+# Feature columns used by the models
+MODEL_FEATURES = [
+    'Age', 'BMI', 'Blood_Pressure', 'Glucose',
+    'Health_Score', 'Risk_Score',
+    'BMI_Deviation', 'Glucose_BMI_Ratio',
+    'Metabolic_Health', 'Cardiovascular_Risk',
+    'Disease_Risk_Priority',
+    'Age_BMI_Interaction', 'BP_Glucose_Interaction', 'Metabolic_Stress',
+    'City_Encoded'
+]
+
+
+def high_risk_target(df):
+    """Target variable: High Risk (1) if Risk_Score >= 60 or Disease_Risk is 'Heart Risk', else 0"""
+    return ((df['Risk_Score'] >= 60) | (df['Disease_Risk'] == 'Heart Risk')).astype(int)
+
+
+def _input_scaling(scaler, n_features):
+    """
+    Mean and scale of every model input: the fitted scaler for the numeric
+    columns, identity for the appended (unscaled) one-hot columns
+    """
+    mean = np.zeros(n_features)
+    scale = np.ones(n_features)
+    mean[:len(scaler.mean_)] = scaler.mean_
+    scale[:len(scaler.scale_)] = scaler.scale_
+    return mean, scale
+
+
+def export_linear_model(model, scaler, feature_names):
+    """
+    Arrays of a fitted binary linear classifier (LogisticRegression, or
+    SGDClassifier with log loss) for numpy_inference.LinearRiskModel
+    The scaler is folded into the weights so raw features need one dot product
+    """
+    mean, scale = _input_scaling(scaler, len(feature_names))
+    coef = model.coef_[0].astype(float)
+    weights = coef / scale
+    return {
+        'model_type': np.array('linear'),
+        'feature_names': np.array(feature_names),
+        'weights': weights,
+        'bias': np.array(float(model.intercept_[0]) - float(np.dot(weights, mean))),
+        'coef': coef,
+        'intercept': np.array(float(model.intercept_[0])),
+        'mean': mean,
+        'scale': scale
+    }
+
+
+def _float_keys(values):
+    """Integer keys ordered like the float64 values (for bisection over floats)"""
+    bits = values.view(np.int64)
+    return np.where(bits < 0, -(bits & np.int64(0x7FFFFFFFFFFFFFFF)), bits)
+
+
+def _floats_from_keys(keys):
+    """Inverse of _float_keys"""
+    bits = np.where(keys < 0, (-keys) | np.int64(-0x8000000000000000), keys)
+    return bits.view(np.float64)
+
+
+def raw_thresholds(threshold, mean, scale):
+    """
+    Tree split thresholds moved from scaled into raw feature space
+    A fitted tree sends x left when float32((x - mean) / scale) <= threshold.
+    That test is monotone in x, so it equals x <= r for the largest float64 r
+    passing it. r is found by bisection around threshold * scale + mean,
+    which makes raw-space splits exactly equivalent to the scaled ones
+    """
+    def goes_left(x):
+        return ((x - mean) / scale).astype(np.float32) <= threshold
+
+    guess = threshold * scale + mean
+    delta = 1e-4 * (np.abs(guess) + scale * (np.abs(threshold) + 1))
+    low, high = guess - delta, guess + delta
+    if not (goes_left(low).all() and not goes_left(high).any()):
+        raise ValueError("Could not bracket raw split thresholds")
+
+    # Invariant: low goes left, high goes right
+    low, high = _float_keys(low), _float_keys(high)
+    while (high - low > 1).any():
+        mid = low + (high - low) // 2
+        left = goes_left(_floats_from_keys(mid))
+        low = np.where(left, mid, low)
+        high = np.where(left, high, mid)
+    return _floats_from_keys(low)
+
+
+def export_forest_model(model, scaler, feature_names):
+    """
+    Arrays of a fitted RandomForestClassifier for numpy_inference.ForestRiskModel
+    All trees are concatenated into flat node arrays; child indices are global
+    (-1 marks a leaf) and roots holds the first node of each tree. Node values
+    are stored as normalized class probabilities, as predict_proba uses them.
+    Thresholds are also stored in raw feature space, so inference needs no scaler
+    """
+    mean, scale = _input_scaling(scaler, len(feature_names))
+    trees = [estimator.tree_ for estimator in model.estimators_]
+    roots = np.cumsum([0] + [tree.node_count for tree in trees[:-1]]).astype(np.int64)
+
+    def children(tree, offset, side):
+        return np.where(side >= 0, side + offset, -1).astype(np.int64)
+
+    feature = np.concatenate([tree.feature for tree in trees]).astype(np.int64)
+    threshold = np.concatenate([tree.threshold for tree in trees])
+    split = feature >= 0
+    raw_threshold = threshold.copy()
+    raw_threshold[split] = raw_thresholds(threshold[split], mean[feature[split]], scale[feature[split]])
+    
+    value = np.concatenate([tree.value[:, 0, :] for tree in trees]).astype(float)
+    normalizer = value.sum(axis=1, keepdims=True)
+    normalizer[normalizer == 0.0] = 1.0
+
+    return {
+        'model_type': np.array('forest'),
+        'feature_names': np.array(feature_names),
+        'feature': feature,
+        'threshold': threshold,
+        'raw_threshold': raw_threshold,
+        'left': np.concatenate([children(tree, offset, tree.children_left) for tree, offset in zip(trees, roots)]),
+        'right': np.concatenate([children(tree, offset, tree.children_right) for tree, offset in zip(trees, roots)]),
+        'value': value / normalizer,
+        'roots': roots,
+        'max_depth': np.array(max(tree.max_depth for tree in trees)),
+        'mean': mean,
+        'scale': scale
+    }
+
+
+def export_model(model, scaler, feature_names):
+    """Exported arrays of a fitted LogisticRegression, SGDClassifier or RandomForestClassifier"""
+    if isinstance(model, (LogisticRegression, SGDClassifier)):
+        return export_linear_model(model, scaler, feature_names)
+    if isinstance(model, RandomForestClassifier):
+        return export_forest_model(model, scaler, feature_names)
+    raise TypeError(f"Cannot export model of type {type(model).__name__}")
+
+
+def _median_latency(predict, X, repeats):
+    """Median wall time of predict(X) in microseconds"""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        predict(X)
+        times.append(time.perf_counter() - start)
+    return float(np.median(times) * 1e6)
+
+
+def save_training_arrays(output_dir, X_train, X_test, y_train, y_test, columns,
+                         dtype='float64', scaler=None, one_hot_columns=None):
+    """
+    Write train/test matrices as .npy arrays (X_train, X_test, y_train, y_test)
+    plus metadata.json with columns, dtype, shapes and the scaler parameters
+    """
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    
+    arrays = {
+        'X_train': np.asarray(X_train, dtype=dtype),
+        'X_test': np.asarray(X_test, dtype=dtype),
+        'y_train': np.asarray(y_train, dtype=np.int8),
+        'y_test': np.asarray(y_test, dtype=np.int8)
+    }
+    for name, array in arrays.items():
+        np.save(output_path / f"{name}.npy", array)
+    
+    metadata = {
+        'format': 'npy',
+        'dtype': str(np.dtype(dtype)),
+        'columns': list(columns),
+        'target': 'target',
+        'shapes': {name: list(array.shape) for name, array in arrays.items()},
+        'files': {name: f"{name}.npy" for name in arrays}
+    }
+    if scaler is not None:
+        metadata['scaler'] = {
+            'type': type(scaler).__name__,
+            'mean': scaler.mean_.tolist(),
+            'scale': scaler.scale_.tolist()
+        }
+    if one_hot_columns:
+        metadata['one_hot'] = {
+            'columns': list(one_hot_columns),
+            'train': 'train_one_hot.npz',
+            'test': 'test_one_hot.npz'
+        }
+    with open(output_path / "metadata.json", 'w') as f:
+        json.dump(metadata, f, indent=2)
+    
+    return metadata
+
+
+def load_training_data(data_dir, mmap_mode='r'):
+    """
+    Load training data written by save_training_arrays()
+    Arrays are memory-mapped (zero-copy, read on access) unless mmap_mode=None.
+    Returns a dict with X_train, X_test, y_train, y_test, metadata and, if
+    saved, the sparse one-hot blocks X_train_one_hot / X_test_one_hot
+    """
+    data_path = Path(data_dir)
+    with open(data_path / "metadata.json", 'r') as f:
+        metadata = json.load(f)
+    
+    data = {name: np.load(data_path / filename, mmap_mode=mmap_mode)
+            for name, filename in metadata['files'].items()}
+    data['metadata'] = metadata
+    if 'one_hot' in metadata:
+        data['X_train_one_hot'] = sparse.load_npz(data_path / metadata['one_hot']['train']).tocsr()
+        data['X_test_one_hot'] = sparse.load_npz(data_path / metadata['one_hot']['test']).tocsr()
+    return data
+
+
+def _cross_validate_fold(model_name, params, X, y, X_sparse, train_idx, valid_idx):
+    """
+    Train and score one CV fold (runs in a worker process)
+    X, y and X_sparse arrive as read-only memory maps shared by all workers;
+    only the fold's rows are materialized
+    """
+    start = time.perf_counter()
+    scaler = StandardScaler()
+    X_train = scaler.fit_transform(X[train_idx])
+    X_valid = scaler.transform(X[valid_idx])
+    if X_sparse is not None:
+        X_train = sparse.hstack([sparse.csr_matrix(X_train), X_sparse[train_idx]], format='csr')
+        X_valid = sparse.hstack([sparse.csr_matrix(X_valid), X_sparse[valid_idx]], format='csr')
+    y_train, y_valid = y[train_idx], y[valid_idx]
+    prepare_seconds = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    model = MODEL_CLASSES[model_name](**params)
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    pred = model.predict(X_valid)
+    pred_proba = model.predict_proba(X_valid)[:, 1]
+    predict_seconds = time.perf_counter() - start
+    
+    return {
+        'train_size': len(train_idx),
+        'valid_size': len(valid_idx),
+        'accuracy': float(accuracy_score(y_valid, pred)),
+        'precision': float(precision_score(y_valid, pred, zero_division=0)),
+        'recall': float(recall_score(y_valid, pred, zero_division=0)),
+        'f1_score': float(f1_score(y_valid, pred, zero_division=0)),
+        'roc_auc': float(roc_auc_score(y_valid, pred_proba)) if len(np.unique(y_valid)) > 1 else None,
+        'confusion_matrix': confusion_matrix(y_valid, pred, labels=[0, 1]).tolist(),
+        'prepare_seconds': prepare_seconds,
+        'fit_seconds': fit_seconds,
+        'predict_seconds': predict_seconds
+    }
 
 class HealthcareMLPreparation:
     """
@@ -14,64 +291,98 @@ class HealthcareMLPreparation:
     Prepares data for training, tests baseline models
     """
     
-    def __init__(self, filepath):
+    def __init__(self, filepath, one_hot_features=False, vocabulary=None):
+        """
+        one_hot_features: also train on one-hot encoded City, Disease_Risk,
+        BMI_Category and Age_Group, kept as a scipy sparse block
+        vocabulary: CategoryVocabulary giving fixed one-hot columns across batches
+        """
         self.filepath = filepath
+        self.one_hot_features = one_hot_features
+        self.vocabulary = vocabulary
         self.df = None
         self.X_train = None
         self.X_test = None
         self.y_train = None
         self.y_test = None
+        self.X_one_hot = None
+        self.X_train_one_hot = None
+        self.X_test_one_hot = None
+        self.one_hot_names = []
         self.scaler = StandardScaler()
         self.model_results = {}
+        self.tuning_results = None
+        self.cv_results = None
+        self.export_results = None
+        self.online_model = None
+        self.online_results = None
         
     def load_data(self):
         """Load engineered dataset"""
-        self.df = pd.read_csv(self.filepath)
-        print(f"Dataset loaded: {self.df.shape}")
+        # Exact float parsing: features equal the computed (and online-transformed) values
+        self.df = pd.read_csv(self.filepath, float_precision='round_trip')
+        logger.info("Dataset loaded: %s", self.df.shape)
         return self.df
     
     def prepare_features_and_target(self):
         """Prepare features and target variable"""
-        print("\n=== PREPARING FEATURES AND TARGET ===")
-        
-        # Define feature columns to use
-        feature_cols = [
-            'Age', 'BMI', 'Blood_Pressure', 'Glucose',
-            'Health_Score', 'Risk_Score',
-            'BMI_Deviation', 'Glucose_BMI_Ratio',
-            'Metabolic_Health', 'Cardiovascular_Risk',
-            'Disease_Risk_Priority',
-            'Age_BMI_Interaction', 'BP_Glucose_Interaction', 'Metabolic_Stress',
-            'City_Encoded'
-        ]
+        logger.info("\n=== PREPARING FEATURES AND TARGET ===")
         
         # Select features
-        X = self.df[feature_cols].copy()
+        X = self.df[MODEL_FEATURES].copy()
         
         # Create target variable: High Risk vs Others
-        # High Risk if Risk_Score >= 60 or Disease_Risk is 'Heart Risk'
-        y = ((self.df['Risk_Score'] >= 60) | (self.df['Disease_Risk'] == 'Heart Risk')).astype(int)
+        y = high_risk_target(self.df)
         
         feature_missing = X.isnull().sum()
         if feature_missing.any():
-            print(f"Missing values in features:\n{feature_missing[feature_missing > 0]}")
+            logger.info("Missing values in features:\n%s", feature_missing[feature_missing > 0])
             X.fillna(X.median(), inplace=True)
         
-        print(f"Features shape: {X.shape}")
-        print(f"Target distribution:\n{y.value_counts()}")
-        print(f"Target class balance: {y.value_counts(normalize=True).round(4)}")
+        logger.info("Features shape: %s", X.shape)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Target distribution:\n%s", y.value_counts())
+            logger.info("Target class balance: %s", y.value_counts(normalize=True).round(4))
         
         self.X = X
         self.y = y
         
+        if self.one_hot_features:
+            self.prepare_sparse_one_hot()
+        self.feature_names = list(X.columns) + self.one_hot_names
+        
         return X, y
     
+    def set_sparse_one_hot(self, matrix, names):
+        """
+        Use one-hot encodings already computed in sparse form, e.g. from
+        HealthcareFeatureEngineering.get_sparse_one_hot(), rows aligned with the dataset
+        """
+        self.X_one_hot = sparse.csr_matrix(matrix)
+        self.one_hot_names = list(names)
+        self.one_hot_features = True
+        return self.X_one_hot
+    
+    def prepare_sparse_one_hot(self):
+        """Build the sparse one-hot block of the categorical columns"""
+        logger.info("\n=== PREPARING SPARSE ONE-HOT FEATURES ===")
+        
+        if self.X_one_hot is None:
+            self.X_one_hot, self.one_hot_names = sparse_one_hot_from_frame(self.df, self.vocabulary)
+        
+        sparse_bytes = self.X_one_hot.data.nbytes + self.X_one_hot.indices.nbytes + self.X_one_hot.indptr.nbytes
+        dense_bytes = self.X_one_hot.shape[0] * self.X_one_hot.shape[1] * 8
+        logger.info("One-hot columns: %s (non-zeros: %s)", self.X_one_hot.shape[1], self.X_one_hot.nnz)
+        logger.info("Memory: %.1f KB sparse vs %.1f KB dense float64", sparse_bytes / 1024, dense_bytes / 1024)
+        
+        return self.X_one_hot
+    
     def handle_class_imbalance(self):
         """Handle class imbalance if present"""
-        print("\n=== HANDLING CLASS IMBALANCE ===")
+        logger.info("\n=== HANDLING CLASS IMBALANCE ===")
         
         class_balance = (self.y.sum() / len(self.y)) * 100
-        print(f"High-risk samples: {self.y.sum()} ({class_balance:.2f}%)")
+        logger.info("High-risk samples: %s (%.2f%%)", self.y.sum(), class_balance)
         
         # Calculate class weights for imbalanced data
         n_samples = len(self.y)
@@ -82,29 +393,103 @@ class HealthcareMLPreparation:
         weight_negative = n_samples / (2 * n_negative) if n_negative > 0 else 1
         
         self.class_weights = {0: weight_negative, 1: weight_positive}
-        print(f"Class weights: 0={self.class_weights[0]:.3f}, 1={self.class_weights[1]:.3f}")
+        logger.info("Class weights: 0=%.3f, 1=%.3f", self.class_weights[0], self.class_weights[1])
         
         return self.class_weights
     
     def split_data(self, test_size=0.2, random_state=42):
         """Split data into train and test sets"""
-        print("\n=== SPLITTING DATA ===")
+        logger.info("\n=== SPLITTING DATA ===")
         
-        self.X_train, self.X_test, self.y_train, self.y_test = train_test_split(
-            self.X, self.y, test_size=test_size, random_state=random_state,
+        arrays = [self.X, self.y] + ([self.X_one_hot] if self.X_one_hot is not None else [])
+        splits = train_test_split(
+            *arrays, test_size=test_size, random_state=random_state,
             stratify=self.y  # Maintain class balance in splits
         )
+        self.X_train, self.X_test, self.y_train, self.y_test = splits[:4]
+        if self.X_one_hot is not None:
+            self.X_train_one_hot, self.X_test_one_hot = splits[4:]
         
-        print(f"Training set: {self.X_train.shape}")
-        print(f"Test set: {self.X_test.shape}")
-        print(f"Training set class distribution:\n{self.y_train.value_counts()}")
-        print(f"Test set class distribution:\n{self.y_test.value_counts()}")
+        logger.info("Training set: %s", self.X_train.shape)
+        logger.info("Test set: %s", self.X_test.shape)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Training set class distribution:\n%s", self.y_train.value_counts())
+            logger.info("Test set class distribution:\n%s", self.y_test.value_counts())
         
         return self.X_train, self.X_test, self.y_train, self.y_test
     
+    def cross_validate_models(self, n_splits=5, n_jobs=-1, random_state=42):
+        """
+        Stratified k-fold cross-validation of the baseline models
+        All (model, fold) fits run in a process pool. The feature matrix is
+        dumped once to a read-only memory map that every worker shares, instead
+        of being pickled into each task. Each fold fits its own scaler.
+        Reports per-fold metrics, their mean/std, and timing
+        """
+        logger.info("\n=== %s-FOLD CROSS-VALIDATION ===", n_splits)
+        
+        X = self.X.to_numpy(dtype=float)
+        y = self.y.to_numpy()
+        splitter = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+        folds = list(splitter.split(X, y))
+        
+        tasks = []
+        for model_name in ML_CONFIG['models']:
+            params = dict(ML_CONFIG[model_name])
+            # Parallelism is across folds; keep each fit single-threaded
+            if 'n_jobs' in params:
+                params['n_jobs'] = 1
+            for train_idx, valid_idx in folds:
+                tasks.append((model_name, params, train_idx, valid_idx))
+        
+        start = time.perf_counter()
+        # max_nbytes=0: memory-map every array argument (X, y, one-hot) once
+        with Parallel(n_jobs=n_jobs, max_nbytes=0, mmap_mode='r') as parallel:
+            fold_results = parallel(
+                delayed(_cross_validate_fold)(model_name, params, X, y, self.X_one_hot, train_idx, valid_idx)
+                for model_name, params, train_idx, valid_idx in tasks
+            )
+        wall_seconds = time.perf_counter() - start
+        
+        metrics = ['accuracy', 'precision', 'recall', 'f1_score', 'roc_auc']
+        results = {}
+        for i, model_name in enumerate(ML_CONFIG['models']):
+            model_folds = fold_results[i * n_splits:(i + 1) * n_splits]
+            summary = {}
+            for metric in metrics:
+                values = [fold[metric] for fold in model_folds if fold[metric] is not None]
+                summary[metric] = {
+                    'mean': float(np.mean(values)) if values else None,
+                    'std': float(np.std(values)) if values else None
+                }
+            results[model_name] = {
+                'folds': [{'fold': k + 1, **fold} for k, fold in enumerate(model_folds)],
+                'summary': summary,
+                'total_fit_seconds': float(sum(fold['fit_seconds'] for fold in model_folds))
+            }
+            logger.info("%s: accuracy %.4f (+/- %.4f)", model_name,
+                        summary['accuracy']['mean'], summary['accuracy']['std'])
+        
+        task_seconds = sum(fold['prepare_seconds'] + fold['fit_seconds'] + fold['predict_seconds']
+                           for fold in fold_results)
+        self.cv_results = {
+            'n_splits': n_splits,
+            'n_jobs': effective_n_jobs(n_jobs),
+            'models': results,
+            'timing': {
+                'wall_seconds': round(wall_seconds, 4),
+                'sum_task_seconds': round(task_seconds, 4),
+                'parallel_speedup': round(task_seconds / wall_seconds, 3) if wall_seconds > 0 else None
+            }
+        }
+        log_event(logger, 'cross_validation_timing', "Cross-validation wall time: %.2fs (sum of fold times %.2fs)",
+                  wall_seconds, task_seconds, wall_seconds=wall_seconds, sum_task_seconds=task_seconds)
+        
+        return self.cv_results
+    
     def scale_features(self):
         """Scale numeric features"""
-        print("\n=== SCALING FEATURES ===")
+        logger.info("\n=== SCALING FEATURES ===")
         
         # Fit scaler on training data
         self.X_train_scaled = self.scaler.fit_transform(self.X_train)
@@ -122,66 +507,65 @@ class HealthcareMLPreparation:
             index=self.X_test.index
         )
         
-        print(f"Features scaled using StandardScaler")
-        print(f"Training set - Mean: {self.X_train_scaled.mean():.4f}, Std: {self.X_train_scaled.std():.4f}")
-        print(f"Test set - Mean: {self.X_test_scaled.mean():.4f}, Std: {self.X_test_scaled.std():.4f}")
+        logger.info("Features scaled using StandardScaler")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Training set - Mean: %.4f, Std: %.4f", self.X_train_scaled.mean(), self.X_train_scaled.std())
+            logger.info("Test set - Mean: %.4f, Std: %.4f", self.X_test_scaled.mean(), self.X_test_scaled.std())
+        
+        # One-hot columns are already 0/1: append them unscaled, still sparse
+        if self.X_train_one_hot is not None:
+            self.X_train_scaled = sparse.hstack([sparse.csr_matrix(self.X_train_scaled), self.X_train_one_hot], format='csr')
+            self.X_test_scaled = sparse.hstack([sparse.csr_matrix(self.X_test_scaled), self.X_test_one_hot], format='csr')
+            logger.info("Appended %s sparse one-hot columns", self.X_train_one_hot.shape[1])
         
         return self.X_train_scaled, self.X_test_scaled
     
     def train_baseline_models(self):
         """Train baseline ML models for risk prediction"""
-        print("\n=== TRAINING BASELINE MODELS ===")
+        logger.info("\n=== TRAINING BASELINE MODELS ===")
         
         models = {}
         results = {}
         
         # Model 1: Logistic Regression
-        print("\n--- Logistic Regression ---")
-        lr_model = LogisticRegression(
-            class_weight='balanced',
-            max_iter=1000,
-            random_state=42
-        )
+        logger.info("\n--- Logistic Regression ---")
+        lr_model = LogisticRegression(**ML_CONFIG['logistic_regression'])
         lr_model.fit(self.X_train_scaled, self.y_train)
         lr_pred = lr_model.predict(self.X_test_scaled)
         lr_pred_proba = lr_model.predict_proba(self.X_test_scaled)[:, 1]
         
         lr_accuracy = accuracy_score(self.y_test, lr_pred)
-        print(f"Accuracy: {lr_accuracy:.4f}")
-        print(f"Classification Report:\n{classification_report(self.y_test, lr_pred)}")
+        logger.info("Accuracy: %.4f", lr_accuracy)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Classification Report:\n%s", classification_report(self.y_test, lr_pred))
         
         models['logistic_regression'] = lr_model
         results['logistic_regression'] = {
             'accuracy': float(lr_accuracy),
             'predictions': lr_pred.tolist(),
             'probabilities': lr_pred_proba.tolist(),
-            'feature_importance': dict(zip(self.X_train.columns, lr_model.coef_[0]))
+            'feature_importance': dict(zip(self.feature_names, lr_model.coef_[0]))
         }
         
         # Model 2: Random Forest
-        print("\n--- Random Forest ---")
-        rf_model = RandomForestClassifier(
-            n_estimators=100,
-            max_depth=10,
-            class_weight='balanced',
-            random_state=42,
-            n_jobs=-1
-        )
+        logger.info("\n--- Random Forest ---")
+        rf_model = RandomForestClassifier(**ML_CONFIG['random_forest'])
         rf_model.fit(self.X_train_scaled, self.y_train)
         rf_pred = rf_model.predict(self.X_test_scaled)
         rf_pred_proba = rf_model.predict_proba(self.X_test_scaled)[:, 1]
         
         rf_accuracy = accuracy_score(self.y_test, rf_pred)
-        print(f"Accuracy: {rf_accuracy:.4f}")
-        print(f"Classification Report:\n{classification_report(self.y_test, rf_pred)}")
+        logger.info("Accuracy: %.4f", rf_accuracy)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Classification Report:\n%s", classification_report(self.y_test, rf_pred))
         
         # Feature importance
-        feature_importance = dict(zip(self.X_train.columns, rf_model.feature_importances_))
+        feature_importance = dict(zip(self.feature_names, rf_model.feature_importances_))
         feature_importance_sorted = dict(sorted(feature_importance.items(), key=lambda x: x[1], reverse=True))
         
-        print(f"\nTop 10 Important Features:")
+        logger.info("\nTop 10 Important Features:")
         for i, (feat, imp) in enumerate(list(feature_importance_sorted.items())[:10], 1):
-            print(f"{i}. {feat}: {imp:.4f}")
+            logger.info("%s. %s: %.4f", i, feat, imp)
         
         models['random_forest'] = rf_model
         results['random_forest'] = {
@@ -194,16 +578,208 @@ class HealthcareMLPreparation:
         self.models = models
         self.model_results = results
         
-        print(f"\n--- Model Comparison ---")
-        print(f"Logistic Regression Accuracy: {lr_accuracy:.4f}")
-        print(f"Random Forest Accuracy: {rf_accuracy:.4f}")
-        print(f"Best Model: {'Random Forest' if rf_accuracy > lr_accuracy else 'Logistic Regression'}")
+        logger.info("\n--- Model Comparison ---")
+        logger.info("Logistic Regression Accuracy: %.4f", lr_accuracy)
+        logger.info("Random Forest Accuracy: %.4f", rf_accuracy)
+        logger.info("Best Model: %s", 'Random Forest' if rf_accuracy > lr_accuracy else 'Logistic Regression')
         
         return models, results
     
+    def tune_hyperparameters(self):
+        """
+        Search model hyperparameters with parallel successive halving
+        (settings and search space from ML_CONFIG['tuning']), then refit the
+        best configuration on the full training set
+        """
+        tuning = ML_CONFIG['tuning']
+        tuner = SuccessiveHalvingTuner(
+            search_space={name: tuning['search_space'][name] for name in ML_CONFIG['models']},
+            base_params={name: ML_CONFIG[name] for name in ML_CONFIG['models']},
+            scoring=tuning['scoring'],
+            halving_factor=tuning['halving_factor'],
+            min_samples=tuning['min_samples'],
+            cv_folds=tuning['cv_folds'],
+            n_jobs=tuning['n_jobs'],
+            time_budget_seconds=tuning['time_budget_seconds']
+        )
+        tuner.fit(self.X_train.to_numpy(), self.y_train.to_numpy(), self.X_train_one_hot)
+        
+        tuned_model = tuner.build_best_model()
+        tuned_model.fit(self.X_train_scaled, self.y_train)
+        tuned_pred = tuned_model.predict(self.X_test_scaled)
+        tuned_pred_proba = tuned_model.predict_proba(self.X_test_scaled)[:, 1]
+        
+        tuned_accuracy = accuracy_score(self.y_test, tuned_pred)
+        logger.info("Tuned %s - Test Accuracy: %.4f", tuner.best_model_name, tuned_accuracy)
+        
+        self.models['tuned'] = tuned_model
+        self.model_results['tuned'] = {
+            'model': tuner.best_model_name,
+            'params': tuner.best_params,
+            'accuracy': float(tuned_accuracy),
+            'predictions': tuned_pred.tolist(),
+            'probabilities': tuned_pred_proba.tolist()
+        }
+        self.tuning_results = tuner.results
+        
+        return tuned_model, tuner.results
+    
+    def train_online(self, batch_size=None):
+        """
+        Train the online model (SGD logistic regression with a running scaler,
+        settings from ML_CONFIG['online_training']) by streaming the training
+        set in batches, as new patient batches would arrive, then evaluate it
+        """
+        logger.info("\n=== ONLINE TRAINING (PARTIAL_FIT) ===")
+        
+        settings = ML_CONFIG['online_training']
+        batch_size = batch_size or settings['batch_size']
+        online = OnlineRiskModel(
+            list(self.X_train.columns),
+            alpha=settings['alpha'],
+            refit_every_batches=settings['refit_every_batches'],
+            refit_epochs=settings['refit_epochs'],
+            history_rows=settings['history_rows'],
+            random_state=settings['random_state']
+        )
+        for start in range(0, len(self.X_train), batch_size):
+            online.partial_fit(self.X_train.iloc[start:start + batch_size],
+                               self.y_train.iloc[start:start + batch_size])
+        
+        online_pred = online.predict(self.X_test)
+        online_pred_proba = online.predict_proba(self.X_test)[:, 1]
+        online_accuracy = accuracy_score(self.y_test, online_pred)
+        summary = online.get_summary()
+        logger.info("Batches: %s of up to %s rows, refits: %s", summary['batches_seen'], batch_size, summary['refits'])
+        logger.info("Mean update time: %.2f ms per batch", summary['mean_update_seconds'] * 1000)
+        logger.info("Online SGD - Test Accuracy: %.4f", online_accuracy)
+        
+        self.online_model = online
+        self.model_results[ONLINE_MODEL_NAME] = {
+            'accuracy': float(online_accuracy),
+            'predictions': online_pred.tolist(),
+            'probabilities': online_pred_proba.tolist(),
+            'feature_importance': dict(zip(online.feature_names, online.model.coef_[0]))
+        }
+        self.online_results = {'batch_size': batch_size, **summary}
+        
+        return online, self.online_results
+    
+    def get_raw_features(self, split='test'):
+        """Unscaled train or test features (including one-hot columns) as exported models take them"""
+        X, X_one_hot = (self.X_test, self.X_test_one_hot) if split == 'test' else (self.X_train, self.X_train_one_hot)
+        if X is not None:
+            X = X.to_numpy(dtype=float)
+        else:
+            # Loaded with load_saved_training_data(): undo the scaling of the numeric columns
+            X_scaled = self.X_test_scaled if split == 'test' else self.X_train_scaled
+            n_scaled = len(self.scaler.mean_)
+            X_scaled = X_scaled[:, :n_scaled].toarray() if sparse.issparse(X_scaled) else X_scaled
+            X = self.scaler.inverse_transform(np.asarray(X_scaled, dtype=float))
+        if X_one_hot is not None:
+            X = np.hstack([X, X_one_hot.toarray()])
+        return X
+    
+    def export_inference_models(self, output_dir):
+        """
+        Export every trained model to a NumPy-only format (<model>.npz) that
+        backend/numpy_inference.py evaluates on raw features without scikit-learn
+        or a separate scaling pass. Equivalence with scikit-learn (scaler +
+        predict_proba) is checked on the train and test sets
+        """
+        logger.info("\n=== EXPORTING NUMPY INFERENCE MODELS ===")
+        
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+        X_raw = {'train': self.get_raw_features('train'), 'test': self.get_raw_features('test')}
+        X_scaled = {'train': self.X_train_scaled, 'test': self.X_test_scaled}
+        
+        # (model, scaler, feature names, scikit-learn probabilities of a split)
+        candidates = {
+            name: (model, self.scaler, self.feature_names,
+                   lambda split, model=model: model.predict_proba(X_scaled[split]))
+            for name, model in self.models.items()
+        }
+        if self.online_model is not None:
+            online = self.online_model
+            candidates[ONLINE_MODEL_NAME] = (online.model, online.scaler, online.feature_names,
+                                        lambda split: online.predict_proba(X_raw[split][:, :len(online.feature_names)]))
+        
+        exports = {}
+        for name, (model, scaler, feature_names, expected_proba) in candidates.items():
+            model_path = output_path / f"{name}.npz"
+            np.savez(model_path, **export_model(model, scaler, feature_names))
+            
+            exported = load_risk_model(model_path)
+            equivalence = {}
+            for split in ('train', 'test'):
+                proba = exported.predict_proba(X_raw[split][:, :len(feature_names)])
+                expected = expected_proba(split)
+                equivalence[split] = {
+                    'max_abs_probability_diff': float(np.abs(proba - expected).max()),
+                    'prediction_mismatches': int((proba.argmax(axis=1) != expected.argmax(axis=1)).sum())
+                }
+            exports[name] = {
+                'path': str(model_path),
+                'size_bytes': model_path.stat().st_size,
+                'equivalence': equivalence
+            }
+            logger.info("%s: %s (%.1f KB), max probability difference vs scikit-learn: %.2e, "
+                        "prediction mismatches: %d", name, model_path.name, exports[name]['size_bytes'] / 1024,
+                        max(e['max_abs_probability_diff'] for e in equivalence.values()),
+                        sum(e['prediction_mismatches'] for e in equivalence.values()))
+        
+        if self.online_model is not None:
+            # Training state for update_online_model(): later batches continue this model
+            state_path = self.online_model.save(online_state_path(output_path))
+            logger.info("Online model training state saved to: %s", state_path)
+        
+        self.export_results = {'models': exports}
+        return exports
+    
+    def benchmark_exported_models(self, output_dir, batch_size=1000, repeats=200):
+        """
+        Single-row and batch prediction latency of the exported NumPy models
+        against scikit-learn (scaler transform + predict_proba), median microseconds
+        """
+        logger.info("\n=== NUMPY VS SCIKIT-LEARN INFERENCE LATENCY ===")
+        
+        X_raw = self.get_raw_features('test')
+        X_batch = np.resize(X_raw, (batch_size, X_raw.shape[1]))
+        n_scaled = len(self.scaler.mean_)
+        
+        def sklearn_predict(model):
+            def predict(X):
+                X_scaled = self.scaler.transform(pd.DataFrame(X[:, :n_scaled], columns=self.X.columns))
+                if X.shape[1] > n_scaled:
+                    X_scaled = sparse.hstack([sparse.csr_matrix(X_scaled), sparse.csr_matrix(X[:, n_scaled:])], format='csr')
+                return model.predict_proba(X_scaled)
+            return predict
+        
+        results = {}
+        for name, model in self.models.items():
+            exported = load_risk_model(Path(output_dir) / f"{name}.npz")
+            results[name] = {
+                'single_row_us': {
+                    'sklearn': _median_latency(sklearn_predict(model), X_raw[:1], repeats),
+                    'numpy': _median_latency(exported.predict_proba, X_raw[:1], repeats)
+                },
+                f'batch_{batch_size}_us': {
+                    'sklearn': _median_latency(sklearn_predict(model), X_batch, max(repeats // 10, 1)),
+                    'numpy': _median_latency(exported.predict_proba, X_batch, max(repeats // 10, 1))
+                }
+            }
+            for mode, timing in results[name].items():
+                logger.info("%s %s: scikit-learn %.0f us, numpy %.0f us (%.1fx)", name, mode,
+                            timing['sklearn'], timing['numpy'], timing['sklearn'] / timing['numpy'])
+        
+        if self.export_results is not None:
+            self.export_results['latency'] = results
+        return results
+    
     def get_model_prediction_example(self, model_name='random_forest', sample_size=10):
         """Get example predictions with probabilities"""
-        print(f"\n=== EXAMPLE PREDICTIONS ({model_name.upper()}) ===")
+        logger.info("\n=== EXAMPLE PREDICTIONS (%s) ===", model_name.upper())
         
         model = self.models[model_name]
         probabilities = self.model_results[model_name]['probabilities']
@@ -228,9 +804,9 @@ class HealthcareMLPreparation:
     
     def prepare_ml_dataset(self):
         """Execute full ML preparation pipeline"""
-        print("="*60)
-        print("HEALTHCARE ML DATA PREPARATION")
-        print("="*60)
+        logger.info("="*60)
+        logger.info("HEALTHCARE ML DATA PREPARATION")
+        logger.info("="*60)
         
         self.load_data()
         self.prepare_features_and_target()
@@ -238,19 +814,77 @@ class HealthcareMLPreparation:
         self.split_data()
         self.scale_features()
         self.train_baseline_models()
-        
-        print("\n" + "="*60)
-        print("ML PREPARATION COMPLETE")
-        print("="*60)
+        if ML_CONFIG['cross_validation']['enabled']:
+            self.cross_validate_models(
+                n_splits=ML_CONFIG['cross_validation']['n_splits'],
+                n_jobs=ML_CONFIG['cross_validation']['n_jobs']
+            )
+        if ML_CONFIG['tuning']['enabled']:
+            self.tune_hyperparameters()
+        if ML_CONFIG['online_training']['enabled']:
+            self.train_online()
+        
+        logger.info("\n" + "="*60)
+        logger.info("ML PREPARATION COMPLETE")
+        logger.info("="*60)
         
         return self.X_train_scaled, self.X_test_scaled, self.y_train, self.y_test
     
-    def save_preparation_report(self, output_path):
-        """Save ML preparation report"""
+    def get_summary_metrics(self, model_name):
+        """Test-set summary metrics of a model (no per-sample arrays)"""
+        pred = np.asarray(self.model_results[model_name]['predictions'])
+        proba = np.asarray(self.model_results[model_name]['probabilities'])
+        return {
+            'accuracy': float(accuracy_score(self.y_test, pred)),
+            'precision': float(precision_score(self.y_test, pred, zero_division=0)),
+            'recall': float(recall_score(self.y_test, pred, zero_division=0)),
+            'f1_score': float(f1_score(self.y_test, pred, zero_division=0)),
+            'roc_auc': float(roc_auc_score(self.y_test, proba)) if self.y_test.nunique() > 1 else None,
+            'confusion_matrix': confusion_matrix(self.y_test, pred, labels=[0, 1]).tolist()
+        }
+    
+    def save_predictions(self, output_path):
+        """
+        Save per-sample test predictions as a structured .npy array
+        (row, patient_id, actual, <model>_prediction, <model>_probability per model),
+        which can be memory-mapped with np.load(path, mmap_mode='r')
+        """
+        fields = [('row', np.int64), ('patient_id', np.int64), ('actual', np.int8)]
+        for model_name in self.model_results:
+            fields += [(f'{model_name}_prediction', np.int8), (f'{model_name}_probability', np.float64)]
+        
+        predictions = np.zeros(len(self.y_test), dtype=fields)
+        predictions['row'] = self.y_test.index
+        predictions['patient_id'] = self.df.loc[self.y_test.index, 'Patient_ID']
+        predictions['actual'] = self.y_test
+        for model_name, results in self.model_results.items():
+            predictions[f'{model_name}_prediction'] = results['predictions']
+            predictions[f'{model_name}_probability'] = results['probabilities']
+        
+        np.save(output_path, predictions)
+        logger.info("Per-sample predictions saved to: %s", output_path)
+        return output_path
+    
+    def save_preparation_report(self, output_path, predictions_path=None):
+        """
+        Save ML preparation report
+        The JSON keeps summary metrics only; per-sample predictions and
+        probabilities go to a binary sidecar (ml_predictions.npy next to the report)
+        """
+        predictions_path = Path(predictions_path or Path(output_path).with_name("ml_predictions.npy"))
+        self.save_predictions(predictions_path)
+        
+        model_results = {}
+        for model_name, results in self.model_results.items():
+            model_results[model_name] = {
+                **{key: val for key, val in results.items() if key not in ('predictions', 'probabilities')},
+                **self.get_summary_metrics(model_name)
+            }
+        
         report = {
             'dataset_info': {
                 'total_samples': len(self.df),
-                'feature_count': len(self.X.columns),
+                'feature_count': len(self.feature_names),
                 'target_variable': 'High Risk (1) vs Low Risk (0)'
             },
             'train_test_split': {
@@ -260,42 +894,98 @@ class HealthcareMLPreparation:
                 'test_positive_class': int(self.y_test.sum())
             },
             'class_weights': self.class_weights,
-            'model_results': self.model_results,
-            'features_used': list(self.X.columns)
+            'model_results': model_results,
+            'predictions_file': predictions_path.name,
+            'features_used': self.feature_names
         }
+        if self.cv_results is not None:
+            report['cross_validation'] = self.cv_results
+        if self.tuning_results is not None:
+            report['hyperparameter_tuning'] = self.tuning_results
+        if self.online_results is not None:
+            report['online_training'] = self.online_results
+        if self.export_results is not None:
+            report['inference_export'] = self.export_results
         
         with open(output_path, 'w') as f:
             json.dump(report, f, indent=2, default=str)
         
-        print(f"\nML preparation report saved to: {output_path}")
+        logger.info("\nML preparation report saved to: %s", output_path)
         return output_path
     
-    def save_training_data(self, output_dir):
-        """Save training data in different formats"""
+    def save_training_data(self, output_dir, dtype=None, write_csv=None):
+        """
+        Save scaled train/test data as memory-mappable .npy arrays plus
+        metadata.json (columns, dtype, scaler); see load_training_data()
+        dtype: 'float32' or 'float64' (default from ML_CONFIG['training_data'])
+        write_csv: also write train_scaled.csv / test_scaled.csv
+        """
+        settings = ML_CONFIG['training_data']
+        dtype = dtype or settings['dtype']
+        write_csv = settings['write_csv'] if write_csv is None else write_csv
+        
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
         
-        # Save scaled training data
-        train_data = pd.DataFrame(
-            self.X_train_scaled,
-            columns=self.X_train.columns
-        )
-        train_data['target'] = self.y_train.values
-        train_data.to_csv(output_path / "train_scaled.csv", index=False)
-        
-        # Save scaled test data
-        test_data = pd.DataFrame(
-            self.X_test_scaled,
-            columns=self.X_test.columns
+        save_training_arrays(
+            output_path, self.X_train_scaled_df, self.X_test_scaled_df, self.y_train, self.y_test,
+            columns=self.X_train_scaled_df.columns, dtype=dtype, scaler=self.scaler,
+            one_hot_columns=self.one_hot_names if self.X_train_one_hot is not None else None
         )
-        test_data['target'] = self.y_test.values
-        test_data.to_csv(output_path / "test_scaled.csv", index=False)
         
-        print(f"\nTraining data saved to: {output_path}")
+        if write_csv:
+            # Save scaled training data
+            train_data = self.X_train_scaled_df.reset_index(drop=True)
+            train_data['target'] = self.y_train.values
+            train_data.to_csv(output_path / "train_scaled.csv", index=False)
+            
+            # Save scaled test data
+            test_data = self.X_test_scaled_df.reset_index(drop=True)
+            test_data['target'] = self.y_test.values
+            test_data.to_csv(output_path / "test_scaled.csv", index=False)
+        
+        # Sparse one-hot blocks stay sparse on disk
+        if self.X_train_one_hot is not None:
+            sparse.save_npz(output_path / "train_one_hot.npz", self.X_train_one_hot)
+            sparse.save_npz(output_path / "test_one_hot.npz", self.X_test_one_hot)
+            with open(output_path / "one_hot_columns.json", 'w') as f:
+                json.dump(self.one_hot_names, f, indent=2)
+        
+        logger.info("\nTraining data saved to: %s (%s .npy)", output_path, np.dtype(dtype))
         return output_path
-
+    
+    def load_saved_training_data(self, data_dir):
+        """
+        Use training data saved by save_training_data() as the scaled train/test
+        sets, memory-mapped, e.g. to retrain or evaluate with train_baseline_models()
+        without rerunning the CSV pipeline
+        """
+        logger.info("\n=== LOADING SAVED TRAINING DATA ===")
+        
+        data = load_training_data(data_dir)
+        metadata = data['metadata']
+        self.X_train_scaled, self.X_test_scaled = data['X_train'], data['X_test']
+        self.y_train = pd.Series(data['y_train'], name='target')
+        self.y_test = pd.Series(data['y_test'], name='target')
+        self.one_hot_names = metadata.get('one_hot', {}).get('columns', [])
+        self.feature_names = metadata['columns'] + self.one_hot_names
+        
+        if 'scaler' in metadata:
+            self.scaler.mean_ = np.array(metadata['scaler']['mean'])
+            self.scaler.scale_ = np.array(metadata['scaler']['scale'])
+            self.scaler.var_ = self.scaler.scale_ ** 2
+            self.scaler.n_features_in_ = len(metadata['columns'])
+        
+        if 'X_train_one_hot' in data:
+            self.X_train_one_hot, self.X_test_one_hot = data['X_train_one_hot'], data['X_test_one_hot']
+            self.X_train_scaled = sparse.hstack([sparse.csr_matrix(self.X_train_scaled), self.X_train_one_hot], format='csr')
+            self.X_test_scaled = sparse.hstack([sparse.csr_matrix(self.X_test_scaled), self.X_test_one_hot], format='csr')
+        
+        logger.info("Training set: %s, test set: %s (%s)", self.X_train_scaled.shape, self.X_test_scaled.shape, metadata['dtype'])
+        return self.X_train_scaled, self.X_test_scaled, self.y_train, self.y_test
 
 if __name__ == "__main__":
+    configure_logging()
     # Initialize ML preparation
     data_path = Path(__file__).parent.parent / "data" / "healthcare_data_engineered.csv"
     ml_prep = HealthcareMLPreparation(str(data_path))
@@ -303,14 +993,19 @@ if __name__ == "__main__":
     # Prepare data and train models
     ml_prep.prepare_ml_dataset()
     
-    # Save reports
-    report_path = Path(__file__).parent.parent / "data" / "ml_preparation_report.json"
-    ml_prep.save_preparation_report(str(report_path))
-    
     # Save training data
     train_data_dir = Path(__file__).parent.parent / "data" / "ml_training_data"
     ml_prep.save_training_data(str(train_data_dir))
     
+    # Export NumPy-only inference models and compare their latency with scikit-learn
+    models_dir = Path(__file__).parent.parent / "backend" / "models"
+    ml_prep.export_inference_models(str(models_dir))
+    ml_prep.benchmark_exported_models(str(models_dir))
+    
+    # Save reports (after the export, so they include its inference_export section)
+    report_path = Path(__file__).parent.parent / "data" / "ml_preparation_report.json"
+    ml_prep.save_preparation_report(str(report_path))
+    
     # Get example predictions
     examples = ml_prep.get_model_prediction_example('random_forest', sample_size=5)
     print("\n=== Example Predictions ===")
@@ -0,0 +1,210 @@
+import numpy as np
+import math
+import time
+from joblib import Parallel, delayed, effective_n_jobs
+from scipy import sparse
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import get_scorer
+from sklearn.model_selection import ParameterGrid, StratifiedKFold, train_test_split
+from sklearn.preprocessing import StandardScaler
+
+from pipeline_logging import get_logger
+
+logger = get_logger(__name__)
+
+# Estimators that can be tuned, by ML_CONFIG model name
+MODEL_CLASSES = {
+    'logistic_regression': LogisticRegression,
+    'random_forest': RandomForestClassifier
+}
+
+
+def _evaluate_candidate(model_name, params, fold, scoring):
+    """Fit one candidate on one cached, preprocessed fold and score it (runs in a worker)"""
+    X_train, y_train, X_valid, y_valid = fold
+    model = MODEL_CLASSES[model_name](**params)
+
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+
+    return get_scorer(scoring)(model, X_valid, y_valid), fit_seconds
+
+
+class SuccessiveHalvingTuner:
+    """
+    Parallel hyperparameter search with successive halving
+    - Every candidate starts on a small stratified sample of the training data;
+      after each rung only the best 1/halving_factor survive and get
+      halving_factor times more samples, so bad configurations stop early
+    - (candidate, fold) fits run in parallel across cores with joblib
+    - The fitted scaler and scaled arrays of each fold are computed once per
+      rung and shared by all candidates
+    - The search stops at the wall-clock budget; the best candidate of the last
+      completed rung is selected
+    """
+
+    def __init__(self, search_space, base_params, scoring='roc_auc', halving_factor=3,
+                 min_samples=50, cv_folds=3, n_jobs=-1, time_budget_seconds=None, random_state=42):
+        self.search_space = search_space
+        self.base_params = base_params
+        self.scoring = scoring
+        self.halving_factor = halving_factor
+        self.min_samples = min_samples
+        self.cv_folds = cv_folds
+        self.n_jobs = n_jobs
+        self.time_budget_seconds = time_budget_seconds
+        self.random_state = random_state
+        self.best_model_name = None
+        self.best_params = None
+        self.results = {}
+
+    def get_candidates(self):
+        """All (model name, params) combinations of the search space"""
+        candidates = []
+        for model_name, grid in self.search_space.items():
+            for params in ParameterGrid(grid):
+                candidate_params = {**self.base_params.get(model_name, {}), **params}
+                # Parallelism is across candidates; keep each fit single-threaded
+                if 'n_jobs' in candidate_params:
+                    candidate_params['n_jobs'] = 1
+                candidates.append({'model': model_name, 'params': candidate_params})
+        return candidates
+
+    def get_schedule(self, n_candidates, n_samples):
+        """Training samples per rung, growing by halving_factor up to the full training set"""
+        eta = self.halving_factor
+        rungs_for_candidates = 1 + math.ceil(math.log(max(n_candidates, 1), eta))
+        rungs_for_samples = 1 + int(math.log(max(n_samples / self.min_samples, 1), eta))
+        n_rungs = max(1, min(rungs_for_candidates, rungs_for_samples))
+        return [
+            int(min(n_samples, n_samples / eta ** (n_rungs - 1 - rung)))
+            for rung in range(n_rungs)
+        ]
+
+    def _prepare_folds(self, X, y, X_sparse, n_rung_samples):
+        """
+        Stratified sample of the rung with its CV folds, each scaled with a
+        scaler fitted on the fold's training part (the preprocessing cache)
+        """
+        indices = np.arange(len(y))
+        if n_rung_samples < len(y):
+            indices, _ = train_test_split(
+                indices, train_size=n_rung_samples, stratify=y, random_state=self.random_state
+            )
+
+        n_splits = min(self.cv_folds, int(np.bincount(y[indices]).min()))
+        if n_splits < 2:
+            raise ValueError(f"Not enough samples per class for cross-validation at {n_rung_samples} samples")
+        splitter = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=self.random_state)
+
+        folds = []
+        for train_idx, valid_idx in splitter.split(indices, y[indices]):
+            train_idx, valid_idx = indices[train_idx], indices[valid_idx]
+            scaler = StandardScaler().fit(X[train_idx])
+            X_train, X_valid = scaler.transform(X[train_idx]), scaler.transform(X[valid_idx])
+            if X_sparse is not None:
+                X_train = sparse.hstack([sparse.csr_matrix(X_train), X_sparse[train_idx]], format='csr')
+                X_valid = sparse.hstack([sparse.csr_matrix(X_valid), X_sparse[valid_idx]], format='csr')
+            folds.append((X_train, y[train_idx], X_valid, y[valid_idx]))
+        return folds
+
+    def fit(self, X, y, X_sparse=None):
+        """
+        Run the search on unscaled training features X (and optional sparse
+        one-hot block X_sparse) with binary target y
+        """
+        logger.info("\n=== HYPERPARAMETER TUNING (SUCCESSIVE HALVING) ===")
+
+        start = time.perf_counter()
+        deadline = start + self.time_budget_seconds if self.time_budget_seconds else math.inf
+        X = np.asarray(X, dtype=float)
+        y = np.asarray(y, dtype=int)
+        X_sparse = sparse.csr_matrix(X_sparse) if X_sparse is not None else None
+
+        candidates = self.get_candidates()
+        schedule = self.get_schedule(len(candidates), len(y))
+        logger.info("Candidates: %s, rungs: %s, samples per rung: %s", len(candidates), len(schedule), schedule)
+
+        rungs = []
+        survivors = candidates
+        budget_exhausted = False
+        with Parallel(n_jobs=self.n_jobs) as parallel:
+            for rung, n_rung_samples in enumerate(schedule):
+                rung_start = time.perf_counter()
+                folds = self._prepare_folds(X, y, X_sparse, n_rung_samples)
+                tasks = [(c, fold) for c in survivors for fold in folds]
+
+                # Dispatch in waves so the budget is checked while the rung runs
+                wave_size = effective_n_jobs(self.n_jobs) * len(folds)
+                outputs = []
+                for i in range(0, len(tasks), wave_size):
+                    if time.perf_counter() >= deadline:
+                        budget_exhausted = True
+                        break
+                    outputs.extend(parallel(
+                        delayed(_evaluate_candidate)(c['model'], c['params'], fold, self.scoring)
+                        for c, fold in tasks[i:i + wave_size]
+                    ))
+                if budget_exhausted:
+                    logger.info("Time budget reached during rung %s", rung + 1)
+                    break
+
+                scored = []
+                for j, candidate in enumerate(survivors):
+                    fold_outputs = outputs[j * len(folds):(j + 1) * len(folds)]
+                    scores = [score for score, _ in fold_outputs]
+                    scored.append({
+                        **candidate,
+                        'score': float(np.nanmean(scores)) if not np.all(np.isnan(scores)) else float('-inf'),
+                        'fit_seconds': float(sum(fit for _, fit in fold_outputs))
+                    })
+                scored.sort(key=lambda c: c['score'], reverse=True)
+
+                rungs.append({
+                    'rung': rung + 1,
+                    'n_samples': n_rung_samples,
+                    'n_candidates': len(survivors),
+                    'n_folds': len(folds),
+                    'elapsed_seconds': round(time.perf_counter() - rung_start, 4),
+                    'candidates': scored
+                })
+                logger.info("Rung %d: %d candidates on %d samples, best %s = %.4f (%s)", rung + 1,
+                            len(survivors), n_rung_samples, self.scoring, scored[0]['score'], scored[0]['model'])
+
+                survivors = scored[:max(1, math.ceil(len(scored) / self.halving_factor))]
+
+        if rungs:
+            best = rungs[-1]['candidates'][0]
+            self.best_model_name, self.best_params = best['model'], best['params']
+        else:
+            # Budget too small for a single rung: fall back to the configured baseline
+            self.best_model_name = next(iter(self.search_space))
+            self.best_params = dict(self.base_params.get(self.best_model_name, {}))
+
+        self.results = {
+            'scoring': self.scoring,
+            'n_candidates': len(candidates),
+            'halving_factor': self.halving_factor,
+            'schedule': schedule,
+            'time_budget_seconds': self.time_budget_seconds,
+            'elapsed_seconds': round(time.perf_counter() - start, 4),
+            'budget_exhausted': budget_exhausted,
+            'best_model': self.best_model_name,
+            'best_params': self.best_params,
+            'best_score': rungs[-1]['candidates'][0]['score'] if rungs else None,
+            'rungs': rungs
+        }
+
+        logger.info("Best: %s %s", self.best_model_name, self.best_params)
+        logger.info("Tuning time: %.2fs", self.results['elapsed_seconds'])
+        return self
+
+    def build_best_model(self):
+        """Unfitted estimator with the selected hyperparameters"""
+        params = dict(self.best_params)
+        base_n_jobs = self.base_params.get(self.best_model_name, {}).get('n_jobs')
+        if base_n_jobs is not None:
+            params['n_jobs'] = base_n_jobs
+        return MODEL_CLASSES[self.best_model_name](**params)
@@ -0,0 +1,292 @@
+import pandas as pd
+import numpy as np
+import argparse
+import time
+from collections import deque
+from pathlib import Path
+from sklearn.linear_model import SGDClassifier
+from sklearn.preprocessing import StandardScaler
+
+# Name of the exported online model (models/online_sgd.npz)
+ONLINE_MODEL_NAME = 'online_sgd'
+
+
+def online_state_path(models_dir):
+    """
+    Training state of the online model: kept in a subdirectory, so the
+    exported models in models_dir stay the only .npz files there
+    """
+    return Path(models_dir) / "training_state" / f"{ONLINE_MODEL_NAME}.npz"
+
+
+class OnlineRiskModel:
+    """
+    Incrementally trained risk model (logistic regression fitted with SGD)
+    - Each batch updates a running StandardScaler and the classifier with
+      partial_fit, in time proportional to the batch size
+    - Class weights are 'balanced' from running class counts
+    - Every refit_every_batches batches the scaler and classifier are refitted
+      from scratch on the retained history (the last history_rows rows). This
+      guards against drift and re-aligns the weights with the current scaler,
+      whose mean and scale move as batches arrive
+    save() / load() persist the full training state (classifier, running
+    scaler, class counts, refit history), so later batches continue the
+    same model instead of retraining it
+    """
+
+    def __init__(self, feature_names, alpha=0.0001, refit_every_batches=50, refit_epochs=5,
+                 history_rows=1_000_000, random_state=42):
+        self.feature_names = list(feature_names)
+        self.alpha = alpha
+        self.refit_every_batches = refit_every_batches
+        self.refit_epochs = refit_epochs
+        self.history_rows = history_rows
+        self.random_state = random_state
+        self.scaler = StandardScaler()
+        self.model = self._new_model()
+        self.class_counts = np.zeros(2, dtype=np.int64)
+        self.history = deque()
+        self.history_size = 0
+        self.batches_seen = 0
+        self.rows_seen = 0
+        self.refits = 0
+        self.update_log = []
+
+    def _new_model(self, max_iter=1000):
+        return SGDClassifier(loss='log_loss', alpha=self.alpha, max_iter=max_iter,
+                             tol=None, random_state=self.random_state)
+
+    def _sample_weight(self, y):
+        """'balanced' class weights from the running class counts"""
+        counts = np.maximum(self.class_counts, 1)
+        weights = counts.sum() / (2 * counts)
+        return weights[y]
+
+    def _prepare(self, X):
+        """Feature matrix as float; missing values get the running feature mean"""
+        X = np.array(X[self.feature_names] if isinstance(X, pd.DataFrame) else X, dtype=float)
+        missing = np.isnan(X)
+        if missing.any() and hasattr(self.scaler, 'mean_'):
+            X[missing] = np.take(self.scaler.mean_, np.nonzero(missing)[1])
+        return X
+
+    def _remember(self, X, y):
+        """Keep the batch for periodic refits, dropping the oldest rows beyond history_rows"""
+        self.history.append((X, y))
+        self.history_size += len(y)
+        while self.history_size - len(self.history[0][1]) >= self.history_rows:
+            self.history_size -= len(self.history.popleft()[1])
+
+    def partial_fit(self, X, y):
+        """
+        Update the model with one batch of rows (DataFrame with feature_names
+        columns, or array) and binary target y
+        Returns the update statistics of the batch
+        """
+        start = time.perf_counter()
+        X = self._prepare(X)
+        y = np.asarray(y, dtype=int)
+
+        self.class_counts += np.bincount(y, minlength=2)
+        self.scaler.partial_fit(X)
+        self.model.partial_fit(self.scaler.transform(X), y, classes=[0, 1],
+                               sample_weight=self._sample_weight(y))
+        self._remember(X, y)
+        self.batches_seen += 1
+        self.rows_seen += len(y)
+        update_seconds = time.perf_counter() - start
+
+        refit_seconds = None
+        if self.refit_every_batches and self.batches_seen % self.refit_every_batches == 0:
+            refit_seconds = self.refit()
+
+        stats = {
+            'batch': self.batches_seen,
+            'rows': len(y),
+            'update_seconds': update_seconds,
+            'refit_seconds': refit_seconds
+        }
+        self.update_log.append(stats)
+        return stats
+
+    def refit(self):
+        """Refit scaler and classifier from scratch on the retained history"""
+        start = time.perf_counter()
+        X = np.concatenate([X for X, _ in self.history])
+        y = np.concatenate([y for _, y in self.history])
+
+        self.scaler = StandardScaler().fit(X)
+        model = self._new_model(max_iter=self.refit_epochs)
+        model.fit(self.scaler.transform(X), y, sample_weight=self._sample_weight(y))
+        self.model = model
+        self.refits += 1
+        return time.perf_counter() - start
+
+    def save(self, path):
+        """Save the training state as .npz (plain arrays, no pickles)"""
+        if not hasattr(self.model, 'coef_'):
+            raise ValueError("Online model has not been trained yet")
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        n_features = len(self.feature_names)
+        np.savez(
+            path,
+            feature_names=np.array(self.feature_names),
+            alpha=np.array(self.alpha),
+            refit_every_batches=np.array(self.refit_every_batches),
+            refit_epochs=np.array(self.refit_epochs),
+            history_rows=np.array(self.history_rows),
+            random_state=np.array(-1 if self.random_state is None else self.random_state),
+            coef=self.model.coef_,
+            intercept=self.model.intercept_,
+            t=np.array(self.model.t_),
+            scaler_mean=self.scaler.mean_,
+            scaler_var=self.scaler.var_,
+            scaler_scale=self.scaler.scale_,
+            scaler_samples=np.asarray(self.scaler.n_samples_seen_),
+            class_counts=self.class_counts,
+            history_X=np.concatenate([X for X, _ in self.history]) if self.history else np.zeros((0, n_features)),
+            history_y=np.concatenate([y for _, y in self.history]) if self.history else np.zeros(0, dtype=int),
+            history_batch_rows=np.array([len(y) for _, y in self.history], dtype=np.int64),
+            batches_seen=np.array(self.batches_seen),
+            rows_seen=np.array(self.rows_seen),
+            refits=np.array(self.refits),
+            log_batch=np.array([stats['batch'] for stats in self.update_log], dtype=np.int64),
+            log_rows=np.array([stats['rows'] for stats in self.update_log], dtype=np.int64),
+            log_update_seconds=np.array([stats['update_seconds'] for stats in self.update_log], dtype=float),
+            log_refit_seconds=np.array([np.nan if stats['refit_seconds'] is None else stats['refit_seconds']
+                                        for stats in self.update_log], dtype=float)
+        )
+        return path
+
+    @classmethod
+    def load(cls, path):
+        """Load a model saved with save(); partial_fit continues where it stopped"""
+        with np.load(path, allow_pickle=False) as arrays:
+            state = {key: arrays[key] for key in arrays.files}
+        random_state = int(state['random_state'])
+        online = cls(
+            [str(name) for name in state['feature_names']],
+            alpha=float(state['alpha']),
+            refit_every_batches=int(state['refit_every_batches']),
+            refit_epochs=int(state['refit_epochs']),
+            history_rows=int(state['history_rows']),
+            random_state=None if random_state < 0 else random_state
+        )
+        n_features = len(online.feature_names)
+
+        # Fitted attributes partial_fit reads (the classifier does not average)
+        online.model.classes_ = np.array([0, 1])
+        online.model.coef_ = state['coef']
+        online.model.intercept_ = state['intercept']
+        online.model.t_ = float(state['t'])
+        online.model.n_features_in_ = n_features
+        online.scaler.mean_ = state['scaler_mean']
+        online.scaler.var_ = state['scaler_var']
+        online.scaler.scale_ = state['scaler_scale']
+        # NumPy scalar, or per-feature counts if the scaler has seen missing values
+        online.scaler.n_samples_seen_ = state['scaler_samples'][()]
+        online.scaler.n_features_in_ = n_features
+
+        online.class_counts = state['class_counts'].astype(np.int64)
+        boundaries = np.cumsum(state['history_batch_rows'])[:-1]
+        online.history = deque(zip(np.split(state['history_X'], boundaries), np.split(state['history_y'], boundaries)))
+        online.history_size = int(state['history_batch_rows'].sum())
+        online.batches_seen = int(state['batches_seen'])
+        online.rows_seen = int(state['rows_seen'])
+        online.refits = int(state['refits'])
+        online.update_log = [
+            {'batch': int(batch), 'rows': int(rows), 'update_seconds': float(update),
+             'refit_seconds': None if np.isnan(refit) else float(refit)}
+            for batch, rows, update, refit in zip(state['log_batch'], state['log_rows'],
+                                                  state['log_update_seconds'], state['log_refit_seconds'])
+        ]
+        return online
+
+    def predict_proba(self, X):
+        return self.model.predict_proba(self.scaler.transform(self._prepare(X)))
+
+    def predict(self, X):
+        return self.model.predict(self.scaler.transform(self._prepare(X)))
+
+    def get_summary(self):
+        """Training summary: rows, batches, refits and update times"""
+        update_times = [stats['update_seconds'] for stats in self.update_log]
+        refit_times = [stats['refit_seconds'] for stats in self.update_log if stats['refit_seconds'] is not None]
+        return {
+            'rows_seen': self.rows_seen,
+            'batches_seen': self.batches_seen,
+            'history_rows': self.history_size,
+            'refits': self.refits,
+            'mean_update_seconds': float(np.mean(update_times)) if update_times else None,
+            'mean_update_seconds_per_row': float(np.sum(update_times) / self.rows_seen) if self.rows_seen else None,
+            'mean_refit_seconds': float(np.mean(refit_times)) if refit_times else None
+        }
+
+
+def update_online_model(batch, models_dir, batch_size=None):
+    """
+    Continue the served online model with a new batch of patients
+    batch: engineered rows (DataFrame or CSV path with the columns of
+    healthcare_data_engineered.csv). Loads the saved training state, runs
+    partial_fit over the new rows only (in batches of batch_size, default
+    ML_CONFIG['online_training']['batch_size']), saves the state and re-exports
+    models_dir/online_sgd.npz for the API (picked up on /api/reload)
+    Returns the summary of the updated model
+    """
+    # ml_preparation imports this module
+    from ml_preparation import ML_CONFIG, high_risk_target
+
+    state_path = online_state_path(models_dir)
+    if not state_path.exists():
+        raise FileNotFoundError(f"No online model state at {state_path}; run the pipeline with "
+                                f"ML_CONFIG['online_training']['enabled'] = True first")
+    df = pd.read_csv(batch) if isinstance(batch, (str, Path)) else batch
+    batch_size = batch_size or ML_CONFIG['online_training']['batch_size']
+
+    online = OnlineRiskModel.load(state_path)
+    X, y = df[online.feature_names], high_risk_target(df)
+    for start in range(0, len(df), batch_size):
+        online.partial_fit(X.iloc[start:start + batch_size], y.iloc[start:start + batch_size])
+
+    export_online_model(online, models_dir)
+    return online.get_summary()
+
+
+def export_online_model(online, models_dir):
+    """Save the training state and export the model for the API (models_dir/online_sgd.npz)"""
+    from ml_preparation import export_model
+
+    online.save(online_state_path(models_dir))
+    model_path = Path(models_dir) / f"{ONLINE_MODEL_NAME}.npz"
+    np.savez(model_path, **export_model(online.model, online.scaler, online.feature_names))
+    return model_path
+
+
+if __name__ == "__main__":
+    from pipeline_logging import configure_logging
+    from ml_preparation import HealthcareMLPreparation
+
+    parser = argparse.ArgumentParser(description="Train the online risk model, or update it with a new batch")
+    parser.add_argument('--update', metavar='CSV', default=None,
+                        help="Engineered rows of new patients: partial_fit the saved model on them and re-export it")
+    parser.add_argument('--models-dir', default=str(Path(__file__).parent.parent / "backend" / "models"),
+                        help="Exported model directory (default: backend/models)")
+    parser.add_argument('--batch-size', type=int, default=None)
+    args = parser.parse_args()
+    configure_logging()
+
+    if args.update:
+        summary = update_online_model(args.update, args.models_dir, args.batch_size)
+        print(f"Online model updated: {summary['rows_seen']} rows in {summary['batches_seen']} batches, "
+              f"{summary['refits']} refits -> {Path(args.models_dir) / (ONLINE_MODEL_NAME + '.npz')}")
+    else:
+        # Stream the training split through a new online model in small batches and export it
+        data_path = Path(__file__).parent.parent / "data" / "healthcare_data_engineered.csv"
+        ml_prep = HealthcareMLPreparation(str(data_path))
+        ml_prep.load_data()
+        ml_prep.prepare_features_and_target()
+        ml_prep.split_data()
+        ml_prep.scale_features()
+        online, _ = ml_prep.train_online(batch_size=args.batch_size or 10)
+        print(f"Online model exported to: {export_online_model(online, args.models_dir)}")
@@ -0,0 +1,283 @@
+import pandas as pd
+import numpy as np
+import os
+import json
+import time
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+from data_cleaning import HealthcareDataCleaner
+from feature_engineering import HealthcareFeatureEngineering
+from category_vocabulary import CategoryVocabulary
+from pipeline_logging import configure_logging, get_logger, quiet_logging
+
+logger = get_logger(__name__)
+
+# Temporary column that restores the original row order after partitioning
+ROW_ORDER_COLUMN = '__row_order__'
+
+
+def _process_partition(task):
+    """
+    Clean and engineer one partition (runs in a worker process)
+    Returns the engineered partition, its cleaning report, per-city KPI statistics
+    and (sparse encoding) its one-hot codes
+    """
+    partition, fill_values, vocabulary, categorical_encoding = task
+
+    # Per-partition output would interleave across workers (and is not formatted at all)
+    with quiet_logging():
+        cleaner = HealthcareDataCleaner(None)
+        cleaner.df = partition
+        cleaner.apply_cleaning_steps(fill_values)
+
+        fe = HealthcareFeatureEngineering(None, categorical_encoding, vocabulary)
+        fe.df = cleaner.df
+        fe.create_row_features()
+
+    city_statistics = {
+        city: HealthcareFeatureEngineering.aggregate_kpi_statistics(group)
+        for city, group in fe.df.groupby('City', sort=False)
+    }
+    return fe.df, cleaner.get_cleaning_report(), city_statistics, fe.one_hot_codes
+
+
+class PartitionedHealthcarePipeline:
+    """
+    Partition-parallel execution of the row-level pipeline stages
+    Shards the raw dataset by City (or by a hash of Patient_ID) and runs
+    cleaning and feature engineering for each shard in a process pool.
+    Global statistics are handled in the driver:
+    - Cleaning medians are computed once over the full dataset
+    - Categories are encoded against one shared CategoryVocabulary
+    - KPIs are merged from additive per-partition sums and counts
+    """
+
+    def __init__(self, filepath, n_workers=None, partition_by='City', n_partitions=None,
+                 categorical_encoding='dense', vocabulary=None):
+        if partition_by not in ('City', 'Patient_ID'):
+            raise ValueError(f"partition_by must be 'City' or 'Patient_ID', got {partition_by!r}")
+        self.filepath = filepath
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.partition_by = partition_by
+        self.n_partitions = n_partitions
+        self.categorical_encoding = categorical_encoding
+        self.vocabulary = vocabulary or CategoryVocabulary()
+        self.df = None
+        self.cleaner = None
+        self.fill_values = None
+        self.feature_engineer = None
+        self.cleaning_report = {}
+        self.city_kpis = {}
+        self.timings = {}
+
+    def load_data(self):
+        """Load raw dataset from CSV"""
+        self.df = pd.read_csv(self.filepath)
+        logger.info("Dataset loaded: %d rows, %d columns", *self.df.shape)
+        return self.df
+
+    def create_partitions(self, df):
+        """Split the dataset into shards by City or by hash of Patient_ID"""
+        df = df.assign(**{ROW_ORDER_COLUMN: np.arange(len(df))})
+
+        if self.partition_by == 'City':
+            return [group for _, group in df.groupby('City', sort=True, dropna=False)]
+
+        n_partitions = self.n_partitions or self.n_workers
+        shard = pd.util.hash_array(df['Patient_ID'].to_numpy()) % n_partitions
+        return [df[shard == i] for i in range(n_partitions) if (shard == i).any()]
+
+    def _align_partitions(self, frames):
+        """
+        Concatenate engineered partitions back into one dataset
+        Partitions only create one-hot columns for the categories they contain,
+        so missing columns are filled with False and each one-hot block is put
+        back into the column order of a single full-dataset run
+        """
+        one_hot = {col for frame in frames for col, dtype in frame.dtypes.items() if dtype == bool}
+        df = pd.concat(frames, ignore_index=True, sort=False)
+
+        columns = []
+        for col in df.columns:
+            if col not in one_hot:
+                columns.append(col)
+            elif col not in columns:
+                prefix = col.split('_', 1)[0] + '_'
+                block = [c for c in df.columns if c in one_hot and c.startswith(prefix)]
+                # Age groups are ordered categoricals; other dummies are sorted by category
+                columns.extend(block if prefix == 'AgeGroup_' else sorted(block))
+
+        for col in one_hot:
+            df[col] = df[col].eq(True)
+
+        df = df[columns].sort_values(ROW_ORDER_COLUMN, kind='stable')
+        return df.drop(columns=ROW_ORDER_COLUMN).reset_index(drop=True)
+
+    def _merge_one_hot_codes(self, frames, partition_codes):
+        """
+        One-hot codes of the sparse encoding in the row order of the aligned dataset
+        Every partition encodes against the shared vocabulary, so the categories agree
+        """
+        row_order = np.argsort(np.concatenate([frame[ROW_ORDER_COLUMN].to_numpy() for frame in frames]),
+                               kind='stable')
+        merged = {}
+        for column, (_, categories) in partition_codes[0].items():
+            codes = np.concatenate([np.asarray(codes[column][0]) for codes in partition_codes])
+            merged[column] = (codes[row_order], categories)
+        return merged
+
+    def _merge_cleaning_reports(self, reports):
+        """Sum the per-partition cleaning counters"""
+        merged = {}
+        for report in reports:
+            for key, val in report.items():
+                if isinstance(val, dict):
+                    merged_val = merged.setdefault(key, {})
+                    for col, count in val.items():
+                        if col != ROW_ORDER_COLUMN:
+                            merged_val[col] = merged_val.get(col, 0) + int(count)
+                else:
+                    merged[key] = merged.get(key, 0) + int(val)
+        return merged
+
+    def run(self):
+        """Execute cleaning and feature engineering over all partitions"""
+        logger.info("="*60)
+        logger.info("PARTITIONED PIPELINE (%s, %d workers)", self.partition_by, self.n_workers)
+        logger.info("="*60)
+
+        start = time.perf_counter()
+        if self.df is None:
+            self.load_data()
+
+        # Global statistics, computed once over the full dataset
+        self.cleaner = HealthcareDataCleaner(self.filepath)
+        self.cleaner.df = self.df
+        self.cleaner.get_initial_statistics()
+        fill_values = self.cleaner.compute_fill_values()
+        self.fill_values = fill_values
+
+        partitions = self.create_partitions(self.df)
+        # Learn cities that survive cleaning (same classes as a full-dataset run)
+        # unless the vocabulary already has them
+        valid_age = self.df['Age'].fillna(fill_values['missing']['Age']).between(0, 100)
+        self.vocabulary.learn('City', self.df.loc[valid_age, 'City'])
+        self.timings['prepare_seconds'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        tasks = [(partition, fill_values, self.vocabulary, self.categorical_encoding) for partition in partitions]
+        if self.n_workers == 1:
+            results = [_process_partition(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=self.n_workers) as pool:
+                results = list(pool.map(_process_partition, tasks))
+        self.timings['partition_seconds'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        frames, reports, city_statistics, one_hot_codes = zip(*results)
+        self.cleaning_report = self.cleaner.cleaning_report
+        self.cleaning_report.update(self._merge_cleaning_reports(reports))
+
+        self.feature_engineer = HealthcareFeatureEngineering(self.filepath, self.categorical_encoding, self.vocabulary)
+        if self.categorical_encoding == 'sparse':
+            self.feature_engineer.one_hot_codes = self._merge_one_hot_codes(frames, one_hot_codes)
+        self.feature_engineer.df = self._align_partitions(frames)
+
+        # Merge KPI statistics per city, then over all cities
+        per_city = {}
+        for stats in city_statistics:
+            for city, city_stats in stats.items():
+                per_city.setdefault(city, []).append(city_stats)
+        per_city = {city: HealthcareFeatureEngineering.merge_kpi_statistics(stats)
+                    for city, stats in per_city.items()}
+        totals = HealthcareFeatureEngineering.merge_kpi_statistics(per_city.values())
+        self.feature_engineer.calculate_kpis(totals, per_city)
+        self.city_kpis = self.feature_engineer.kpis['city_kpis']
+        self.timings['merge_seconds'] = time.perf_counter() - start
+
+        logger.info("\nPartitions processed: %d", len(partitions))
+        logger.info("Final dataset: %s", self.feature_engineer.df.shape)
+
+        return self.feature_engineer.df
+
+    def get_cleaned_data(self):
+        """Cleaned dataset (original columns of the engineered dataset)"""
+        return self.feature_engineer.df[list(self.df.columns)]
+
+    def get_sparse_one_hot(self):
+        """Merged sparse one-hot block (see HealthcareFeatureEngineering.get_sparse_one_hot)"""
+        return self.feature_engineer.get_sparse_one_hot()
+
+    def save_cleaned_data(self, output_path):
+        """Save cleaned dataset"""
+        self.get_cleaned_data().to_csv(output_path, index=False)
+        logger.info("\nCleaned data saved to: %s", output_path)
+        return output_path
+
+    def save_engineered_data(self, output_path):
+        """Save engineered dataset"""
+        return self.feature_engineer.save_engineered_data(output_path)
+
+    def save_kpi_report(self, output_path):
+        """Save merged KPI report (including per-city KPIs) as JSON"""
+        return self.feature_engineer.save_kpi_report(output_path)
+
+    def get_cleaning_report(self):
+        """Get merged cleaning report"""
+        return self.cleaning_report
+
+    def benchmark_scaling(self, worker_counts=(1, 2, 4, 8)):
+        """
+        Time the partitioned run at several worker counts
+        Returns wall time, speedup and parallel efficiency relative to one worker
+        """
+        logger.info("\n=== PARTITION SCALING BENCHMARK ===")
+
+        if self.df is None:
+            self.load_data()
+
+        results = []
+        baseline = None
+        for n_workers in worker_counts:
+            runner = PartitionedHealthcarePipeline(
+                self.filepath, n_workers=n_workers,
+                partition_by=self.partition_by, n_partitions=self.n_partitions,
+                categorical_encoding=self.categorical_encoding, vocabulary=self.vocabulary
+            )
+            runner.df = self.df
+            with quiet_logging():
+                start = time.perf_counter()
+                runner.run()
+                elapsed = time.perf_counter() - start
+
+            baseline = baseline or elapsed
+            results.append({
+                'workers': n_workers,
+                'wall_seconds': round(elapsed, 4),
+                'rows_per_second': round(len(self.df) / elapsed, 1),
+                'speedup': round(baseline / elapsed, 3),
+                'efficiency': round(baseline / elapsed / n_workers, 3),
+                'stage_seconds': {key: round(val, 4) for key, val in runner.timings.items()}
+            })
+            logger.info("%d workers: %.3fs (speedup %.2fx)", n_workers, elapsed, baseline / elapsed)
+
+        return {
+            'rows': len(self.df),
+            'partition_by': self.partition_by,
+            'cpu_count': os.cpu_count(),
+            'results': results
+        }
+
+
+if __name__ == "__main__":
+    configure_logging()
+    data_dir = Path(__file__).parent.parent / "data"
+    pipeline = PartitionedHealthcarePipeline(str(data_dir / "healthcare_data.csv"))
+
+    # Scaling report at 1, 2, 4 and 8 workers
+    scaling = pipeline.benchmark_scaling()
+    report_path = data_dir / "partition_scaling_report.json"
+    with open(report_path, 'w') as f:
+        json.dump(scaling, f, indent=2)
+    print(f"Scaling report saved to: {report_path}")
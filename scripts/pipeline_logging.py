@@ -0,0 +1,145 @@
+import contextlib
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+try:
+    from config import LOGGING_CONFIG
+except ImportError:
+    # Script run directly: config.py lives in backend/
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+    from config import LOGGING_CONFIG
+
+ROOT_LOGGER = 'healthcare'
+
+# Relative log paths are resolved against backend/ (where config.py lives)
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+
+# Row dump settings of the current configuration (see configure_logging)
+_row_dumps = {'limit': LOGGING_CONFIG.get('row_dump_limit', 20), 'file': None}
+
+# Library default: stage modules log nothing (and create no log file) until an
+# entry point (run_pipeline.main, a script's __main__ block) calls configure_logging()
+logging.getLogger(ROOT_LOGGER).addHandler(logging.NullHandler())
+
+
+class ConsoleHandler(logging.StreamHandler):
+    """Writes to the current sys.stdout, so contextlib.redirect_stdout still captures pipeline output"""
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+class StructuredFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, event, message and the event's fields"""
+
+    def format(self, record):
+        entry = {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(record.created)),
+            'level': record.levelname,
+            'logger': record.name,
+            'event': getattr(record, 'event', None),
+            'message': record.getMessage()
+        }
+        entry.update(getattr(record, 'fields', {}))
+        return json.dumps(entry, default=str)
+
+
+def _resolve(path):
+    path = Path(path)
+    return path if path.is_absolute() else BACKEND_DIR / path
+
+
+def configure_logging(level=None, quiet=None, log_file=None, structured=None,
+                      row_dump_limit=None, row_dump_file=None):
+    """
+    Configure the pipeline loggers from LOGGING_CONFIG (arguments override it)
+    Called by entry points only; importing a pipeline module has no side effects
+    - Console: plain messages on stdout, like the previous print output
+    - log_file: records as JSON lines (structured) or in LOGGING_CONFIG['format']
+    - quiet: only warnings and errors; nothing below is formatted, and row
+      dumps and summary tables are skipped entirely
+    - row_dump_limit: rows of invalid-record dumps shown in the log;
+      row_dump_file: CSV sidecar receiving all dumped rows (appended across runs)
+    """
+    config = LOGGING_CONFIG
+    quiet = config.get('quiet', False) if quiet is None else quiet
+    level = logging.WARNING if quiet else getattr(logging, str(level or config.get('level', 'INFO')).upper())
+    log_file = config.get('file') if log_file is None else log_file
+    structured = config.get('structured', True) if structured is None else structured
+
+    logger = logging.getLogger(ROOT_LOGGER)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+    logger.setLevel(level)
+    logger.propagate = False
+
+    console = ConsoleHandler()
+    console.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(console)
+
+    if log_file:
+        log_path = _resolve(log_file)
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        file_handler = logging.FileHandler(log_path)
+        file_handler.setFormatter(StructuredFormatter() if structured else logging.Formatter(config['format']))
+        logger.addHandler(file_handler)
+
+    row_dump_file = config.get('row_dump_file') if row_dump_file is None else row_dump_file
+    _row_dumps['limit'] = config.get('row_dump_limit', 20) if row_dump_limit is None else row_dump_limit
+    _row_dumps['file'] = _resolve(row_dump_file) if row_dump_file else None
+    return logger
+
+
+def get_logger(name):
+    """Logger of a pipeline module (child of the healthcare logger)"""
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+def log_event(logger, event, message, *args, level=logging.INFO, **fields):
+    """Log a message (lazily %-formatted) tagged with an event name and structured fields"""
+    if logger.isEnabledFor(level):
+        logger.log(level, message, *args, extra={'event': event, 'fields': fields})
+
+
+def log_rows(logger, event, title, rows, columns):
+    """
+    Dump of row-level records (e.g. invalid values): at most row_dump_limit
+    rows are formatted into the log; all rows go to the row dump sidecar CSV
+    if one is configured. Nothing is sliced or formatted when INFO is disabled
+    """
+    if not logger.isEnabledFor(logging.INFO) or len(rows) == 0:
+        return
+    limit = _row_dumps['limit']
+    if limit:
+        shown = rows[columns].head(limit)
+        log_event(logger, event, "%s (%d of %d):\n%s", title, len(shown), len(rows), shown,
+                  rows=len(rows))
+    if _row_dumps['file'] is not None:
+        path = _row_dumps['file']
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Long format (ids, column, value), so dumps of different columns share one file
+        ids = [col for col in ('Patient_ID', 'Name') if col in columns]
+        dump = rows[columns].melt(id_vars=ids, var_name='column', value_name='value')
+        dump.insert(0, 'event', event)
+        dump.to_csv(path, mode='a', header=not path.exists(), index=False)
+
+
+@contextlib.contextmanager
+def quiet_logging():
+    """Temporarily log warnings and errors only (e.g. in partition worker processes)"""
+    logger = logging.getLogger(ROOT_LOGGER)
+    previous = logger.level
+    logger.setLevel(logging.WARNING)
+    try:
+        yield
+    finally:
+        logger.setLevel(previous)
@@ -0,0 +1,152 @@
+import pandas as pd
+import contextlib
+import functools
+import json
+import os
+import time
+import tracemalloc
+from pathlib import Path
+
+
+class PipelineProfiler:
+    """
+    Per-stage instrumentation of the pipeline classes
+    - instrument(obj) wraps every public method of a pipeline object
+      (handle_missing_values, create_risk_score, calculate_kpis,
+      train_baseline_models, ...); span(name) times an arbitrary block
+    - Each call records wall time, CPU time, rows of obj.df before and after,
+      and (with trace_memory) the net allocation and the allocation peak
+    - Calls nest: clean_data contains handle_missing_values etc.; the summary
+      separates a stage's own (self) time from time spent in nested stages
+    - save_trace() writes Chrome trace / Perfetto JSON (chrome://tracing,
+      ui.perfetto.dev)
+    Memory tracing (tracemalloc) slows Python-level allocation noticeably;
+    wall times are most accurate with trace_memory=False
+    """
+
+    def __init__(self, trace_memory=True):
+        self.trace_memory = trace_memory
+        self.events = []
+        self._stack = []
+        self._origin = time.perf_counter()
+
+    def _rows(self, obj):
+        df = getattr(obj, 'df', None)
+        return len(df) if isinstance(df, pd.DataFrame) else None
+
+    @contextlib.contextmanager
+    def span(self, name, obj=None):
+        """Record one timed block (a stage call) named name"""
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        frame = {'children_wall': 0.0, 'peak': 0}
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            # The enclosing stages keep the peak reached so far; this stage starts a new one
+            for parent in self._stack:
+                parent['peak'] = max(parent['peak'], peak)
+            tracemalloc.reset_peak()
+            frame['memory_start'] = current
+        self._stack.append(frame)
+
+        rows_in = self._rows(obj)
+        cpu_start = time.process_time()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - start
+            cpu = time.process_time() - cpu_start
+            self._stack.pop()
+            args = {
+                'cpu_ms': round(cpu * 1000, 3),
+                'self_ms': round((wall - frame['children_wall']) * 1000, 3),
+                'rows_in': rows_in,
+                'rows_out': self._rows(obj)
+            }
+            if self.trace_memory:
+                current, peak = tracemalloc.get_traced_memory()
+                frame['peak'] = max(frame['peak'], peak)
+                args['alloc_delta_bytes'] = current - frame['memory_start']
+                args['alloc_peak_bytes'] = frame['peak'] - frame['memory_start']
+                if self._stack:
+                    self._stack[-1]['peak'] = max(self._stack[-1]['peak'], frame['peak'])
+            if self._stack:
+                self._stack[-1]['children_wall'] += wall
+
+            self.events.append({
+                'name': name,
+                'ph': 'X',
+                'ts': round((start - self._origin) * 1e6, 1),
+                'dur': round(wall * 1e6, 1),
+                'pid': os.getpid(),
+                'tid': 0,
+                'args': args
+            })
+
+    def instrument(self, obj, methods=None):
+        """
+        Wrap the public methods of obj (or the given method names) so that
+        every call, including calls between its own methods, is recorded
+        """
+        cls_name = type(obj).__name__
+        if methods is None:
+            methods = [
+                name for name in dir(type(obj))
+                if not name.startswith('_') and callable(getattr(type(obj), name))
+                and not isinstance(type(obj).__dict__.get(name), (staticmethod, classmethod))
+            ]
+        for name in methods:
+            method = getattr(obj, name)
+
+            @functools.wraps(method)
+            def wrapper(*args, _method=method, _name=f"{cls_name}.{name}", **kwargs):
+                with self.span(_name, obj):
+                    return _method(*args, **kwargs)
+
+            setattr(obj, name, wrapper)
+        return obj
+
+    def summary(self):
+        """Per-stage totals (calls, wall, self, CPU, peak allocation), slowest self time first"""
+        totals = {}
+        for event in self.events:
+            entry = totals.setdefault(event['name'], {
+                'name': event['name'], 'calls': 0, 'wall_ms': 0.0, 'self_ms': 0.0, 'cpu_ms': 0.0,
+                'rows_in': event['args']['rows_in'], 'rows_out': None, 'alloc_peak_bytes': 0
+            })
+            entry['calls'] += 1
+            entry['wall_ms'] += event['dur'] / 1000
+            entry['self_ms'] += event['args']['self_ms']
+            entry['cpu_ms'] += event['args']['cpu_ms']
+            entry['rows_out'] = event['args']['rows_out']
+            entry['alloc_peak_bytes'] = max(entry['alloc_peak_bytes'], event['args'].get('alloc_peak_bytes', 0))
+        return sorted(totals.values(), key=lambda entry: entry['self_ms'], reverse=True)
+
+    def print_summary(self, limit=25):
+        """Summary table of the slowest stages by self time"""
+        rows = self.summary()
+        total_self = sum(entry['self_ms'] for entry in rows) or 1.0
+        print("\n=== PIPELINE PROFILE (by self time) ===")
+        print(f"{'Stage':<52}{'Calls':>6}{'Self ms':>11}{'%':>7}{'Wall ms':>11}{'CPU ms':>11}"
+              f"{'Rows in':>10}{'Rows out':>10}{'Peak MB':>9}")
+        for entry in rows[:limit]:
+            rows_in = '' if entry['rows_in'] is None else entry['rows_in']
+            rows_out = '' if entry['rows_out'] is None else entry['rows_out']
+            print(f"{entry['name'][:51]:<52}{entry['calls']:>6}{entry['self_ms']:>11.1f}"
+                  f"{entry['self_ms'] / total_self * 100:>6.1f}%{entry['wall_ms']:>11.1f}{entry['cpu_ms']:>11.1f}"
+                  f"{rows_in:>10}{rows_out:>10}{entry['alloc_peak_bytes'] / 1024 ** 2:>9.1f}")
+        return rows
+
+    def save_trace(self, output_path):
+        """Write the recorded calls as Chrome trace JSON"""
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'w') as f:
+            json.dump({'traceEvents': self.events, 'displayTimeUnit': 'ms'}, f)
+        print(f"Pipeline trace saved to: {output_path}")
+        return output_path
+
+    def stop(self):
+        """Stop memory tracing"""
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
@@ -0,0 +1,103 @@
+"""
+The single-row FeatureTransform of the API matches the batch pipeline
+(HealthcareDataCleaner + HealthcareFeatureEngineering) bit for bit, on the
+shipped raw dataset plus rows with missing, invalid and unknown values
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "scripts"))
+sys.path.insert(0, str(ROOT / "backend"))
+
+from data_cleaning import HealthcareDataCleaner  # noqa: E402
+from feature_engineering import HealthcareFeatureEngineering, ONE_HOT_COLUMNS  # noqa: E402
+from category_vocabulary import CategoryVocabulary  # noqa: E402
+from ml_preparation import MODEL_FEATURES  # noqa: E402
+from feature_transform import FeatureTransform  # noqa: E402
+
+RAW_DATA = ROOT / "backend" / "data" / "healthcare_data.csv"
+
+# Raw rows on top of the shipped data: missing values, values the cleaning
+# replaces, category boundaries, and categories outside the vocabularies
+EXTRA_ROWS = [
+    (9001, np.nan, np.nan, np.nan, np.nan, 'Diabetes', 'Delhi'),
+    (9002, 52.0, -3.0, 400.0, -10.0, 'Normal', 'Mumbai'),
+    (9003, 61.0, 31.0, 40.0, 95.0, 'Asthma', 'Atlantis'),
+    (9004, 0.0, 18.5, 120.0, 100.0, 'Hypertension', None),
+    (9005, 100.0, 24.9, 140.0, 126.0, 'Cancer', 'Pune'),
+    (9006, 18.0, 25.0, 60.0, 300.0, 'Heart Risk', 'Delhi'),
+    (9007, 150.0, 22.0, 110.0, 90.0, 'Normal', 'Delhi'),
+]
+
+
+@pytest.fixture(scope='module')
+def batch(tmp_path_factory):
+    """Batch pipeline output for the raw rows, with the transform the pipeline would save"""
+    raw = pd.read_csv(RAW_DATA)
+    extra = pd.DataFrame(EXTRA_ROWS, columns=['Patient_ID', 'Age', 'BMI', 'Blood_Pressure', 'Glucose',
+                                              'Disease_Risk', 'City'])
+    extra['Name'] = 'Extra Patient'
+    raw = pd.concat([raw, extra[raw.columns]], ignore_index=True)
+
+    data_dir = tmp_path_factory.mktemp("data")
+    raw.to_csv(data_dir / "healthcare_data.csv", index=False)
+    cleaner = HealthcareDataCleaner(str(data_dir / "healthcare_data.csv"))
+    cleaner.clean_data()
+    cleaner.save_cleaned_data(str(data_dir / "healthcare_data_cleaned.csv"))
+
+    # City vocabulary of the shipped data only, so 'Atlantis' is an unknown city
+    vocabulary = CategoryVocabulary()
+    vocabulary.learn('City', pd.read_csv(RAW_DATA)['City'])
+    fe = HealthcareFeatureEngineering(str(data_dir / "healthcare_data_cleaned.csv"), vocabulary=vocabulary)
+    engineered = fe.engineer_features()
+
+    one_hot = {
+        column: {'prefix': prefix, 'categories': vocabulary.categories(column)}
+        for column, prefix in ONE_HOT_COLUMNS.items()
+    }
+    features = MODEL_FEATURES + [
+        f"{spec['prefix']}_{category}" for spec in one_hot.values() for category in spec['categories']
+    ]
+    transform = FeatureTransform(features, vocabulary.categories('City'), cleaner.fill_values, one_hot)
+    return raw, engineered, transform
+
+
+def _payload(rows):
+    """Raw rows as predict-risk payloads (missing values -> None)"""
+    return [
+        {'age': row.Age, 'bmi': row.BMI, 'blood_pressure': row.Blood_Pressure, 'glucose': row.Glucose,
+         'disease_risk': row.Disease_Risk, 'city': row.City}
+        for row in rows.astype(object).where(rows.notna(), None).itertuples()
+    ]
+
+
+def test_transform_matches_batch_pipeline(batch):
+    raw, engineered, transform = batch
+    rows = raw.set_index('Patient_ID').loc[engineered['Patient_ID']].reset_index()
+
+    expected = engineered[transform.features].to_numpy(dtype=float)
+    np.testing.assert_array_equal(np.array(transform.transform(_payload(rows))), expected)
+
+
+def test_transform_survives_json_round_trip(batch, tmp_path):
+    raw, engineered, transform = batch
+    rows = raw.set_index('Patient_ID').loc[engineered['Patient_ID']].reset_index()
+    loaded = FeatureTransform.load(transform.save(str(tmp_path / "feature_transform.json")))
+
+    np.testing.assert_array_equal(np.array(loaded.transform(_payload(rows))),
+                                  np.array(transform.transform(_payload(rows))))
+
+
+def test_rows_dropped_by_cleaning_are_rejected(batch):
+    raw, engineered, transform = batch
+    dropped = raw[~raw['Patient_ID'].isin(engineered['Patient_ID'])]
+    assert len(dropped) > 0
+    for payload in _payload(dropped):
+        with pytest.raises(ValueError):
+            transform.transform([payload])
@@ -0,0 +1,128 @@
+"""
+Equivalence of the NumPy-only exported models with scikit-learn
+(scaler + predict_proba), including rows exactly on and next to every
+raw-space split threshold of the forest export
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "scripts"))
+sys.path.insert(0, str(ROOT / "backend"))
+
+from ml_preparation import export_model, raw_thresholds  # noqa: E402
+from numpy_inference import LinearRiskModel, ForestRiskModel  # noqa: E402
+
+FEATURE_NAMES = ['Age', 'BMI', 'Blood_Pressure', 'Glucose', 'Health_Score', 'Glucose_BMI_Ratio']
+
+
+@pytest.fixture(scope='module')
+def training_data():
+    """Raw features on the scales of the engineered dataset, with a noisy risk target"""
+    rng = np.random.default_rng(42)
+    n = 2000
+    X = np.column_stack([
+        rng.integers(18, 96, n).astype(float),
+        np.round(rng.normal(26, 5, n), 1),
+        rng.integers(80, 251, n).astype(float),
+        rng.integers(50, 301, n).astype(float),
+        rng.uniform(20, 90, n),
+        np.round(rng.uniform(1, 15, n), 2)
+    ])
+    logit = 0.04 * (X[:, 0] - 50) + 0.1 * (X[:, 1] - 26) + 0.02 * (X[:, 3] - 110)
+    y = (logit + rng.normal(0, 1, n) > 0).astype(int)
+    scaler = StandardScaler().fit(X)
+    return X, y, scaler
+
+
+@pytest.fixture(scope='module')
+def forest(training_data):
+    X, y, scaler = training_data
+    model = RandomForestClassifier(n_estimators=20, max_depth=8, random_state=42).fit(scaler.transform(X), y)
+    return model, scaler
+
+
+def _exported(model, scaler, model_class):
+    arrays = {key: np.asarray(value) for key, value in export_model(model, scaler, FEATURE_NAMES).items()}
+    return model_class(arrays)
+
+
+def _perturbed_rows(X, n_rows, seed):
+    """Rows resampled from X with small relative noise on every feature"""
+    rng = np.random.default_rng(seed)
+    rows = X[rng.integers(0, len(X), n_rows)]
+    return rows * (1 + rng.normal(0, 0.02, rows.shape))
+
+
+def test_raw_thresholds_split_like_scaled_thresholds():
+    rng = np.random.default_rng(0)
+    threshold = rng.normal(0, 2, 5000).astype(np.float32).astype(float)
+    mean = rng.uniform(-50, 300, 5000)
+    scale = rng.uniform(0.01, 80, 5000)
+
+    raw = raw_thresholds(threshold, mean, scale)
+
+    def goes_left(x):
+        return ((x - mean) / scale).astype(np.float32) <= threshold
+
+    # raw is the largest float64 that still goes left
+    assert goes_left(raw).all()
+    assert not goes_left(np.nextafter(raw, np.inf)).any()
+
+
+def test_forest_matches_sklearn_on_split_boundaries(training_data, forest):
+    X, _, _ = training_data
+    model, scaler = forest
+    exported = _exported(model, scaler, ForestRiskModel)
+
+    # Every split threshold and its float neighbours, on otherwise ordinary rows
+    split = exported.feature >= 0
+    features, thresholds = exported.feature[split], exported.threshold[split]
+    rows = np.repeat(X[np.arange(split.sum()) % len(X)], 3, axis=0)
+    values = np.column_stack([np.nextafter(thresholds, -np.inf), thresholds, np.nextafter(thresholds, np.inf)])
+    rows[np.arange(len(rows)), np.repeat(features, 3)] = values.ravel()
+
+    expected = model.predict_proba(scaler.transform(rows))
+    np.testing.assert_allclose(exported.predict_proba(rows), expected, rtol=0, atol=1e-12)
+    np.testing.assert_array_equal(exported.predict(rows), expected.argmax(axis=1))
+
+
+def test_forest_matches_sklearn_on_perturbed_rows(training_data, forest):
+    X, _, _ = training_data
+    model, scaler = forest
+    exported = _exported(model, scaler, ForestRiskModel)
+
+    rows = _perturbed_rows(X, 50_000, seed=1)
+    expected = model.predict_proba(scaler.transform(rows))
+    np.testing.assert_allclose(exported.predict_proba(rows), expected, rtol=0, atol=1e-12)
+
+
+def test_forest_explanations_sum_to_probability(training_data, forest):
+    X, _, _ = training_data
+    model, scaler = forest
+    exported = _exported(model, scaler, ForestRiskModel)
+
+    contributions, expected_value = exported.explain(X[:500])
+    np.testing.assert_allclose(expected_value + contributions.sum(axis=1),
+                               exported.predict_proba(X[:500])[:, 1], atol=1e-9)
+
+
+def test_linear_model_matches_sklearn(training_data):
+    X, y, scaler = training_data
+    model = LogisticRegression(max_iter=1000).fit(scaler.transform(X), y)
+    exported = _exported(model, scaler, LinearRiskModel)
+
+    rows = _perturbed_rows(X, 50_000, seed=2)
+    expected = model.predict_proba(scaler.transform(rows))
+    np.testing.assert_allclose(exported.predict_proba(rows), expected, rtol=0, atol=1e-9)
+
+    contributions, expected_value = exported.explain(rows[:500])
+    np.testing.assert_allclose(expected_value + contributions.sum(axis=1),
+                               exported.decision_function(rows[:500]), atol=1e-9)
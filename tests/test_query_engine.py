@@ -0,0 +1,90 @@
+"""
+The pandas and DuckDB query backends return the same rows for the same
+spec, and reject the same invalid specs
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "backend"))
+
+from query_engine import QueryEngine, QueryError, duckdb  # noqa: E402
+
+VALID_SPECS = [
+    {'filters': [{'column': 'Age', 'op': '>=', 'value': 60}], 'order_by': ['Patient_ID']},
+    {'filters': [{'column': 'City', 'value': 'Delhi'}], 'order_by': ['Patient_ID']},
+    {'filters': [{'column': 'City', 'op': '!=', 'value': 'Delhi'}], 'order_by': ['Patient_ID']},
+    {'filters': [{'column': 'City', 'value': 'Atlantis'}]},
+    {'filters': [{'column': 'City', 'op': 'in', 'value': ['Mumbai', 'Atlantis']}], 'order_by': ['Patient_ID']},
+    {'filters': [{'column': 'City', 'op': 'not_in', 'value': ['Mumbai']}], 'order_by': ['Patient_ID']},
+    {'filters': [{'column': 'BMI', 'op': 'between', 'value': [20, 27.5]}], 'order_by': ['Patient_ID']},
+    {'filters': [{'column': 'BMI', 'op': 'is_null'}], 'order_by': ['Patient_ID']},
+    {'filters': [{'column': 'City', 'op': 'not_null'}, {'column': 'Age', 'op': '<', 'value': 40}],
+     'columns': ['Patient_ID', 'City'], 'order_by': ['Patient_ID']},
+    {'group_by': ['City'], 'aggregations': [{'func': 'count'}, {'func': 'mean', 'column': 'BMI'},
+                                            {'func': 'max', 'column': 'Age'}]},
+    {'group_by': ['Disease_Risk'], 'aggregations': [{'func': 'count_distinct', 'column': 'City', 'as': 'cities'},
+                                                    {'func': 'median', 'column': 'Age'}],
+     'order_by': [{'column': 'cities', 'desc': True}, 'Disease_Risk']},
+    {'aggregations': [{'func': 'sum', 'column': 'Age'}, {'func': 'std', 'column': 'BMI'}]},
+]
+
+INVALID_SPECS = [
+    {'filters': [{'column': 'Age', 'op': '==', 'value': [1]}]},
+    {'filters': [{'column': 'Age', 'value': 'abc'}]},
+    {'filters': [{'column': 'Age', 'value': {'a': 1}}]},
+    {'filters': [{'column': 'Age', 'value': True}]},
+    {'filters': [{'column': 'City', 'value': 1}]},
+    {'filters': [{'column': 'City', 'op': 'in', 'value': ['Delhi', None]}]},
+    {'filters': [{'column': 'City', 'op': 'in', 'value': [['Delhi']]}]},
+    {'filters': [{'column': 'BMI', 'op': 'between', 'value': [20, 'x']}]},
+    {'filters': 'x'},
+    {'group_by': 'City'},
+    {'aggregations': [{'func': 'mean', 'column': 'City'}]},
+]
+
+
+@pytest.fixture(scope='module')
+def engines():
+    rng = np.random.default_rng(7)
+    n = 500
+    df = pd.DataFrame({
+        'Patient_ID': np.arange(1000, 1000 + n),
+        'Age': rng.integers(18, 90, n),
+        'BMI': np.where(rng.random(n) < 0.1, np.nan, np.round(rng.normal(26, 4, n), 1)),
+        'City': rng.choice(['Delhi', 'Mumbai', 'Pune', None], n),
+        'Disease_Risk': rng.choice(['Heart Risk', 'Diabetes', 'Healthy'], n),
+    })
+    # Without DuckDB only the pandas backend's validation is tested
+    backends = ['pandas', 'duckdb'] if duckdb is not None else ['pandas']
+    return [QueryEngine(df, backend=backend) for backend in backends]
+
+
+def _rows(result):
+    """Result rows with floats rounded (aggregation order differs between the engines)"""
+    return [{key: round(value, 9) if isinstance(value, float) else value for key, value in row.items()}
+            for row in result['rows']]
+
+
+@pytest.mark.parametrize('spec', VALID_SPECS)
+def test_backends_return_same_rows(engines, spec):
+    if duckdb is None:
+        pytest.skip("duckdb is not installed")
+    pandas_engine, duckdb_engine = engines
+    expected = duckdb_engine.execute(spec)
+    result = pandas_engine.execute(spec)
+    assert result['columns'] == expected['columns']
+    assert _rows(result) == _rows(expected)
+    assert result['truncated'] == expected['truncated']
+
+
+@pytest.mark.parametrize('spec', INVALID_SPECS)
+def test_backends_reject_same_specs(engines, spec):
+    for engine in engines:
+        with pytest.raises(QueryError):
+            engine.execute(spec)